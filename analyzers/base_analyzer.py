@@ -18,6 +18,7 @@ class BaseAnalyzer(ABC):
     def __init__(self, name: str, verbose: bool = False):
         self.name = name
         self.verbose = verbose
+        self._pending_results: List[ValidationResult] = []
     
     @abstractmethod
     def analyze(self, results: List[ValidationResult], 
@@ -35,6 +36,35 @@ class BaseAnalyzer(ABC):
         """
         pass
     
+    def reset(self) -> None:
+        """Discard all results fed through update()"""
+        self._pending_results = []
+    
+    def update(self, result: ValidationResult) -> None:
+        """
+        Feed a single result into the analyzer as soon as it finishes
+        
+        The default keeps the result for report(). Analyzers that can fold results
+        into running statistics should override update() and report() together.
+        
+        Args:
+            result: Validation result to include in the next report
+        """
+        self._pending_results.append(result)
+    
+    def report(self, strategy_name: str, test_suite_name: str) -> Dict[str, Any]:
+        """
+        Build the analysis for every result fed through update()
+        
+        Args:
+            strategy_name: Name of the reasoning strategy used
+            test_suite_name: Name of the test suite used
+        
+        Returns:
+            Dict containing analysis results and statistics
+        """
+        return self.analyze(self._pending_results, strategy_name, test_suite_name)
+    
     @abstractmethod
     def print_analysis(self, analysis: Dict[str, Any]) -> None:
         """
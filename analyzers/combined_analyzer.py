@@ -2,11 +2,15 @@
 Combined analyzer for both accuracy and latency analysis
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import random
 import statistics
 
+from . import stats
 from .base_analyzer import BaseAnalyzer
 from tool_params.tool_definitions import ValidationResult
+from storage.jsonl_results import iter_jsonl_records, read_jsonl_results
+from transport.timing import PHASES, OVERHEAD_PHASES, phase_durations_ms
 
 
 class CombinedAnalyzer(BaseAnalyzer):
@@ -22,6 +26,7 @@ class CombinedAnalyzer(BaseAnalyzer):
     
     def __init__(self, verbose: bool = False):
         super().__init__(name="Combined", verbose=verbose)
+        self._state = self._new_state()
     
     def analyze(self, results: List[ValidationResult], 
                 strategy_name: str, test_suite_name: str) -> Dict[str, Any]:
@@ -30,37 +35,161 @@ class CombinedAnalyzer(BaseAnalyzer):
         if not results:
             return {"error": "No results to analyze"}
         
-        analysis = {
+        state = self._new_state()
+        for result in results:
+            self._update_state(state, result)
+        
+        return self._build_report(state, strategy_name, test_suite_name)
+    
+    def reset(self) -> None:
+        """Discard all results fed through update()"""
+        self._state = self._new_state()
+    
+    def update(self, result: ValidationResult) -> None:
+        """Fold a single result into the running analysis"""
+        self._update_state(self._state, result)
+    
+    def report(self, strategy_name: str, test_suite_name: str) -> Dict[str, Any]:
+        """Build the analysis for all results fed through update(), without a second pass"""
+        if not self._state["total"]:
+            return {"error": "No results to analyze"}
+        return self._build_report(self._state, strategy_name, test_suite_name)
+    
+    def analyze_jsonl(self, filepath: str) -> Dict[str, Any]:
+        """Analyze a streamed JSONL result file written by JsonlResultWriter"""
+        
+        header = next(iter_jsonl_records(filepath), {})
+        
+        # Results are folded in one at a time, so the file is never fully loaded
+        state = self._new_state()
+        for result in read_jsonl_results(filepath):
+            self._update_state(state, result)
+        
+        if not state["total"]:
+            return {"error": "No results to analyze"}
+        
+        return self._build_report(
+            state,
+            strategy_name=header.get("reasoning_strategy", "Unknown"),
+            test_suite_name=header.get("test_suite", "Unknown")
+        )
+    
+    def _new_state(self) -> Dict[str, Any]:
+        """
+        Create an empty accumulator
+        
+        The state keeps only what the report needs (counters and latency values),
+        not the results themselves, so it stays small on long soak runs.
+        """
+        return {
+            "total": 0,
+            "successes": 0,
+            "timestamp": None,
+            "latencies": [],
+            "queue_waits": [],
+            "response_times": [],
+            "scheduled": 0,
+            "throttle_waits": [],
+            "throttled_requests": 0,
+            "retries": 0,
+            "status_codes": {},
+            "hedge_eligible": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "hedge_extra_tokens": 0,
+            "hedged_latencies": [],
+            "phase_durations": {phase: [] for phase in PHASES},
+            "harness_overheads": [],
+            "cold_latencies": [],
+            "warm_latencies": [],
+            "server_processing": [],
+            "client_overheads": [],
+            "cache_hit_latencies": [],
+            "cache_miss_latencies": [],
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "reasoning_requests": 0,
+            "reasoning_tokens": 0,
+            "stream_requests": 0,
+            "stream_ttfts": [],
+            "stream_first_tool_names": [],
+            "stream_tool_args_complete": [],
+            "stream_chunk_gaps": [],
+            "warmup_excluded": 0,
+            "tool_stats": {},
+            "failures": 0,
+            "failure_categories": {
+                "execution_errors": 0,
+                "missing_tools": 0,
+                "extra_tools": 0,
+                "argument_errors": 0,
+                "tool_count_mismatch": 0,
+                "other": 0
+            },
+            "failure_reasons": {},
+            "scenario_stats": {},
+            "endpoint_stats": {}
+        }
+    
+    def _update_state(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Fold one result into an accumulator"""
+        if state["total"] == 0 and result.metadata:
+            state["timestamp"] = result.metadata.get("timestamp")
+        
+        state["total"] += 1
+        if result.success:
+            state["successes"] += 1
+        
+        self._update_latency(state, result)
+        self._update_hedging(state, result)
+        self._update_phases(state, result)
+        self._update_streaming(state, result)
+        self._update_connections(state, result)
+        self._update_server_timing(state, result)
+        self._update_prompt_cache(state, result)
+        self._update_reasoning_tokens(state, result)
+        self._update_tool_usage(state, result)
+        self._update_failures(state, result)
+        self._update_by_scenario(state, result)
+        self._update_by_endpoint(state, result)
+    
+    def _build_report(self, state: Dict[str, Any], strategy_name: str, test_suite_name: str) -> Dict[str, Any]:
+        """Turn an accumulator into the analysis report"""
+        return {
             "metadata": {
                 "strategy_name": strategy_name,
                 "test_suite_name": test_suite_name,
-                "total_results": len(results),
-                "timestamp": results[0].metadata.get("timestamp") if results[0].metadata else None
+                "total_results": state["total"],
+                "timestamp": state["timestamp"]
             },
-            "accuracy": self._analyze_accuracy(results),
-            "latency": self._analyze_latency(results),
-            "tool_usage": self._analyze_tool_usage(results),
-            "failure_analysis": self._analyze_failures(results),
-            "scenario_breakdown": self._analyze_by_scenario(results)
+            "accuracy": self._summarize_accuracy(state),
+            "latency": self._summarize_latency(state),
+            "tool_usage": self._summarize_tool_usage(state),
+            "failure_analysis": self._summarize_failures(state),
+            "scenario_breakdown": self._summarize_by_scenario(state),
+            "throttling": self._summarize_throttling(state),
+            "hedging": self._summarize_hedging(state),
+            "phases": self._summarize_phases(state),
+            "streaming": self._summarize_streaming(state),
+            "connections": self._summarize_connections(state),
+            "server_timing": self._summarize_server_timing(state),
+            "prompt_cache": self._summarize_prompt_cache(state),
+            "reasoning_tokens": self._summarize_reasoning_tokens(state),
+            "endpoint_breakdown": self._summarize_by_endpoint(state)
         }
-        
-        return analysis
     
-    def _analyze_accuracy(self, results: List[ValidationResult]) -> Dict[str, Any]:
-        """Analyze accuracy metrics"""
+    def _summarize_accuracy(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize accuracy metrics"""
         
-        total_tests = len(results)
-        successful_tests = sum(1 for r in results if r.success)
+        total_tests = state["total"]
+        successful_tests = state["successes"]
         failed_tests = total_tests - successful_tests
         
         success_rate = (successful_tests / total_tests * 100) if total_tests > 0 else 0
         
-        # Analyze by test tags if available
+        # Note: We'd need to access scenario tags through metadata or modify data structure
+        # For now, we'll skip the per-tag breakdown
         tag_analysis = {}
-        for result in results:
-            # Note: We'd need to access scenario tags through metadata or modify data structure
-            # For now, we'll skip this detailed analysis
-            pass
         
         return {
             "total_tests": total_tests,
@@ -70,84 +199,358 @@ class CombinedAnalyzer(BaseAnalyzer):
             "tag_breakdown": tag_analysis
         }
     
-    def _analyze_latency(self, results: List[ValidationResult]) -> Dict[str, Any]:
-        """Analyze latency metrics"""
+    def _update_latency(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record latency measurements for one result"""
+        
+        # Warmup trials are dropped so connection setup and cold caches don't skew the stats
+        if result.warmup:
+            state["warmup_excluded"] += 1
+            return
+        
+        if result.latency_ms is not None:
+            state["latencies"].append(result.latency_ms)
+        
+        if result.throttle_wait_ms is not None:
+            state["throttle_waits"].append(result.throttle_wait_ms)
+            state["retries"] += result.retries
+            if result.throttle_wait_ms > 0 or result.retries:
+                state["throttled_requests"] += 1
+        
+        status_code = (result.metadata or {}).get("status_code")
+        if status_code is not None:
+            state["status_codes"][status_code] = state["status_codes"].get(status_code, 0) + 1
+        
+        if result.queue_wait_ms is not None:
+            state["queue_waits"].append(result.queue_wait_ms)
+            
+            # Response time counts from submission (or the scheduled send in open-loop runs),
+            # which is what a caller actually experiences under load
+            if result.latency_ms is not None:
+                state["response_times"].append(
+                    result.latency_ms + result.queue_wait_ms + (result.throttle_wait_ms or 0)
+                )
+                if result.scheduled:
+                    state["scheduled"] += 1
+    
+    def _summarize_latency(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize latency metrics"""
         
-        latencies = [r.latency_ms for r in results if r.latency_ms is not None]
+        latencies = state["latencies"]
         
         if not latencies:
             return {"error": "No latency data available"}
         
+        # Open-loop results are measured from their scheduled send time, so the headline
+        # figures are response times (what a caller sees) and service time is reported apart
+        from_schedule = 0 < state["scheduled"] == len(latencies)
+        values = state["response_times"] if from_schedule else latencies
+        
         # Calculate statistics
-        avg_latency = statistics.mean(latencies)
-        median_latency = statistics.median(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
+        avg_latency = statistics.mean(values)
+        median_latency = statistics.median(values)
+        min_latency = min(values)
+        max_latency = max(values)
         
         # Standard deviation if we have enough data points
-        stdev_latency = statistics.stdev(latencies) if len(latencies) > 1 else 0
+        stdev_latency = statistics.stdev(values) if len(values) > 1 else 0
         
         # Latency distribution buckets
         buckets = {
-            "under_50ms": sum(1 for l in latencies if l < 50),
-            "50_100ms": sum(1 for l in latencies if 50 <= l < 100),
-            "100_200ms": sum(1 for l in latencies if 100 <= l < 200),
-            "200_500ms": sum(1 for l in latencies if 200 <= l < 500),
-            "500_1000ms": sum(1 for l in latencies if 500 <= l < 1000),
-            "over_1000ms": sum(1 for l in latencies if l >= 1000)
+            "under_50ms": sum(1 for v in values if v < 50),
+            "50_100ms": sum(1 for v in values if 50 <= v < 100),
+            "100_200ms": sum(1 for v in values if 100 <= v < 200),
+            "200_500ms": sum(1 for v in values if 200 <= v < 500),
+            "500_1000ms": sum(1 for v in values if 500 <= v < 1000),
+            "over_1000ms": sum(1 for v in values if v >= 1000)
         }
         
         # Percentiles
         percentiles = {
-            "p50": statistics.median(latencies),
-            "p90": self._percentile(latencies, 0.90),
-            "p95": self._percentile(latencies, 0.95),
-            "p99": self._percentile(latencies, 0.99)
+            "p50": statistics.median(values),
+            "p90": stats.percentile(values, 0.90),
+            "p95": stats.percentile(values, 0.95),
+            "p99": stats.percentile(values, 0.99)
         }
         
-        return {
-            "total_measurements": len(latencies),
+        latency_analysis = {
+            "basis": "response_time" if from_schedule else "service_time",
+            "total_measurements": len(values),
             "average_ms": round(avg_latency, 2),
             "median_ms": round(median_latency, 2),
             "min_ms": round(min_latency, 2),
             "max_ms": round(max_latency, 2),
             "stdev_ms": round(stdev_latency, 2),
             "percentiles": {k: round(v, 2) for k, v in percentiles.items()},
-            "distribution": buckets
+            "distribution": buckets,
+            "warmup_excluded": state["warmup_excluded"]
+        }
+        
+        # Queue wait is reported separately so parallel runs don't inflate service latency
+        if state["queue_waits"]:
+            latency_analysis["queue_wait"] = self._summarize_distribution(state["queue_waits"], (0.50, 0.95, 0.99))
+            if from_schedule:
+                latency_analysis["service_time"] = self._summarize_distribution(latencies)
+            else:
+                latency_analysis["response_time"] = self._summarize_distribution(state["response_times"])
+        
+        return latency_analysis
+    
+    def _summarize_throttling(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize time held back by the rate limiter, kept apart from model latency"""
+        
+        if not state["throttle_waits"] and not state["status_codes"]:
+            return {}
+        
+        throttling = {
+            "throttled_requests": state["throttled_requests"],
+            "retries": state["retries"],
+            "error_status_codes": dict(state["status_codes"])
         }
+        if state["throttle_waits"]:
+            throttling["wait"] = self._summarize_distribution(state["throttle_waits"], (0.50, 0.95, 0.99))
+        
+        return throttling
     
-    def _analyze_tool_usage(self, results: List[ValidationResult]) -> Dict[str, Any]:
-        """Analyze tool usage patterns"""
+    def _update_hedging(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record whether a result was hedged and what the duplicate cost"""
+        hedge = (result.metadata or {}).get("hedge")
+        if not hedge:
+            return
+        
+        state["hedge_eligible"] += 1
+        if hedge.get("hedged"):
+            state["hedged"] += 1
+            state["hedge_extra_tokens"] += hedge.get("extra_tokens_estimate", 0)
+            if not result.warmup:
+                state["hedged_latencies"].append(result.latency_ms)
+            if hedge.get("winner") == "hedge":
+                state["hedge_wins"] += 1
+    
+    def _summarize_hedging(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize how often hedges were sent, how often they won and what they cost"""
+        
+        if not state["hedge_eligible"]:
+            return {}
+        
+        hedging = {
+            "requests": state["hedge_eligible"],
+            "hedged_requests": state["hedged"],
+            "hedge_rate": round(state["hedged"] / state["hedge_eligible"] * 100, 1),
+            "hedge_wins": state["hedge_wins"],
+            "hedge_win_rate": round(state["hedge_wins"] / state["hedged"] * 100, 1) if state["hedged"] else 0.0,
+            "extra_tokens_estimate": state["hedge_extra_tokens"]
+        }
         
-        tool_stats = {}
-        tool_success_stats = {}
+        # latency_ms is already the effective (first answer) latency; this isolates hedged requests
+        if state["hedged_latencies"]:
+            hedging["hedged_effective_latency"] = self._summarize_distribution(state["hedged_latencies"], (0.50, 0.95, 0.99))
         
-        for result in results:
-            # Analyze expected tool calls
-            for expected_call in result.expected_tool_calls:
-                tool_name = expected_call.get("name", "unknown")
-                
-                if tool_name not in tool_stats:
-                    tool_stats[tool_name] = {"expected": 0, "actual": 0, "correct": 0}
-                    tool_success_stats[tool_name] = []
-                
-                tool_stats[tool_name]["expected"] += 1
-                
-                # Check if this tool was actually called correctly
-                if result.success and result.actual_tool_calls:
-                    for actual_call in result.actual_tool_calls:
-                        if actual_call.get("name") == tool_name:
-                            tool_stats[tool_name]["actual"] += 1
-                            break
-                
-                # Track success for this specific tool usage
-                tool_success_stats[tool_name].append(result.success)
+        return hedging
+    
+    def _update_phases(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record per-phase durations from a result's timing marks"""
+        durations = phase_durations_ms((result.metadata or {}).get("timing_ns"))
+        if not durations or result.warmup:
+            return
+        
+        for phase, duration_ms in durations.items():
+            state["phase_durations"][phase].append(duration_ms)
+        state["harness_overheads"].append(sum(durations.get(phase, 0.0) for phase in OVERHEAD_PHASES))
+    
+    def _summarize_phases(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize where request time went: harness (build, send, parse, validate)
+        versus the wire and model (first_byte, last_byte)
+        """
+        
+        if not state["harness_overheads"]:
+            return {}
+        
+        return {
+            "measured_requests": len(state["harness_overheads"]),
+            "breakdown": {
+                phase: self._summarize_distribution(values, (0.50, 0.95, 0.99))
+                for phase, values in state["phase_durations"].items() if values
+            },
+            "harness_overhead": self._summarize_distribution(state["harness_overheads"], (0.50, 0.95, 0.99))
+        }
+    
+    def _update_streaming(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record stream timings (time to first token / tool name / complete arguments, chunk gaps)"""
+        streaming = (result.metadata or {}).get("streaming")
+        if not streaming or result.warmup:
+            return
+        
+        state["stream_requests"] += 1
+        for key, values in (("ttft_ms", state["stream_ttfts"]),
+                            ("first_tool_name_ms", state["stream_first_tool_names"]),
+                            ("tool_args_complete_ms", state["stream_tool_args_complete"])):
+            if streaming.get(key) is not None:
+                values.append(streaming[key])
+        state["stream_chunk_gaps"].extend(streaming.get("chunk_gaps_ms", []))
+    
+    def _summarize_streaming(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize streamed responses; each metric only covers requests where it occurred"""
+        
+        if not state["stream_requests"]:
+            return {}
+        
+        streaming = {"requests": state["stream_requests"]}
+        for name, values in (("ttft", state["stream_ttfts"]),
+                             ("time_to_first_tool_name", state["stream_first_tool_names"]),
+                             ("time_to_tool_args_complete", state["stream_tool_args_complete"]),
+                             ("inter_chunk_gap", state["stream_chunk_gaps"])):
+            if values:
+                streaming[name] = self._summarize_distribution(values, (0.50, 0.95, 0.99))
+        
+        return streaming
+    
+    def _update_connections(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Split latency by whether the request opened a new connection (cold) or reused one (warm)"""
+        reused = (result.metadata or {}).get("connection_reused")
+        if reused is None or result.warmup:
+            return
+        
+        (state["warm_latencies"] if reused else state["cold_latencies"]).append(result.latency_ms)
+    
+    def _summarize_connections(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize cold-start (new connection) versus steady-state (reused connection) latency"""
+        
+        if not state["cold_latencies"] and not state["warm_latencies"]:
+            return {}
+        
+        connections = {
+            "new_connections": len(state["cold_latencies"]),
+            "reused_connections": len(state["warm_latencies"])
+        }
+        if state["cold_latencies"]:
+            connections["cold_latency"] = self._summarize_distribution(state["cold_latencies"], (0.50, 0.95, 0.99))
+        if state["warm_latencies"]:
+            connections["warm_latency"] = self._summarize_distribution(state["warm_latencies"], (0.50, 0.95, 0.99))
+        
+        return connections
+    
+    def _update_server_timing(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """
+        Split client-measured time into the server's reported processing time and the rest
+        
+        Client overhead is what the client measured minus the server's processing
+        time: network, queueing in front of the model, TLS, and the harness. For
+        streamed responses the server reports time to headers, so the client side
+        is time to first byte rather than the full latency.
+        """
+        metadata = result.metadata or {}
+        processing_ms = metadata.get("server_processing_ms")
+        if processing_ms is None or result.warmup or result.error:
+            return
+        
+        client_ms = result.latency_ms
+        if metadata.get("streaming"):
+            first_byte_ns = (metadata.get("timing_ns") or {}).get("first_byte")
+            if first_byte_ns is None:
+                return
+            client_ms = first_byte_ns / 1e6
+        
+        state["server_processing"].append(processing_ms)
+        state["client_overheads"].append(client_ms - processing_ms)
+    
+    def _summarize_server_timing(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize server processing time and client overhead"""
+        if not state["server_processing"]:
+            return {}
+        
+        return {
+            "requests": len(state["server_processing"]),
+            "server_processing": self._summarize_distribution(state["server_processing"], (0.50, 0.95, 0.99)),
+            "client_overhead": self._summarize_distribution(state["client_overheads"], (0.50, 0.95, 0.99))
+        }
+    
+    def _update_prompt_cache(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Split latency by prompt cache hit (any cached prompt tokens) versus miss"""
+        tokens = result.tokens_used or {}
+        cached = tokens.get("cached_tokens")
+        if cached is None or result.warmup or result.error:
+            return
+        
+        state["prompt_tokens"] += tokens.get("prompt_tokens", 0)
+        state["cached_tokens"] += cached
+        (state["cache_hit_latencies"] if cached > 0 else state["cache_miss_latencies"]).append(result.latency_ms)
+    
+    def _summarize_prompt_cache(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize prompt cache hit rate, cached token share and hit versus miss latency"""
+        requests = len(state["cache_hit_latencies"]) + len(state["cache_miss_latencies"])
+        if not requests:
+            return {}
+        
+        prompt_cache = {
+            "requests": requests,
+            "cache_hits": len(state["cache_hit_latencies"]),
+            "hit_rate": len(state["cache_hit_latencies"]) / requests * 100,
+            "prompt_tokens": state["prompt_tokens"],
+            "cached_tokens": state["cached_tokens"],
+            "cached_token_share": state["cached_tokens"] / state["prompt_tokens"] * 100 if state["prompt_tokens"] else 0
+        }
+        if state["cache_hit_latencies"]:
+            prompt_cache["hit_latency"] = self._summarize_distribution(state["cache_hit_latencies"], (0.50, 0.95, 0.99))
+        if state["cache_miss_latencies"]:
+            prompt_cache["miss_latency"] = self._summarize_distribution(state["cache_miss_latencies"], (0.50, 0.95, 0.99))
+        
+        return prompt_cache
+    
+    def _update_reasoning_tokens(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Count hidden reasoning tokens, when the provider reports them"""
+        reasoning = (result.tokens_used or {}).get("reasoning_tokens")
+        if reasoning is None or result.warmup:
+            return
+        
+        state["reasoning_requests"] += 1
+        state["reasoning_tokens"] += reasoning
+    
+    def _summarize_reasoning_tokens(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize reasoning token usage"""
+        if not state["reasoning_requests"]:
+            return {}
+        
+        return {
+            "requests": state["reasoning_requests"],
+            "total": state["reasoning_tokens"],
+            "average": state["reasoning_tokens"] / state["reasoning_requests"]
+        }
+    
+    def _update_tool_usage(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record tool usage for one result"""
+        
+        tool_stats = state["tool_stats"]
+        
+        # Analyze expected tool calls
+        for expected_call in result.expected_tool_calls:
+            tool_name = expected_call.get("name", "unknown")
+            
+            if tool_name not in tool_stats:
+                tool_stats[tool_name] = {"expected": 0, "actual": 0, "successes": 0}
+            
+            tool_stats[tool_name]["expected"] += 1
+            
+            # Check if this tool was actually called correctly
+            if result.success and result.actual_tool_calls:
+                for actual_call in result.actual_tool_calls:
+                    if actual_call.get("name") == tool_name:
+                        tool_stats[tool_name]["actual"] += 1
+                        break
+            
+            # Track success for this specific tool usage
+            if result.success:
+                tool_stats[tool_name]["successes"] += 1
+    
+    def _summarize_tool_usage(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize tool usage patterns"""
+        
+        tool_stats = state["tool_stats"]
         
         # Calculate success rates per tool
         tool_summary = {}
         for tool_name, stats in tool_stats.items():
-            successes = tool_success_stats[tool_name]
-            success_rate = (sum(successes) / len(successes) * 100) if successes else 0
+            success_rate = (stats["successes"] / stats["expected"] * 100) if stats["expected"] else 0
             
             tool_summary[tool_name] = {
                 "times_expected": stats["expected"],
@@ -163,87 +566,86 @@ class CombinedAnalyzer(BaseAnalyzer):
             "highest_success_rate": max(tool_summary.keys(), key=lambda k: tool_summary[k]["success_rate"]) if tool_summary else None
         }
     
-    def _analyze_failures(self, results: List[ValidationResult]) -> Dict[str, Any]:
-        """Analyze failure patterns"""
-        
-        failed_results = [r for r in results if not r.success]
+    def _update_failures(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Categorize one result if it failed"""
         
-        if not failed_results:
-            return {"total_failures": 0, "failure_rate": 0.0}
+        if result.success:
+            return
         
-        # Categorize failures
-        failure_categories = {
-            "execution_errors": 0,
-            "missing_tools": 0,
-            "extra_tools": 0,
-            "argument_errors": 0,
-            "tool_count_mismatch": 0,
-            "other": 0
-        }
+        state["failures"] += 1
+        failure_categories = state["failure_categories"]
         
-        failure_reasons = []
-        
-        for result in failed_results:
-            if result.error:
-                failure_categories["execution_errors"] += 1
-                failure_reasons.append(f"Execution error: {result.error}")
-            elif result.validation_details:
-                details = result.validation_details
-                reason = details.get("reason", "")
-                failure_reasons.append(reason)
-                
-                if "missing" in reason.lower():
-                    failure_categories["missing_tools"] += 1
-                elif "extra" in reason.lower():
-                    failure_categories["extra_tools"] += 1
-                elif "argument" in reason.lower():
-                    failure_categories["argument_errors"] += 1
-                elif "count" in reason.lower():
-                    failure_categories["tool_count_mismatch"] += 1
-                else:
-                    failure_categories["other"] += 1
+        if result.error:
+            failure_categories["execution_errors"] += 1
+            reason = f"Execution error: {result.error}"
+        elif result.validation_details:
+            reason = result.validation_details.get("reason", "")
+            
+            if "missing" in reason.lower():
+                failure_categories["missing_tools"] += 1
+            elif "extra" in reason.lower():
+                failure_categories["extra_tools"] += 1
+            elif "argument" in reason.lower():
+                failure_categories["argument_errors"] += 1
+            elif "count" in reason.lower():
+                failure_categories["tool_count_mismatch"] += 1
             else:
                 failure_categories["other"] += 1
-                failure_reasons.append("Unknown failure reason")
+        else:
+            failure_categories["other"] += 1
+            reason = "Unknown failure reason"
+        
+        # Only unique reasons are reported, so keep a bounded set rather than every message
+        if reason in state["failure_reasons"] or len(state["failure_reasons"]) < 10:
+            state["failure_reasons"][reason] = state["failure_reasons"].get(reason, 0) + 1
+    
+    def _summarize_failures(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize failure patterns"""
+        
+        if not state["failures"]:
+            return {"total_failures": 0, "failure_rate": 0.0}
         
         return {
-            "total_failures": len(failed_results),
-            "failure_rate": round(len(failed_results) / len(results) * 100, 1),
-            "failure_categories": failure_categories,
-            "common_reasons": list(set(failure_reasons))[:10]  # Top 10 unique reasons
+            "total_failures": state["failures"],
+            "failure_rate": round(state["failures"] / state["total"] * 100, 1),
+            "failure_categories": dict(state["failure_categories"]),
+            "common_reasons": list(state["failure_reasons"])[:10]  # Top 10 unique reasons
         }
     
-    def _analyze_by_scenario(self, results: List[ValidationResult]) -> Dict[str, Any]:
-        """Analyze results grouped by scenario"""
+    def _update_by_scenario(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record one result under its scenario"""
+        
+        scenario_stats = state["scenario_stats"]
+        scenario_name = result.scenario_name
+        
+        if scenario_name not in scenario_stats:
+            scenario_stats[scenario_name] = {
+                "attempts": 0,
+                "successes": 0,
+                "latencies": [],
+                "errors": set()
+            }
         
-        scenario_stats = {}
+        stats = scenario_stats[scenario_name]
+        stats["attempts"] += 1
         
-        for result in results:
-            scenario_name = result.scenario_name
-            
-            if scenario_name not in scenario_stats:
-                scenario_stats[scenario_name] = {
-                    "attempts": 0,
-                    "successes": 0,
-                    "latencies": [],
-                    "errors": []
-                }
-            
-            stats = scenario_stats[scenario_name]
-            stats["attempts"] += 1
-            
-            if result.success:
-                stats["successes"] += 1
-            else:
-                error_msg = result.error or result.validation_details.get("reason", "Unknown")
-                stats["errors"].append(error_msg)
-            
-            if result.latency_ms is not None:
-                stats["latencies"].append(result.latency_ms)
+        if result.success:
+            stats["successes"] += 1
+        else:
+            error_msg = result.error or result.validation_details.get("reason", "Unknown")
+            stats["errors"].add(error_msg)
+        
+        if result.warmup:
+            stats["warmup_discarded"] = stats.get("warmup_discarded", 0) + 1
+        elif result.latency_ms is not None:
+            stats["latencies"].append(result.latency_ms)
+    
+    def _summarize_by_scenario(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize results grouped by scenario"""
         
         # Calculate summary statistics for each scenario
         scenario_summary = {}
-        for scenario_name, stats in scenario_stats.items():
+        for scenario_name, stats in state["scenario_stats"].items():
             success_rate = (stats["successes"] / stats["attempts"] * 100) if stats["attempts"] > 0 else 0
             avg_latency = statistics.mean(stats["latencies"]) if stats["latencies"] else 0
             
@@ -252,25 +654,123 @@ class CombinedAnalyzer(BaseAnalyzer):
                 "successes": stats["successes"],
                 "success_rate": round(success_rate, 1),
                 "average_latency_ms": round(avg_latency, 2),
-                "unique_errors": len(set(stats["errors"]))
+                "unique_errors": len(stats["errors"])
             }
+            
+            # Spread across repeated trials shows how much a single run can be trusted
+            if len(stats["latencies"]) > 1:
+                scenario_summary[scenario_name].update({
+                    "median_latency_ms": round(statistics.median(stats["latencies"]), 2),
+                    "latency_stdev_ms": round(statistics.stdev(stats["latencies"]), 2),
+                    "latency_variance": round(statistics.variance(stats["latencies"]), 2),
+                    "min_latency_ms": round(min(stats["latencies"]), 2),
+                    "max_latency_ms": round(max(stats["latencies"]), 2)
+                })
+            if stats.get("warmup_discarded"):
+                scenario_summary[scenario_name]["warmup_discarded"] = stats["warmup_discarded"]
         
         return scenario_summary
     
-    def _percentile(self, data: List[float], percentile: float) -> float:
-        """Calculate percentile value"""
+    def _update_by_endpoint(self, state: Dict[str, Any], result: ValidationResult) -> None:
+        """Record one result under the endpoint that served it (results from routed strategies only)"""
+        endpoint = (result.metadata or {}).get("endpoint")
+        if endpoint is None:
+            return
+        
+        stats = state["endpoint_stats"].setdefault(endpoint, {
+            "requests": 0,
+            "successes": 0,
+            "errors": 0,
+            "status_codes": {},
+            "latencies": []
+        })
+        stats["requests"] += 1
+        if result.success:
+            stats["successes"] += 1
+        if result.error:
+            stats["errors"] += 1
+            status_code = result.metadata.get("status_code")
+            if status_code is not None:
+                stats["status_codes"][status_code] = stats["status_codes"].get(status_code, 0) + 1
+        elif not result.warmup:
+            stats["latencies"].append(result.latency_ms)
+    
+    def _summarize_by_endpoint(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize request count, error rate and latency per endpoint"""
+        endpoint_summary = {}
+        for endpoint, stats in state["endpoint_stats"].items():
+            summary = {
+                "requests": stats["requests"],
+                "share": round(stats["requests"] / state["total"] * 100, 1),
+                "success_rate": round(stats["successes"] / stats["requests"] * 100, 1),
+                "errors": stats["errors"],
+                "error_rate": round(stats["errors"] / stats["requests"] * 100, 1)
+            }
+            if stats["status_codes"]:
+                summary["status_codes"] = dict(stats["status_codes"])
+            if stats["latencies"]:
+                summary["latency"] = self._summarize_distribution(stats["latencies"], (0.50, 0.95, 0.99))
+            endpoint_summary[endpoint] = summary
+        return endpoint_summary
+    
+    def _summarize_distribution(self, values: List[float],
+                                percentiles: tuple = (0.50, 0.90, 0.95, 0.99)) -> Dict[str, Any]:
+        """Average, max and percentiles of a list of millisecond values"""
+        return {
+            "average_ms": round(statistics.mean(values), 2),
+            "max_ms": round(max(values), 2),
+            "percentiles": {
+                f"p{int(p * 100)}": round(stats.percentile(values, p), 2) for p in percentiles
+            }
+        }
+    
+    def latency_samples(self) -> Dict[str, List[float]]:
+        """
+        Non-warmup latencies fed through update(), grouped by scenario
+        
+        Returns:
+            Dict mapping scenario name to its latencies in milliseconds
+        """
+        return {name: list(stats["latencies"]) for name, stats in self._state["scenario_stats"].items()}
+    
+    def bootstrap_percentile_ci(self, data: List[float], percentile: float,
+                                confidence: float = 0.95, samples: int = 1000,
+                                rng: Optional[random.Random] = None) -> Dict[str, float]:
+        """
+        Bootstrap confidence interval for a percentile
+        
+        Resamples `data` with replacement `samples` times, takes the percentile
+        of each resample and reports the central `confidence` range of those.
+        
+        Args:
+            data: Measurements (e.g. latencies in ms)
+            percentile: Percentile as a fraction, e.g. 0.95
+            confidence: Coverage of the interval
+            samples: Number of bootstrap resamples
+            rng: Random source, for reproducible intervals
+        
+        Returns:
+            Dict with estimate, low, high and width
+        """
         if not data:
-            return 0.0
-        
-        sorted_data = sorted(data)
-        index = percentile * (len(sorted_data) - 1)
-        
-        if index.is_integer():
-            return sorted_data[int(index)]
-        else:
-            lower = sorted_data[int(index)]
-            upper = sorted_data[int(index) + 1]
-            return lower + (upper - lower) * (index - int(index))
+            return {"estimate": 0.0, "low": 0.0, "high": 0.0, "width": 0.0}
+        
+        rng = rng or random.Random()
+        n = len(data)
+        estimates = sorted(
+            stats.percentile([data[rng.randrange(n)] for _ in range(n)], percentile)
+            for _ in range(samples)
+        )
+        
+        tail = (1 - confidence) / 2
+        low = stats.percentile(estimates, tail)
+        high = stats.percentile(estimates, 1 - tail)
+        return {
+            "estimate": round(stats.percentile(data, percentile), 2),
+            "low": round(low, 2),
+            "high": round(high, 2),
+            "width": round(high - low, 2)
+        }
     
     def print_analysis(self, analysis: Dict[str, Any]) -> None:
         """Print analysis results in a human-readable format"""
@@ -300,6 +800,8 @@ class CombinedAnalyzer(BaseAnalyzer):
         
         latency = analysis.get("latency", {})
         if "error" not in latency:
+            if latency.get("basis") == "response_time":
+                print("Measured from each request's scheduled send time (response time)")
             print(f"Average Latency: {latency.get('average_ms', 0):.2f}ms")
             print(f"Median Latency: {latency.get('median_ms', 0):.2f}ms")
             print(f"Min/Max: {latency.get('min_ms', 0):.2f}ms / {latency.get('max_ms', 0):.2f}ms")
@@ -307,6 +809,93 @@ class CombinedAnalyzer(BaseAnalyzer):
             percentiles = latency.get("percentiles", {})
             print(f"Percentiles - P90: {percentiles.get('p90', 0):.2f}ms, P95: {percentiles.get('p95', 0):.2f}ms, P99: {percentiles.get('p99', 0):.2f}ms")
             
+            queue_wait = latency.get("queue_wait")
+            if queue_wait:
+                wait_percentiles = queue_wait.get("percentiles", {})
+                print(f"Queue Wait - Avg: {queue_wait.get('average_ms', 0):.2f}ms, P95: {wait_percentiles.get('p95', 0):.2f}ms, Max: {queue_wait.get('max_ms', 0):.2f}ms")
+            
+            response_time = latency.get("response_time")
+            if response_time:
+                rt_percentiles = response_time.get("percentiles", {})
+                print(f"Response Time (incl. queue) - P50: {rt_percentiles.get('p50', 0):.2f}ms, P95: {rt_percentiles.get('p95', 0):.2f}ms, P99: {rt_percentiles.get('p99', 0):.2f}ms")
+            
+            service_time = latency.get("service_time")
+            if service_time:
+                st_percentiles = service_time.get("percentiles", {})
+                print(f"Service Time (excl. queue) - P50: {st_percentiles.get('p50', 0):.2f}ms, P95: {st_percentiles.get('p95', 0):.2f}ms, P99: {st_percentiles.get('p99', 0):.2f}ms")
+            
+            hedging = analysis.get("hedging")
+            if hedging:
+                print(f"Hedging - Rate: {hedging.get('hedge_rate', 0):.1f}% ({hedging.get('hedged_requests', 0)}/{hedging.get('requests', 0)}), "
+                      f"Hedge Wins: {hedging.get('hedge_wins', 0)}, Extra Tokens (est.): {hedging.get('extra_tokens_estimate', 0)}")
+            
+            throttle_wait = analysis.get("throttling", {}).get("wait")
+            if throttle_wait:
+                throttling = analysis["throttling"]
+                tw_percentiles = throttle_wait.get("percentiles", {})
+                print(f"Throttle Wait - Avg: {throttle_wait.get('average_ms', 0):.2f}ms, P95: {tw_percentiles.get('p95', 0):.2f}ms, "
+                      f"Throttled: {throttling.get('throttled_requests', 0)}, Retries: {throttling.get('retries', 0)}")
+            
+            connections = analysis.get("connections")
+            if connections:
+                parts = []
+                for label, count_key, latency_key in (("New", "new_connections", "cold_latency"),
+                                                      ("Reused", "reused_connections", "warm_latency")):
+                    part = f"{label}: {connections.get(count_key, 0)}"
+                    if latency_key in connections:
+                        conn_percentiles = connections[latency_key].get("percentiles", {})
+                        part += f" (P50: {conn_percentiles.get('p50', 0):.2f}ms, P95: {conn_percentiles.get('p95', 0):.2f}ms)"
+                    parts.append(part)
+                print(f"Connections - {', '.join(parts)}")
+            
+            server_timing = analysis.get("server_timing")
+            if server_timing:
+                for key, label in (("server_processing", "Server Processing"),
+                                   ("client_overhead", "Client Overhead (client - server)")):
+                    stats = server_timing.get(key, {})
+                    timing_percentiles = stats.get("percentiles", {})
+                    print(f"{label} - P50: {timing_percentiles.get('p50', 0):.2f}ms, P95: {timing_percentiles.get('p95', 0):.2f}ms, "
+                          f"P99: {timing_percentiles.get('p99', 0):.2f}ms")
+            
+            prompt_cache = analysis.get("prompt_cache")
+            if prompt_cache:
+                parts = [f"Hits: {prompt_cache.get('cache_hits', 0)}/{prompt_cache.get('requests', 0)} "
+                         f"({prompt_cache.get('hit_rate', 0):.1f}%, {prompt_cache.get('cached_token_share', 0):.1f}% of prompt tokens)"]
+                for label, latency_key in (("Hit", "hit_latency"), ("Miss", "miss_latency")):
+                    if latency_key in prompt_cache:
+                        cache_percentiles = prompt_cache[latency_key].get("percentiles", {})
+                        parts.append(f"{label} P50: {cache_percentiles.get('p50', 0):.2f}ms, P95: {cache_percentiles.get('p95', 0):.2f}ms")
+                print(f"Prompt Cache - {', '.join(parts)}")
+            
+            reasoning = analysis.get("reasoning_tokens")
+            if reasoning and reasoning.get("total"):
+                print(f"Reasoning Tokens - Total: {reasoning.get('total', 0)}, Avg: {reasoning.get('average', 0):.1f} per request")
+            
+            phases = analysis.get("phases")
+            if phases:
+                print("\nPhase Breakdown:")
+                for phase, phase_stats in phases.get("breakdown", {}).items():
+                    phase_percentiles = phase_stats.get("percentiles", {})
+                    print(f"  {phase:<12} P50: {phase_percentiles.get('p50', 0):>8.2f}ms, P95: {phase_percentiles.get('p95', 0):>8.2f}ms, "
+                          f"P99: {phase_percentiles.get('p99', 0):>8.2f}ms")
+                overhead = phases.get("harness_overhead", {})
+                overhead_percentiles = overhead.get("percentiles", {})
+                print(f"  Harness overhead - P50: {overhead_percentiles.get('p50', 0):.2f}ms, P95: {overhead_percentiles.get('p95', 0):.2f}ms, "
+                      f"Max: {overhead.get('max_ms', 0):.2f}ms")
+            
+            streaming = analysis.get("streaming")
+            if streaming:
+                print(f"\nStreaming ({streaming.get('requests', 0)} requests):")
+                for key, label in (("ttft", "Time to first token"),
+                                   ("time_to_first_tool_name", "Time to first tool name"),
+                                   ("time_to_tool_args_complete", "Time to complete tool args"),
+                                   ("inter_chunk_gap", "Inter-chunk gap")):
+                    stats = streaming.get(key)
+                    if stats:
+                        stream_percentiles = stats.get("percentiles", {})
+                        print(f"  {label:<27} P50: {stream_percentiles.get('p50', 0):>8.2f}ms, "
+                              f"P95: {stream_percentiles.get('p95', 0):>8.2f}ms, P99: {stream_percentiles.get('p99', 0):>8.2f}ms")
+            
             print("\nLatency Distribution:")
             distribution = latency.get("distribution", {})
             for bucket, count in distribution.items():
@@ -349,9 +938,23 @@ class CombinedAnalyzer(BaseAnalyzer):
         
         scenarios = analysis.get("scenario_breakdown", {})
         if scenarios:
-            print(f"{'Scenario':<30} {'Success Rate':<12} {'Avg Latency':<12} {'Attempts':<10}")
-            print("-" * 64)
+            print(f"{'Scenario':<30} {'Success Rate':<12} {'Avg Latency':<12} {'Attempts':<10} {'Std Dev':<10}")
+            print("-" * 76)
             for scenario_name, stats in sorted(scenarios.items(), key=lambda x: x[1]["success_rate"], reverse=True):
-                print(f"{scenario_name[:29]:<30} {stats['success_rate']:>6.1f}%     {stats['average_latency_ms']:>8.2f}ms   {stats['attempts']:>8}")
+                stdev = f"{stats['latency_stdev_ms']:>8.2f}ms" if "latency_stdev_ms" in stats else f"{'-':>10}"
+                print(f"{scenario_name[:29]:<30} {stats['success_rate']:>6.1f}%     {stats['average_latency_ms']:>8.2f}ms   {stats['attempts']:>8}   {stdev}")
+        
+        # Endpoint Breakdown (routed strategies only)
+        endpoints = analysis.get("endpoint_breakdown")
+        if endpoints:
+            print("\n" + "-" * 40)
+            print("ENDPOINT BREAKDOWN")
+            print("-" * 40)
+            print(f"{'Endpoint':<40} {'Requests':>8} {'Share':>7} {'Errors':>7} {'P50':>10} {'P95':>10}")
+            print("-" * 86)
+            for endpoint, stats in endpoints.items():
+                endpoint_percentiles = stats.get("latency", {}).get("percentiles", {})
+                print(f"{endpoint[:39]:<40} {stats['requests']:>8} {stats['share']:>6.1f}% {stats['error_rate']:>6.1f}% "
+                      f"{endpoint_percentiles.get('p50', 0):>8.2f}ms {endpoint_percentiles.get('p95', 0):>8.2f}ms")
         
         print("\n" + "=" * 80) 
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Side-by-side comparison of analyzed runs
+"""
+
+from typing import Dict, Any, List, Tuple
+
+
+def compare_analyses(runs: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Reduce several CombinedAnalyzer reports to comparable rows
+    
+    The first run is the baseline; every other row carries its latency deltas
+    relative to it.
+    
+    Args:
+        runs: (label, analysis) pairs, baseline first
+    
+    Returns:
+        One row per run
+    """
+    rows = []
+    for label, analysis in runs:
+        latency = analysis.get("latency", {})
+        percentiles = latency.get("percentiles", {})
+        rows.append({
+            "run": label,
+            "strategy": analysis.get("metadata", {}).get("strategy_name"),
+            "results": analysis.get("metadata", {}).get("total_results", 0),
+            "success_rate": analysis.get("accuracy", {}).get("success_rate", 0),
+            "average_ms": latency.get("average_ms", 0),
+            "p50_ms": percentiles.get("p50", 0),
+            "p95_ms": percentiles.get("p95", 0),
+            "p99_ms": percentiles.get("p99", 0)
+        })
+    
+    if rows:
+        baseline = rows[0]
+        for row in rows[1:]:
+            for key in ("average_ms", "p50_ms", "p95_ms", "p99_ms"):
+                if baseline[key]:
+                    row[f"{key[:-3]}_change_pct"] = round((row[key] - baseline[key]) / baseline[key] * 100, 1)
+    
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    """Print a comparison table in a human-readable format"""
+    print("\n" + "=" * 100)
+    print("RUN COMPARISON")
+    print("=" * 100)
+    
+    print(f"\n{'Run':<40} {'Results':>8} {'Success':>8} {'Avg':>10} {'P50':>10} {'P95':>10} {'P99':>10}")
+    print("-" * 100)
+    for row in rows:
+        print(f"{row['run'][-40:]:<40} {row['results']:>8} {row['success_rate']:>7.1f}% "
+              f"{row['average_ms']:>8.2f}ms {row['p50_ms']:>8.2f}ms {row['p95_ms']:>8.2f}ms {row['p99_ms']:>8.2f}ms")
+    
+    if len(rows) > 1:
+        print(f"\nChange vs. {rows[0]['run']}:")
+        for row in rows[1:]:
+            changes = ", ".join(
+                f"{label}: {row[f'{key}_change_pct']:+.1f}%"
+                for key, label in (("average", "Avg"), ("p50", "P50"), ("p95", "P95"), ("p99", "P99"))
+                if f"{key}_change_pct" in row
+            )
+            print(f"  {row['run']}: {changes}")
+    
+    print("\n" + "=" * 100)
@@ -0,0 +1,23 @@
+"""
+Percentile helper shared by the analyzer, the hedging policy and live progress
+"""
+
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], fraction: float) -> float:
+    """
+    Linearly interpolated percentile of some values (0.0 when there are none)
+    
+    Args:
+        values: Values in any order
+        fraction: Percentile as a fraction (0.95 for p95)
+    """
+    data = sorted(values)
+    if not data:
+        return 0.0
+    
+    index = fraction * (len(data) - 1)
+    lower = data[int(index)]
+    upper = data[min(int(index) + 1, len(data) - 1)]
+    return lower + (upper - lower) * (index - int(index))
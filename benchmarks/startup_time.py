@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+CLI startup time benchmark
+
+Times `main.py` invocations that should return without touching the network,
+and checks with `python -X importtime` that they never load the OpenAI SDK
+(and with it httpx and pydantic). Exits with status 1 when a command's median
+startup exceeds the budget or it imports a forbidden module, so it can gate CI.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --repeats 20 --budget-ms 150
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import List, Set, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(REPO_ROOT, "main.py")
+
+# Commands that must start quickly: help output and argument handling only
+COMMANDS = [
+    ["--help"],
+    ["run", "--help"],
+    ["analyze", "--help"],
+    ["compare", "--help"],
+    ["mock-server", "--help"],
+    ["run", "--strategy", "custom", "--help"]
+]
+
+# Heavy third-party packages that only an actual API run should load
+FORBIDDEN_MODULES = ("openai", "httpx", "pydantic")
+
+
+def time_command(args: List[str], repeats: int) -> List[float]:
+    """Wall time in ms for each of `repeats` runs of main.py with the given args"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN_SCRIPT] + args, cwd=REPO_ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def imported_modules(args: List[str]) -> Tuple[Set[str], float]:
+    """
+    Top-level packages imported by main.py with the given args
+    
+    Returns:
+        (package names, cumulative import time in ms)
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", MAIN_SCRIPT] + args, cwd=REPO_ROOT,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    packages = set()
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        name = fields[2].strip()
+        packages.add(name.split(".")[0])
+        if fields[1].strip().isdigit() and not fields[2].startswith("  "):
+            total_us += int(fields[1].strip())
+    return packages, total_us / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark main.py startup time")
+    parser.add_argument("--repeats", type=int, default=10,
+                        help="Runs per command; the median is compared against the budget (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=300.0,
+                        help="Maximum median wall time per command in ms (default: 300)")
+    args = parser.parse_args()
+    
+    failures = []
+    print(f"{'Command':<40} {'Median':>10} {'Min':>10} {'Imports':>10}  Forbidden")
+    print("-" * 90)
+    for command in COMMANDS:
+        timings = time_command(command, args.repeats)
+        packages, import_ms = imported_modules(command)
+        forbidden = sorted(p for p in FORBIDDEN_MODULES if p in packages)
+        median_ms = statistics.median(timings)
+        
+        label = " ".join(command)
+        print(f"{label:<40} {median_ms:>8.1f}ms {min(timings):>8.1f}ms {import_ms:>8.1f}ms  "
+              f"{', '.join(forbidden) or '-'}")
+        
+        if median_ms > args.budget_ms:
+            failures.append(f"'{label}' took {median_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+        if forbidden:
+            failures.append(f"'{label}' imported {', '.join(forbidden)}")
+    
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    
+    print(f"\nAll commands within {args.budget_ms:.0f}ms without heavy imports")
+
+
+if __name__ == "__main__":
+    main()
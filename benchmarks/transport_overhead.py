@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SDK vs raw HTTP transport overhead benchmark
+
+Starts `main.py mock-server` with zero latency on a free local port and sends
+the same sequential requests through OpenAIStrategy twice: once through the
+OpenAI SDK and once over the raw HTTP path (--raw-http). With the server
+answering immediately, what remains is the harness's own cost per request:
+building and encoding the request, the HTTP round trip on localhost, and
+parsing the response.
+
+Usage:
+    python benchmarks/transport_overhead.py
+    python benchmarks/transport_overhead.py --requests 2000 --config configs/example.json
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(REPO_ROOT, "main.py")
+sys.path.insert(0, REPO_ROOT)
+
+from transport.timing import OVERHEAD_PHASES, phase_durations_ms
+
+
+def free_port() -> int:
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_server(port: int, config: str = None) -> subprocess.Popen:
+    """Run the mock server in a subprocess (so its CPU time isn't counted) and wait until it accepts connections"""
+    command = [sys.executable, MAIN_SCRIPT, "mock-server", "--port", str(port), "--latency", "fixed:0"]
+    if config:
+        command += ["--configs", config]
+    server = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError(f"Mock server did not start on port {port}")
+
+
+def run_transport(raw_http: bool, base_url: str, scenarios, requests: int, warmup: int) -> Dict[str, Any]:
+    """
+    Send `requests` sequential requests through one transport
+    
+    Returns:
+        Latencies, harness overhead (build + send + parse) per request, CPU
+        time per request and throughput
+    """
+    from reasoning_strategies.openai_strategy import OpenAIStrategy
+    
+    strategy = OpenAIStrategy(model="mock", api_key="mock", base_url=base_url, raw_http=raw_http,
+                              client_max_retries=0)
+    for i in range(warmup):
+        strategy.execute_scenario(scenarios[i % len(scenarios)])
+    
+    latencies: List[float] = []
+    overheads: List[float] = []
+    errors = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for i in range(requests):
+        result = strategy.execute_scenario(scenarios[i % len(scenarios)])
+        if result.error:
+            errors += 1
+            continue
+        latencies.append(result.latency_ms)
+        durations = phase_durations_ms(result.metadata.get("timing_ns"))
+        overheads.append(sum(durations.get(phase, 0.0) for phase in OVERHEAD_PHASES))
+    wall_s = time.perf_counter() - wall_start
+    cpu_ms = (time.process_time() - cpu_start) * 1000
+    
+    if not latencies:
+        raise RuntimeError(f"Every {'raw' if raw_http else 'SDK'} request failed")
+    latencies.sort()
+    return {
+        "median_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "overhead_ms": statistics.median(overheads),
+        "cpu_ms": cpu_ms / requests,
+        "throughput": requests / wall_s,
+        "errors": errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OpenAI SDK and raw HTTP request overhead against the mock server")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="Timed requests per transport (default: 500)")
+    parser.add_argument("--warmup", type=int, default=50,
+                        help="Untimed requests per transport before timing starts (default: 50)")
+    parser.add_argument("--config",
+                        help="Scenario config file to send (default: the built-in scenarios)")
+    args = parser.parse_args()
+    
+    from main import create_test_suite
+    
+    scenarios = create_test_suite(config_file=args.config, verbose=False).get_scenarios()
+    for scenario in scenarios:
+        scenario.compiled_tools()
+    
+    port = free_port()
+    server = start_mock_server(port, args.config)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    try:
+        results = {
+            "sdk": run_transport(False, base_url, scenarios, args.requests, args.warmup),
+            "raw_http": run_transport(True, base_url, scenarios, args.requests, args.warmup)
+        }
+    finally:
+        server.terminate()
+        server.wait()
+    
+    print(f"{len(scenarios)} scenarios, {args.requests} sequential requests per transport against {base_url}\n")
+    print(f"{'Transport':<12} {'Median':>10} {'P95':>10} {'Overhead':>10} {'CPU/req':>10} {'Req/s':>8} {'Errors':>7}")
+    print("-" * 72)
+    for name, stats in results.items():
+        print(f"{name:<12} {stats['median_ms']:>8.2f}ms {stats['p95_ms']:>8.2f}ms {stats['overhead_ms']:>8.2f}ms "
+              f"{stats['cpu_ms']:>8.2f}ms {stats['throughput']:>8.0f} {stats['errors']:>7}")
+    
+    sdk, raw = results["sdk"], results["raw_http"]
+    print(f"\nRaw HTTP saves {sdk['median_ms'] - raw['median_ms']:.2f}ms median latency and "
+          f"{sdk['cpu_ms'] - raw['cpu_ms']:.2f}ms CPU per request "
+          f"({sdk['cpu_ms'] / raw['cpu_ms']:.1f}x less CPU)")
+
+
+if __name__ == "__main__":
+    main()
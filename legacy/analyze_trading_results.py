@@ -19,9 +19,70 @@ def load_latest_results(pattern="trading_terminal_results_*.json"):
     latest_file = max(files, key=os.path.getctime)
     print(f"Loading results from: {latest_file}")
     
-    with open(latest_file, 'r') as f:
+    return load_results_file(latest_file)
+
+def load_results_file(filepath: str) -> Dict:
+    """Load a JSON results file, or a streamed JSONL results file"""
+    if filepath.endswith(".jsonl"):
+        return load_jsonl_results(filepath)
+    
+    with open(filepath, 'r') as f:
         return json.load(f)
 
+def load_jsonl_results(filepath: str) -> Dict:
+    """
+    Load a streamed JSONL results file into the legacy results layout
+    
+    The file is read line by line; the summary is built from the trailer's
+    analysis when present, or from the results themselves for interrupted runs.
+    """
+    header = {}
+    analysis = None
+    results = []
+    total_latency = 0
+    
+    with open(filepath, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Truncated final line from an interrupted run
+            
+            record_type = record.get("type")
+            if record_type == "header":
+                header = record
+            elif record_type == "result":
+                results.append(record)
+                total_latency += record.get("latency_ms") or 0
+            elif record_type == "trailer":
+                analysis = record.get("analysis")
+    
+    if analysis and "accuracy" in analysis:
+        accuracy = analysis["accuracy"]
+        summary = {
+            "total_tests": accuracy.get("total_tests", 0),
+            "successful_tests": accuracy.get("successful_tests", 0),
+            "failed_tests": accuracy.get("failed_tests", 0),
+            "success_rate": accuracy.get("success_rate", 0),
+            "average_latency_ms": analysis.get("latency", {}).get("average_ms", 0)
+        }
+    else:
+        successful = sum(1 for r in results if r.get("success"))
+        summary = {
+            "total_tests": len(results),
+            "successful_tests": successful,
+            "failed_tests": len(results) - successful,
+            "success_rate": (successful / len(results) * 100) if results else 0,
+            "average_latency_ms": (total_latency / len(results)) if results else 0
+        }
+    
+    return {
+        "timestamp": header.get("timestamp"),
+        "model": header.get("reasoning_strategy"),
+        "summary": summary,
+        "detailed_results": results
+    }
+
 def analyze_results(data: Dict):
     """Analyze test results and print insights"""
     
@@ -180,10 +241,8 @@ def compare_results(file1: str, file2: str):
     print("COMPARING RESULTS")
     print("=" * 60)
     
-    with open(file1, 'r') as f:
-        data1 = json.load(f)
-    with open(file2, 'r') as f:
-        data2 = json.load(f)
+    data1 = load_results_file(file1)
+    data2 = load_results_file(file2)
     
     summary1 = data1.get("summary", {})
     summary2 = data2.get("summary", {})
@@ -222,8 +281,7 @@ def main():
         compare_results(args.compare[0], args.compare[1])
     else:
         if args.file:
-            with open(args.file, 'r') as f:
-                data = json.load(f)
+            data = load_results_file(args.file)
         else:
             data = load_latest_results(args.pattern)
         
@@ -6,16 +6,27 @@ Composable system that runs reasoning strategies against test suites and analyze
 
 import os
 import sys
+import time
 import argparse
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable, TYPE_CHECKING
 
 # Add the project root to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from reasoning_strategies.base_strategy import BaseReasoningStrategy
 from test_suites.base_test_suite import BaseTestSuite
-from analyzers.combined_analyzer import CombinedAnalyzer
+from analyzers.base_analyzer import BaseAnalyzer
+from tool_params.tool_definitions import TestScenario, ExecutionResult, ValidationResult
+
+# Only `run` needs these, so they're imported where used and startup stays fast
+if TYPE_CHECKING:
+    from storage.jsonl_results import JsonlResultWriter
+    from storage.checkpoint import RunCheckpoint
+    from scheduling.rate_limiter import RateLimiter
+    from reasoning_strategies.hedging import HedgingPolicy
+    from reporting.progress import ProgressReporter
 
 
 class ModelPerformanceTester:
@@ -23,63 +34,521 @@ class ModelPerformanceTester:
     
     def __init__(self, reasoning_strategy: BaseReasoningStrategy, 
                  test_suite: BaseTestSuite, 
-                 analyzer: CombinedAnalyzer,
-                 verbose: bool = True):
+                 analyzer: BaseAnalyzer,
+                 verbose: bool = True,
+                 concurrency: int = 1,
+                 trials: int = 1,
+                 warmup: int = 0,
+                 on_result: Optional[Callable[[ValidationResult], None]] = None,
+                 rate_limiter: Optional["RateLimiter"] = None,
+                 log_file: Optional[str] = None,
+                 connection_warmup: int = 0,
+                 cache_order: bool = False):
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+        if trials < 1:
+            raise ValueError(f"Trials must be at least 1, got {trials}")
+        if not 0 <= warmup < trials:
+            raise ValueError(f"Warmup must be between 0 and trials - 1, got {warmup} with {trials} trials")
+        
         self.reasoning_strategy = reasoning_strategy
         self.test_suite = test_suite
         self.analyzer = analyzer
         self.verbose = verbose
+        self.concurrency = concurrency
+        self.trials = trials
+        self.warmup = warmup
+        self.on_result = on_result
+        self.rate_limiter = rate_limiter
+        self.log_file = log_file
+        self.connection_warmup = connection_warmup
+        self.cache_order = cache_order  # Run scenarios sharing a prompt prefix back-to-back
+        self.progress: Optional["ProgressReporter"] = None
+        self.progress_label: Optional[str] = None  # Prefix for this tester's lines when a runner shares a reporter
         self.results = []
-        
+        self.keep_results = True  # Off while results stream to JSONL, so long runs don't grow in memory
+        self.result_count = 0
+        self.total_tokens = 0
+        self.run_info: Dict[str, Any] = {}
+        self.result_writer: Optional["JsonlResultWriter"] = None
+        self.checkpoint: Optional["RunCheckpoint"] = None
+        self._completed_jobs: Set[Tuple[Optional[str], Optional[int]]] = set()
+        self._analysis: Optional[Dict[str, Any]] = None
+    
     def run_tests(self) -> Dict[str, Any]:
         """Run all tests in the test suite using the reasoning strategy"""
+        self._print_run_header()
+        
+        # Get test scenarios from the test suite
+        scenarios = self.test_suite.get_scenarios()
+        jobs = self._build_jobs(scenarios)
+        self.warm_up_connections()
+        
+        if self.verbose:
+            print(f"\nRunning {len(scenarios)} scenarios x {self.trials} trial(s)...")
+        
+        return self.run_jobs(jobs)
+    
+    def run_jobs(self, jobs: List[Tuple[TestScenario, int]]) -> List[ValidationResult]:
+        """
+        Run an explicit list of (scenario, trial) jobs and append their results
+        
+        Used by run_tests() and by runners that decide what to run next
+        from the results so far.
+        """
+        with self._progress(len(jobs)):
+            if self.concurrency > 1:
+                self._keep(self._run_concurrent(jobs))
+                return self.results
+            
+            # Run each scenario using the reasoning strategy
+            base_index = self.result_count
+            for i, (scenario, trial) in enumerate(jobs, 1):
+                # Execute and validate the scenario
+                validated_result = self._run_scenario(scenario, time.perf_counter(), trial)
+                
+                self._keep([validated_result])
+                self._record_result(validated_result, base_index + i - 1)
+        
+        return self.results
+    
+    async def run_tests_async(self) -> List[ValidationResult]:
+        """
+        Run all tests on the current asyncio event loop
+        
+        Up to `concurrency` scenarios are kept in flight at once. Strategies that
+        override execute_scenario_async (e.g. AsyncOpenAIStrategy) run entirely on
+        the event loop; others run in a thread pool sized to match.
+        """
+        self._print_run_header()
+        
+        scenarios = self.test_suite.get_scenarios()
+        jobs = self._build_jobs(scenarios)
+        await self.warm_up_connections_async()
+        
+        if self.verbose:
+            print(f"\nRunning {len(scenarios)} scenarios x {self.trials} trial(s) on the event loop...")
+        
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Size the default executor so synchronous strategies aren't capped below our concurrency
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency))
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        base_index = self.result_count
+        
+        async def run_one(index: int, scenario: TestScenario, trial: int) -> Optional[ValidationResult]:
+            submitted_at = time.perf_counter()
+            
+            async with semaphore:
+                started_at = time.perf_counter()
+                result, throttled_s, retries = await self._execute_async(scenario)
+            
+            validated_result = self._validate(scenario, result)
+            validated_result.queue_wait_ms = round((started_at - submitted_at) * 1000, 2)
+            self._label_result(validated_result, scenario, trial)
+            self._label_throttling(validated_result, throttled_s, retries)
+            self._record_result(validated_result, base_index + index)
+            return validated_result if self.keep_results else None
+        
+        # gather() preserves submission order, so results stay in job order
+        with self._progress(len(jobs)):
+            results = await asyncio.gather(*(run_one(i, scenario, trial) for i, (scenario, trial) in enumerate(jobs)))
+        self._keep(results)
+        return self.results
+    
+    async def run_open_loop_async(self, rate_rps: float, total_requests: Optional[int] = None,
+                                  arrival: str = "fixed", max_in_flight: Optional[int] = None,
+                                  seed: Optional[int] = None) -> List[ValidationResult]:
+        """
+        Send requests on a fixed or Poisson schedule at a target rate (open-loop)
+        
+        Unlike run_tests, the next request never waits for the previous one to return,
+        so queueing shows up in the results instead of being hidden. Scenarios are
+        cycled until total_requests have been sent. Each result's queue_wait_ms covers
+        everything between its scheduled send time and the start of service, so
+        latency_ms + queue_wait_ms is the response time measured from the schedule.
+        """
+        self._print_run_header()
+        
+        scenarios = self.test_suite.get_scenarios()
+        if not scenarios:
+            return self.results
+        
+        self._compile_scenarios(scenarios)
+        if self.cache_order:
+            from scheduling.prompt_cache import order_for_prompt_cache
+            scenarios = [scenario for scenario, _ in order_for_prompt_cache([(s, 1) for s in scenarios],
+                                                                             self._system_prompt())]
+        total_requests = total_requests or len(scenarios)
+        offsets = build_arrival_schedule(rate_rps, total_requests, arrival, seed)
+        await self.warm_up_connections_async()
+        
+        if self.verbose:
+            print(f"\nOpen-loop: {total_requests} requests at {rate_rps:g} req/s ({arrival} arrivals)...")
+        
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max_in_flight or 256))
+        semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        base_index = self.result_count
+        
+        async def run_one(index: int, scenario: TestScenario, scheduled_at: float) -> Optional[ValidationResult]:
+            if semaphore:
+                async with semaphore:
+                    result, throttled_s, retries = await self._execute_async(scenario)
+            else:
+                result, throttled_s, retries = await self._execute_async(scenario)
+            finished_at = time.perf_counter()
+            
+            validated_result = self._validate(scenario, result)
+            
+            # Anything beyond service time and rate limiting since the scheduled send (dispatch
+            # lag, waiting for a slot or executor thread) is queueing that a closed loop would omit
+            response_time_ms = (finished_at - scheduled_at) * 1000
+            queue_wait_ms = response_time_ms - validated_result.latency_ms - throttled_s * 1000
+            validated_result.queue_wait_ms = round(max(0.0, queue_wait_ms), 2)
+            validated_result.scheduled = True
+            self._label_result(validated_result, scenario)
+            self._label_throttling(validated_result, throttled_s, retries)
+            self._record_result(validated_result, base_index + index)
+            return validated_result if self.keep_results else None
+        
+        tasks = []
+        start = time.perf_counter()
+        with self._progress(total_requests):
+            for i, offset in enumerate(offsets):
+                scheduled_at = start + offset
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(run_one(i, scenarios[i % len(scenarios)], scheduled_at)))
+            
+            results = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        
+        self._keep(results)
+        self.run_info = {
+            "mode": "open_loop",
+            "arrival": arrival,
+            "target_rps": rate_rps,
+            "achieved_rps": round(total_requests / elapsed, 2) if elapsed > 0 else 0,
+            "max_in_flight": max_in_flight,
+            "duration_s": round(elapsed, 2)
+        }
+        
+        if self.verbose:
+            print(f"\nSent {total_requests} requests in {elapsed:.2f}s ({self.run_info['achieved_rps']} req/s achieved)")
+        
+        return self.results
+    
+    def warm_up_connections(self) -> None:
+        """Open connection_warmup connections through the strategy before any timed request"""
+        if self.connection_warmup > 0:
+            warmed = self.reasoning_strategy.warm_up(self.connection_warmup)
+            self._print_warmup(warmed)
+    
+    async def warm_up_connections_async(self) -> None:
+        """Event-loop version of warm_up_connections(), so async clients warm the pool they will use"""
+        if self.connection_warmup > 0:
+            warmed = await self.reasoning_strategy.warm_up_async(self.connection_warmup)
+            self._print_warmup(warmed)
+    
+    def _print_warmup(self, warmed: int) -> None:
+        if self.verbose:
+            print(f"Connection warmup: {warmed}/{self.connection_warmup} requests succeeded")
+    
+    def _print_run_header(self) -> None:
+        """Print the banner shown at the start of a run"""
         if self.verbose:
             print("=" * 60)
             print("MODEL PERFORMANCE TESTING")
             print("=" * 60)
             print(f"Strategy: {self.reasoning_strategy.name}")
             print(f"Test Suite: {self.test_suite.name}")
+            print(f"Concurrency: {self.concurrency}")
             print(f"Timestamp: {datetime.now().isoformat()}")
+            if self.log_file:
+                print(f"Log File: {self.log_file}")
             print("=" * 60)
+    
+    @contextmanager
+    def _progress(self, total: int):
+        """
+        Report progress in the background while the block runs (verbose mode only)
         
-        # Get test scenarios from the test suite
-        scenarios = self.test_suite.get_scenarios()
+        Per-result detail goes to log_file, if set, instead of stdout.
+        """
+        if not self.verbose or self.progress is not None:
+            yield
+            return
         
-        if self.verbose:
-            print(f"\nRunning {len(scenarios)} scenarios...")
+        from reporting.progress import ProgressReporter
+        self.progress = ProgressReporter(total, log_file=self.log_file)
+        try:
+            with self.progress:
+                yield
+        finally:
+            self.progress = None
+    
+    def _build_jobs(self, scenarios: List[TestScenario]) -> List[Tuple[TestScenario, int]]:
+        """
+        Expand scenarios into (scenario, trial) jobs
         
-        # Run each scenario using the reasoning strategy
-        for i, scenario in enumerate(scenarios, 1):
-            if self.verbose:
-                print(f"\n[{i}/{len(scenarios)}] {scenario.name}")
-                print(f"Prompt: {scenario.prompt}")
-                print("Running...", end="", flush=True)
+        Trials are interleaved (every scenario's trial 1, then every trial 2, ...)
+        so a transient network blip is spread across scenarios instead of
+        landing on consecutive trials of the same one. With cache_order, jobs are
+        then grouped by prompt prefix (system prompt + tools) so the provider's
+        prompt cache stays warm. Jobs already completed in a resumed checkpoint
+        are skipped.
+        """
+        self._compile_scenarios(scenarios)
+        jobs = [(scenario, trial) for trial in range(1, self.trials + 1) for scenario in scenarios]
+        jobs = self._cache_ordered(jobs)
+        if self._completed_jobs:
+            jobs = [(scenario, trial) for scenario, trial in jobs
+                    if (scenario.content_hash(), trial) not in self._completed_jobs]
+        return jobs
+    
+    def _cache_ordered(self, jobs: List[Tuple[TestScenario, int]]) -> List[Tuple[TestScenario, int]]:
+        """Group jobs by prompt prefix when cache_order is on (see order_for_prompt_cache)"""
+        if not self.cache_order:
+            return jobs
+        from scheduling.prompt_cache import order_for_prompt_cache
+        return order_for_prompt_cache(jobs, self._system_prompt())
+    
+    def _system_prompt(self) -> str:
+        """The strategy's system prompt, part of every request's cacheable prefix"""
+        return getattr(self.reasoning_strategy, "system_prompt", "") or ""
+    
+    def _compile_scenarios(self, scenarios: List[TestScenario]) -> None:
+        """Compile tool payloads and content hashes up front so no timed request pays for them"""
+        for scenario in scenarios:
+            scenario.compiled_tools()
+            scenario.content_hash()
+    
+    def _label_result(self, validated_result: ValidationResult, scenario: TestScenario,
+                      trial: Optional[int] = None) -> None:
+        """Tag a result with its scenario hash, trial number and whether it is a warmup"""
+        validated_result.scenario_hash = scenario.content_hash()
+        if trial is not None:
+            validated_result.trial = trial
+            validated_result.warmup = trial <= self.warmup
+    
+    def _run_concurrent(self, jobs: List[Tuple[TestScenario, int]]) -> List[ValidationResult]:
+        """Run jobs through a bounded worker pool, returning results in job order"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        results: List[Optional[ValidationResult]] = [None] * len(jobs)
+        base_index = self.result_count
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            submitted_at = time.perf_counter()
+            futures = {
+                executor.submit(self._run_scenario, scenario, submitted_at, trial): i
+                for i, (scenario, trial) in enumerate(jobs)
+            }
             
-            # Execute the scenario
+            try:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    validated_result = future.result()
+                    if self.keep_results:
+                        results[i] = validated_result
+                    self._record_result(validated_result, base_index + i)
+            except KeyboardInterrupt:
+                # Don't start queued scenarios on Ctrl-C; only in-flight ones finish
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        
+        return results
+    
+    def _run_scenario(self, scenario: TestScenario, submitted_at: float, trial: int = 1) -> ValidationResult:
+        """Execute and validate one scenario, recording how long it waited to start"""
+        started_at = time.perf_counter()
+        
+        result, throttled_s, retries = self._execute(scenario)
+        validated_result = self._validate(scenario, result)
+        
+        # latency_ms stays pure service time; waiting for a free worker is tracked separately
+        validated_result.queue_wait_ms = round((started_at - submitted_at) * 1000, 2)
+        self._label_result(validated_result, scenario, trial)
+        self._label_throttling(validated_result, throttled_s, retries)
+        return validated_result
+    
+    def _validate(self, scenario: TestScenario, result: ExecutionResult) -> ValidationResult:
+        """Validate a result, marking the validate phase on its timing (if it has any)"""
+        from transport.timing import mark_result
+        validated_result = self.test_suite.validate_result(scenario, result)
+        mark_result(validated_result.metadata, "validate")
+        return validated_result
+    
+    def _execute(self, scenario: TestScenario) -> Tuple[ExecutionResult, float, int]:
+        """
+        Execute a scenario within the rate limits, retrying throttled attempts
+        
+        Returns:
+            (result of the last attempt, seconds spent throttled, number of retries)
+        """
+        if self.progress:
+            self.progress.started()
+        
+        if not self.rate_limiter:
+            return self.reasoning_strategy.execute_scenario(scenario), 0.0, 0
+        
+        limiter = self.rate_limiter
+        estimate = self._estimate_tokens(scenario)
+        throttled_s = 0.0
+        attempt = 0
+        while True:
+            throttled_s += limiter.acquire(estimate)
             result = self.reasoning_strategy.execute_scenario(scenario)
+            limiter.settle(estimate, result)
+            if not limiter.should_retry(result, attempt):
+                return result, throttled_s, attempt
             
-            # Validate the result
-            validated_result = self.test_suite.validate_result(scenario, result)
+            # The rejected round trip counts as throttling too, not model latency
+            delay = limiter.backoff_delay(result, attempt)
+            time.sleep(delay)
+            throttled_s += delay + result.latency_ms / 1000
+            attempt += 1
+    
+    async def _execute_async(self, scenario: TestScenario) -> Tuple[ExecutionResult, float, int]:
+        """Event-loop version of _execute()"""
+        import asyncio
+        
+        if self.progress:
+            self.progress.started()
+        
+        if not self.rate_limiter:
+            return await self.reasoning_strategy.execute_scenario_async(scenario), 0.0, 0
+        
+        limiter = self.rate_limiter
+        estimate = self._estimate_tokens(scenario)
+        throttled_s = 0.0
+        attempt = 0
+        while True:
+            throttled_s += await limiter.acquire_async(estimate)
+            result = await self.reasoning_strategy.execute_scenario_async(scenario)
+            limiter.settle(estimate, result)
+            if not limiter.should_retry(result, attempt):
+                return result, throttled_s, attempt
             
-            self.results.append(validated_result)
+            delay = limiter.backoff_delay(result, attempt)
+            await asyncio.sleep(delay)
+            throttled_s += delay + result.latency_ms / 1000
+            attempt += 1
+    
+    def _estimate_tokens(self, scenario: TestScenario) -> int:
+        return self.rate_limiter.estimate_tokens(
+            scenario,
+            system_prompt=getattr(self.reasoning_strategy, "system_prompt", ""),
+            max_completion_tokens=getattr(self.reasoning_strategy, "max_tokens", None)
+        )
+    
+    def _label_throttling(self, validated_result: ValidationResult, throttled_s: float, retries: int) -> None:
+        """Record rate limiter wait and retries on a result (only when a limiter is in use)"""
+        if self.rate_limiter:
+            validated_result.throttle_wait_ms = round(throttled_s * 1000, 2)
+            validated_result.retries = retries
+    
+    def stream_results_to(self, output_dir: str = "results", flush_every: int = 50,
+                          flush_interval_s: float = 1.0) -> str:
+        """
+        Append each result to a JSONL file as soon as it finishes
+        
+        Call before running tests. save_results() then writes the analysis trailer
+        and closes the file instead of dumping a single JSON document.
+        
+        Returns:
+            Path of the JSONL file being written
+        """
+        from storage.jsonl_results import JsonlResultWriter
+        from transport.client_pool import pool_config
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{self.reasoning_strategy.name}_{self.test_suite.name}_{timestamp}.jsonl"
+        
+        self.result_writer = JsonlResultWriter(
+            os.path.join(output_dir, filename),
+            metadata={
+                "timestamp": datetime.now().isoformat(),
+                "reasoning_strategy": self.reasoning_strategy.name,
+                "test_suite": self.test_suite.name,
+                "concurrency": self.concurrency,
+                "trials": self.trials,
+                "warmup": self.warmup,
+                "rate_limit": self.rate_limiter.get_config() if self.rate_limiter else None,
+                "connection_pool": pool_config(),
+                "connection_warmup": self.connection_warmup,
+                "cache_order": self.cache_order
+            },
+            flush_every=flush_every,
+            flush_interval_s=flush_interval_s
+        ).open()
+        self.keep_results = False
+        
+        if self.verbose:
+            print(f"Streaming results to: {self.result_writer.filepath}")
+        
+        return self.result_writer.filepath
+    
+    def _keep(self, results: List[Optional[ValidationResult]]) -> None:
+        """Hold finished results in memory, unless they are streamed to JSONL"""
+        if self.keep_results:
+            self.results.extend(results)
+    
+    def _count(self, validated_result: ValidationResult) -> None:
+        """Feed a result to the analyzer and the running totals that stand in for self.results"""
+        self.analyzer.update(validated_result)
+        self.result_count += 1
+        self.total_tokens += (validated_result.tokens_used or {}).get("total_tokens", 0)
+        self._analysis = None
+    
+    def _record_result(self, validated_result: ValidationResult, index: int) -> None:
+        """Feed a finished result to the analyzer, JSONL stream, checkpoint and on_result callback"""
+        self._count(validated_result)
+        
+        if self.result_writer:
+            self.result_writer.write(validated_result, index=index)
+        if self.checkpoint:
+            self.checkpoint.record(validated_result)
+        if self.on_result:
+            self.on_result(validated_result)
+        if self.progress:
+            self.progress.finished(validated_result, source=self.progress_label)
+    
+    def enable_checkpoint(self, checkpoint: "RunCheckpoint", resume: bool = False) -> None:
+        """
+        Record every finished result to a run checkpoint
+        
+        Args:
+            checkpoint: Checkpoint to write to
+            resume: Load the checkpoint's completed results into this tester (and its
+                    JSONL stream, if any) and skip their (scenario, trial) jobs, so
+                    only missing work runs
+        """
+        self.checkpoint = checkpoint
+        
+        if resume:
+            completed = checkpoint.completed_results()
+            self._keep(completed)
+            for result in completed:
+                if self.result_writer:
+                    self.result_writer.write(result, index=self.result_count)
+                self._count(result)
+            self._completed_jobs = {(r.scenario_hash, r.trial) for r in completed}
             
             if self.verbose:
-                success_indicator = "✓" if validated_result.success else "✗"
-                print(f" {success_indicator} ({validated_result.latency_ms:.2f}ms)")
-                
-                if validated_result.actual_tool_calls:
-                    print(f"  Tool calls: {len(validated_result.actual_tool_calls)}")
-                    for tc in validated_result.actual_tool_calls:
-                        print(f"    - {tc.get('name', 'unknown')}({tc.get('arguments', {})})")
-                
-                if not validated_result.success:
-                    print(f"  ⚠️  Validation failed: {validated_result.validation_details.get('reason', 'Unknown')}")
-        
-        return self.results
+                print(f"Resuming run {checkpoint.run_id}: {len(completed)} results already completed")
     
     def analyze_results(self) -> Dict[str, Any]:
         """Analyze the test results"""
-        if not self.results:
+        if not self.result_count:
             print("No results to analyze. Run tests first.")
             return {}
         
@@ -88,32 +557,42 @@ class ModelPerformanceTester:
             print("ANALYZING RESULTS")
             print("=" * 60)
         
-        # Use the analyzer to process results
-        analysis = self.analyzer.analyze(
-            results=self.results,
-            strategy_name=self.reasoning_strategy.name,
-            test_suite_name=self.test_suite.name
-        )
+        analysis = self._get_analysis()
         
         if self.verbose:
             self.analyzer.print_analysis(analysis)
         
         return analysis
     
+    def _get_analysis(self) -> Dict[str, Any]:
+        """
+        Analysis of the current results, built once and reused
+        
+        The analyzer is fed each result as it finishes, so building the report
+        doesn't walk the results again. The cached report is dropped whenever a
+        new result is recorded.
+        """
+        if self._analysis is None:
+            self._analysis = self.analyzer.report(
+                strategy_name=self.reasoning_strategy.name,
+                test_suite_name=self.test_suite.name
+            )
+        return self._analysis
+    
     def save_results(self, output_dir: str = "results") -> str:
         """Save results and analysis to files"""
+        if self.result_writer:
+            return self._close_result_stream()
+        
+        from transport.client_pool import pool_config
         os.makedirs(output_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{self.reasoning_strategy.name}_{self.test_suite.name}_{timestamp}.json"
         filepath = os.path.join(output_dir, filename)
         
-        # Get analysis
-        analysis = self.analyzer.analyze(
-            results=self.results,
-            strategy_name=self.reasoning_strategy.name,
-            test_suite_name=self.test_suite.name
-        )
+        # Reuse the analysis from analyze_results() if nothing changed since
+        analysis = self._get_analysis()
         
         # Save to file
         output_data = {
@@ -121,10 +600,18 @@ class ModelPerformanceTester:
                 "timestamp": datetime.now().isoformat(),
                 "reasoning_strategy": self.reasoning_strategy.name,
                 "test_suite": self.test_suite.name,
-                "total_scenarios": len(self.results)
+                "total_scenarios": len(self.results),
+                "concurrency": self.concurrency,
+                "trials": self.trials,
+                "warmup": self.warmup,
+                "rate_limit": self.rate_limiter.get_config() if self.rate_limiter else None,
+                "connection_pool": pool_config(),
+                "connection_warmup": self.connection_warmup,
+                "cache_order": self.cache_order,
+                **self.run_info
             },
             "analysis": analysis,
-            "detailed_results": [result.to_dict() for result in self.results]
+            "detailed_results": self._detailed_results()
         }
         
         import json
@@ -135,6 +622,80 @@ class ModelPerformanceTester:
             print(f"\nResults saved to: {filepath}")
         
         return filepath
+    
+    
+    def _close_result_stream(self) -> str:
+        """Write the analysis trailer to the JSONL stream and close it"""
+        analysis = dict(self._get_analysis())
+        if self.run_info:
+            analysis["run_info"] = self.run_info
+        
+        filepath = self.result_writer.close(analysis)
+        self.result_writer = None
+        
+        if self.verbose:
+            print(f"\nResults saved to: {filepath}")
+        
+        return filepath
+    
+    def _detailed_results(self) -> List[Dict[str, Any]]:
+        """
+        Serialize results for the output file
+        
+        With a single trial this is one flat entry per result. With repeated trials,
+        trials are nested under their scenario so scenario data isn't repeated N times.
+        """
+        if self.trials == 1:
+            return [result.to_dict() for result in self.results]
+        
+        scenario_entries: Dict[str, Dict[str, Any]] = {}
+        for result in self.results:
+            result_data = result.to_dict()
+            scenario_name = result_data.pop("scenario_name")
+            expected_tool_calls = result_data.pop("expected_tool_calls")
+            
+            if scenario_name not in scenario_entries:
+                scenario_entries[scenario_name] = {
+                    "scenario_name": scenario_name,
+                    "expected_tool_calls": expected_tool_calls,
+                    "trials": []
+                }
+            scenario_entries[scenario_name]["trials"].append(result_data)
+        
+        # Resumed runs finish trials out of order
+        for entry in scenario_entries.values():
+            entry["trials"].sort(key=lambda t: t.get("trial") or 0)
+        
+        return list(scenario_entries.values())
+
+
+def build_arrival_schedule(rate_rps: float, total_requests: int, arrival: str = "fixed",
+                           seed: Optional[int] = None) -> List[float]:
+    """
+    Build send-time offsets (seconds from start) for an open-loop run
+    
+    Args:
+        rate_rps: Target request rate in requests per second
+        total_requests: Number of requests to schedule
+        arrival: "fixed" for evenly spaced sends, "poisson" for exponential inter-arrival times
+        seed: Optional random seed for reproducible Poisson schedules
+    """
+    if rate_rps <= 0:
+        raise ValueError(f"Request rate must be positive, got {rate_rps}")
+    
+    if arrival == "fixed":
+        return [i / rate_rps for i in range(total_requests)]
+    elif arrival == "poisson":
+        import random
+        rng = random.Random(seed)
+        offsets = []
+        t = 0.0
+        for _ in range(total_requests):
+            offsets.append(t)
+            t += rng.expovariate(rate_rps)
+        return offsets
+    else:
+        raise ValueError(f"Unknown arrival process: {arrival}")
 
 
 def create_reasoning_strategy(strategy_name: str, **kwargs) -> BaseReasoningStrategy:
@@ -142,6 +703,12 @@ def create_reasoning_strategy(strategy_name: str, **kwargs) -> BaseReasoningStra
     if strategy_name.lower() == "openai":
         from reasoning_strategies.openai_strategy import OpenAIStrategy
         return OpenAIStrategy(**kwargs)
+    elif strategy_name.lower() == "openai-async":
+        from reasoning_strategies.async_openai_strategy import AsyncOpenAIStrategy
+        return AsyncOpenAIStrategy(**kwargs)
+    elif strategy_name.lower() == "endpoint":
+        from reasoning_strategies.endpoint_strategy import EndpointStrategy
+        return EndpointStrategy(**kwargs)
     elif strategy_name.lower() == "custom":
         from reasoning_strategies.custom_strategy import CustomStrategy
         return CustomStrategy(**kwargs)
@@ -149,19 +716,128 @@ def create_reasoning_strategy(strategy_name: str, **kwargs) -> BaseReasoningStra
         raise ValueError(f"Unknown reasoning strategy: {strategy_name}")
 
 
+def create_hedging_policy(delay_ms: Optional[float] = None,
+                          percentile: Optional[float] = None) -> Optional["HedgingPolicy"]:
+    """Hedging policy from command line values (percentile in percent), or None when hedging is off"""
+    if delay_ms is None and percentile is None:
+        return None
+    from reasoning_strategies.hedging import HedgingPolicy
+    return HedgingPolicy(delay_ms=delay_ms, percentile=percentile / 100 if percentile is not None else None)
+
+
 def create_test_suite(**kwargs) -> BaseTestSuite:
     """Factory function to create a configurable test suite"""
     from test_suites.base_test_suite import BaseTestSuite
     return BaseTestSuite(**kwargs)
 
 
-def main():
-    """Main entry point"""
-    parser = argparse.ArgumentParser(description="Model Performance Testing Framework")
+def create_cassette(record: Optional[str] = None, replay: Optional[str] = None,
+                    replay_latency: bool = False):
+    """Response cassette from command line values, or None when neither recording nor replaying"""
+    if not record and not replay:
+        return None
+    from storage.cassette import ResponseCassette, RECORD, REPLAY
+    return ResponseCassette(record or replay, mode=RECORD if record else REPLAY, replay_latency=replay_latency)
+
+
+def run_max_in_flight(config: Dict[str, Any]) -> int:
+    """Most requests a run's settings keep in flight at once"""
+    if config.get("rate"):
+        # Matches the open-loop runner's default executor when in-flight requests aren't capped
+        return config.get("max_in_flight") or 256
+    if config.get("sweep"):
+        from runners.concurrency_sweep import parse_concurrency_levels
+        return max(parse_concurrency_levels(config["sweep"]))
+    return config.get("concurrency") or 1
+
+
+def strategy_options(config: Dict[str, Any], cassette=None) -> Dict[str, Any]:
+    """
+    create_reasoning_strategy keyword arguments for a run's settings
+    
+    Args:
+        config: Command line values by name (vars(args), or a checkpoint / worker config)
+        cassette: Response cassette shared by the run's strategies
     
+    Returns:
+        Keyword arguments; each call creates a fresh hedging policy, so strategies
+        don't share latency history
+    """
+    rate_limited = bool(config.get("rpm") or config.get("tpm"))
+    return {
+        # The rate limiter, when enabled, owns 429 retries
+        "client_max_retries": 0 if rate_limited else None,
+        "hedging": create_hedging_policy(config.get("hedge_delay"), config.get("hedge_percentile")),
+        "max_in_flight": run_max_in_flight(config),
+        "stream": config.get("stream", False),
+        "cassette": cassette,
+        "base_url": config.get("base_url"),
+        "raw_http": config.get("raw_http", False),
+        "endpoints": config.get("endpoints"),
+        "routing": config.get("routing")
+    }
+
+
+# Command line arguments recorded in a checkpoint so a resumed run recreates the same setup
+CHECKPOINT_ARGS = ["strategy", "model", "config", "tags", "concurrency", "trials", "warmup", "use_async",
+                   "rpm", "tpm", "max_retries", "hedge_delay", "hedge_percentile", "stream",
+                   "max_connections", "max_keepalive", "keepalive_expiry", "warm_connections",
+                   "record", "replay", "replay_latency", "base_url",
+                   "cache_order", "raw_http", "endpoints", "routing", "output_format"]
+
+
+def run_tester(tester: ModelPerformanceTester, args: argparse.Namespace) -> List[ValidationResult]:
+    """Run the tester in the mode selected on the command line"""
+    if args.workers:
+        from runners.distributed import DistributedCoordinator
+        
+        # Workers get the same settings a checkpoint would record
+        return DistributedCoordinator(
+            tester,
+            config={key: getattr(args, key) for key in CHECKPOINT_ARGS},
+            num_workers=args.workers,
+            local_workers=args.local_workers,
+            listen=args.listen,
+            verbose=args.verbose
+        ).run()
+    elif args.adaptive:
+        from runners.adaptive import AdaptiveSampler
+        
+        return AdaptiveSampler(
+            tester,
+            percentile=args.adaptive_percentile / 100,
+            scope=args.adaptive_scope,
+            target_width_ms=args.ci_width,
+            target_relative_width=args.ci_relative_width,
+            min_trials=args.min_trials,
+            max_duration_s=args.max_seconds,
+            max_requests=args.max_requests,
+            max_tokens=args.max_tokens,
+            seed=args.seed,
+            verbose=args.verbose
+        ).run()
+    elif args.rate:
+        import asyncio
+        total_requests = int(args.duration * args.rate) if args.duration else args.requests
+        return asyncio.run(tester.run_open_loop_async(
+            rate_rps=args.rate,
+            total_requests=total_requests,
+            arrival=args.arrival,
+            max_in_flight=args.max_in_flight,
+            seed=args.seed
+        ))
+    elif args.use_async:
+        import asyncio
+        return asyncio.run(tester.run_tests_async())
+    else:
+        return tester.run_tests()
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options for the `run` subcommand"""
     # Strategy selection
     parser.add_argument("--strategy", default="openai", 
-                       choices=["openai", "custom"],
+                       choices=["openai", "openai-async", "endpoint", "custom"],
                        help="Reasoning strategy to use")
     parser.add_argument("--model", default="o3",
                        help="Model to use (for strategies that support it)")
@@ -172,31 +848,404 @@ def main():
     parser.add_argument("--tags", nargs="*",
                        help="Filter scenarios by tags")
     
+    # Execution options
+    parser.add_argument("--concurrency", type=int, default=1,
+                       help="Number of scenarios to run in parallel")
+    parser.add_argument("--trials", type=int, default=1,
+                       help="Number of times to run each scenario")
+    parser.add_argument("--warmup", type=int, default=0,
+                       help="Leading trials per scenario to exclude from latency statistics")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                       help="Run scenarios on an asyncio event loop (pair with --strategy openai-async)")
+    
+    # Hedged requests
+    parser.add_argument("--hedge-delay", type=float,
+                       help="Send a duplicate request if the first hasn't answered after this many ms")
+    parser.add_argument("--hedge-percentile", type=float,
+                       help="Hedge at this percentile of observed latency, e.g. 95 (--hedge-delay is the fallback until enough history)")
+    parser.add_argument("--stream", action="store_true",
+                       help="Stream responses and record time to first token, first tool name and complete tool arguments")
+    parser.add_argument("--raw-http", action="store_true",
+                       help="Send pre-serialized request bodies over the pooled HTTP client instead of through the OpenAI SDK (no streaming)")
+    
+    # Record/replay
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE",
+                               help="Store every OpenAI response in this SQLite cassette for later replay")
+    cassette_group.add_argument("--replay", metavar="CASSETTE",
+                               help="Serve OpenAI responses from this cassette instead of calling the API (offline)")
+    parser.add_argument("--replay-latency", action="store_true",
+                       help="With --replay, wait out each response's recorded latency")
+    
+    # Connection pool
+    parser.add_argument("--base-url",
+                       help="API base URL for OpenAI strategies, e.g. http://127.0.0.1:8000/v1 for `main.py mock-server`")
+    parser.add_argument("--endpoints", nargs="+", metavar="BASE_URL",
+                       help="Endpoint strategy: OpenAI-compatible base URLs to load balance across, each with its own pool")
+    parser.add_argument("--routing", choices=["least-outstanding", "ewma"], default="least-outstanding",
+                       help="Endpoint strategy: send each request to the endpoint with the fewest in flight, "
+                            "or the lowest moving-average latency (default: least-outstanding)")
+    parser.add_argument("--max-connections", type=int,
+                       help="Connections open at once across the shared HTTP client pool (default: 1000)")
+    parser.add_argument("--max-keepalive", type=int,
+                       help="Idle connections kept open for reuse (default: 100)")
+    parser.add_argument("--keepalive-expiry", type=float,
+                       help="Seconds an idle connection stays open (default: 5)")
+    parser.add_argument("--warm-connections", type=int, default=0,
+                       help="Open this many connections with untimed requests before the run starts")
+    
+    # Request ordering
+    parser.add_argument("--cache-order", action="store_true",
+                       help="Group requests that share a system prompt and tool list so provider prompt caching can reuse the prefix")
+    
+    # Rate limiting
+    parser.add_argument("--rpm", type=float,
+                       help="Requests-per-minute budget shared by all workers "
+                            "(with --workers, split by each shard's share of the scenarios)")
+    parser.add_argument("--tpm", type=float,
+                       help="Tokens-per-minute budget shared by all workers (estimated before each request; "
+                            "split like --rpm)")
+    parser.add_argument("--max-retries", type=int, default=5,
+                       help="Retries after a 429/503, with jittered exponential backoff (needs --rpm or --tpm)")
+    
+    # Open-loop load generation
+    parser.add_argument("--rate", type=float,
+                       help="Open-loop mode: send requests at this many per second regardless of response time")
+    parser.add_argument("--arrival", default="fixed", choices=["fixed", "poisson"],
+                       help="Open-loop arrival process")
+    parser.add_argument("--requests", type=int,
+                       help="Open-loop mode: total requests to send, cycling through scenarios")
+    parser.add_argument("--duration", type=float,
+                       help="Open-loop mode: run for this many seconds (overrides --requests)")
+    parser.add_argument("--max-in-flight", type=int,
+                       help="Open-loop mode: cap on outstanding requests (default: unbounded)")
+    parser.add_argument("--seed", type=int,
+                       help="Random seed for Poisson arrivals")
+    
+    # Saturation sweep
+    parser.add_argument("--sweep",
+                       help="Sweep concurrency levels, e.g. '1,2,4,8' or '1-256' (powers of two)")
+    parser.add_argument("--sweep-requests", type=int,
+                       help="Requests per sweep level (default: max(scenarios, 4 x level))")
+    parser.add_argument("--sweep-warmup", type=int,
+                       help="Discarded requests at the first sweep level before timing (default: one pass over the scenarios; 0 to skip)")
+    
+    # Adaptive sampling
+    parser.add_argument("--adaptive", action="store_true",
+                       help="Keep sampling until the latency percentile's confidence interval is narrow enough")
+    parser.add_argument("--adaptive-percentile", type=float, default=95,
+                       help="Adaptive mode: percentile to converge (e.g. 95 for p95)")
+    parser.add_argument("--adaptive-scope", default="scenario", choices=["scenario", "overall"],
+                       help="Adaptive mode: converge each scenario's percentile or the pooled one")
+    parser.add_argument("--ci-width", type=float,
+                       help="Adaptive mode: target confidence interval width in ms")
+    parser.add_argument("--ci-relative-width", type=float, default=0.10,
+                       help="Adaptive mode: target width as a fraction of the estimate (when --ci-width is unset)")
+    parser.add_argument("--min-trials", type=int, default=5,
+                       help="Adaptive mode: trials per scenario before checking convergence")
+    parser.add_argument("--max-seconds", type=float,
+                       help="Adaptive mode: time budget")
+    parser.add_argument("--max-requests", type=int,
+                       help="Adaptive mode: request budget")
+    parser.add_argument("--max-tokens", type=int,
+                       help="Adaptive mode: total token budget")
+    
+    # Strategy x model x config matrix
+    parser.add_argument("--strategies", nargs="+", choices=["openai", "openai-async", "endpoint", "custom"],
+                       help="Matrix mode: strategies to compare in one run (default: --strategy)")
+    parser.add_argument("--models", nargs="+",
+                       help="Matrix mode: models to compare in one run (default: --model)")
+    parser.add_argument("--configs", nargs="+",
+                       help="Matrix mode: config files to compare in one run (default: --config)")
+    
+    # Distributed load generation
+    parser.add_argument("--workers", type=int,
+                       help="Coordinator mode: shard scenarios across this many worker processes")
+    parser.add_argument("--local-workers", type=int,
+                       help="Coordinator mode: how many workers to start on this machine (default: all)")
+    parser.add_argument("--listen", default="127.0.0.1:0",
+                       help="Coordinator mode: address workers connect to, e.g. 0.0.0.0:7400 for remote workers")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                       help="Worker mode: run the shard assigned by the coordinator at HOST:PORT")
+    
     # Output options
     parser.add_argument("--output-dir", default="results",
                        help="Directory to save results")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                       help="Resume an interrupted run from its checkpoint, running only missing scenarios")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                       help="Don't write a checkpoint for this run (checkpoints are deleted once a run's results are saved)")
+    parser.add_argument("--output-format", default="json", choices=["json", "jsonl"],
+                       help="json: one document at the end of the run; jsonl: append each result as it finishes")
+    parser.add_argument("--log-file",
+                       help="Write one detail line per result to this file (the terminal only shows a status line)")
     parser.add_argument("--verbose", action="store_true", default=True,
                        help="Verbose output")
     parser.add_argument("--quiet", action="store_true",
                        help="Quiet mode (overrides verbose)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line parser with run / analyze / compare / mock-server subcommands"""
+    parser = argparse.ArgumentParser(
+        description="Model Performance Testing Framework",
+        epilog="Options without a subcommand are passed to `run`, e.g. `main.py --strategy custom`."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    
+    add_run_arguments(subparsers.add_parser("run", help="Run a test suite against a reasoning strategy (default)"))
+    
+    analyze_parser = subparsers.add_parser("analyze", help="Re-analyze a saved .json or .jsonl results file")
+    analyze_parser.add_argument("results_file", help="Results file written by a previous run")
+    analyze_parser.add_argument("--json", action="store_true",
+                                help="Print the analysis as JSON instead of a report")
     
-    args = parser.parse_args()
+    compare_parser = subparsers.add_parser("compare", help="Compare latency and accuracy across saved results files")
+    compare_parser.add_argument("results_files", nargs="+",
+                                help="Results files to compare; the first is the baseline")
     
+    mock_parser = subparsers.add_parser("mock-server",
+                                        help="Serve a local OpenAI-compatible endpoint that answers with expected tool calls")
+    mock_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    mock_parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    mock_parser.add_argument("--configs", nargs="+",
+                             default=["config/test_scenarios.json", "config/trading_scenarios.json"],
+                             help="Scenario config files whose expected tool calls are served")
+    mock_parser.add_argument("--latency", default="fixed:0",
+                             help="fixed:<ms>, lognormal:<median ms>,<sigma>, or lognormal / empirical "
+                                  "to fit the latencies in --results (default: fixed:0)")
+    mock_parser.add_argument("--results", nargs="+",
+                             help="Results files to fit --latency lognormal/empirical to (default: results/*.json*)")
+    mock_parser.add_argument("--fit-strategies", nargs="+",
+                             help="Only fit results from strategies whose name starts with one of these "
+                                  "(default: the API-backed OpenAI, AsyncOpenAI and Endpoint strategies)")
+    mock_parser.add_argument("--wrong-rate", type=float, default=0.0,
+                             help="Share of responses with wrong tool calls")
+    mock_parser.add_argument("--error-429", type=float, default=0.0,
+                             help="Share of requests rejected with 429 and Retry-After")
+    mock_parser.add_argument("--error-500", type=float, default=0.0,
+                             help="Share of requests failed with 500")
+    mock_parser.add_argument("--retry-after", type=float, default=1.0,
+                             help="Retry-After seconds sent with 429s")
+    mock_parser.add_argument("--ttft-fraction", type=float, default=0.6,
+                             help="Share of a streamed response's latency before its first chunk")
+    mock_parser.add_argument("--cache-hit-factor", type=float, default=1.0,
+                             help="Latency multiplier for requests whose system prompt + tools prefix was seen before")
+    mock_parser.add_argument("--seed", type=int, help="Random seed for latencies and injected failures")
+    
+    return parser
+
+
+SUBCOMMANDS = ("run", "analyze", "compare", "mock-server")
+
+
+def main():
+    """Main entry point"""
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in SUBCOMMANDS + ("-h", "--help"):
+        argv = ["run"] + argv
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    # Each subcommand imports only what it needs, so startup stays fast
+    if args.command == "analyze":
+        sys.exit(analyze_command(args))
+    elif args.command == "compare":
+        sys.exit(compare_command(args))
+    elif args.command == "mock-server":
+        sys.exit(mock_server_command(args))
+    else:
+        check_run_arguments(parser, args)
+        run_command(args)
+
+
+def analyze_command(args: argparse.Namespace) -> int:
+    """Analyze a saved results file and print the report"""
+    from analyzers.combined_analyzer import CombinedAnalyzer
+    from storage.result_files import load_result_file
+    
+    try:
+        metadata, results = load_result_file(args.results_file)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    
+    analyzer = CombinedAnalyzer()
+    analysis = analyzer.analyze(
+        results,
+        strategy_name=metadata.get("reasoning_strategy", "Unknown"),
+        test_suite_name=metadata.get("test_suite", "Unknown")
+    )
+    
+    if args.json:
+        import json
+        print(json.dumps(analysis, indent=2, default=str))
+    else:
+        analyzer.print_analysis(analysis)
+    return 0
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    """Print a side-by-side comparison of saved results files"""
+    from analyzers.combined_analyzer import CombinedAnalyzer
+    from analyzers.comparison import compare_analyses, print_comparison
+    from storage.result_files import load_result_file
+    
+    runs = []
+    for filepath in args.results_files:
+        try:
+            metadata, results = load_result_file(filepath)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 1
+        
+        analysis = CombinedAnalyzer().analyze(
+            results,
+            strategy_name=metadata.get("reasoning_strategy", "Unknown"),
+            test_suite_name=metadata.get("test_suite", "Unknown")
+        )
+        runs.append((os.path.basename(filepath), analysis))
+    
+    print_comparison(compare_analyses(runs))
+    return 0
+
+
+def mock_server_command(args: argparse.Namespace) -> int:
+    """Serve the mock OpenAI endpoint until interrupted"""
+    import glob
+    from mock_server.latency import create_latency_model, NETWORK_STRATEGIES
+    from mock_server.server import MockOpenAIServer
+    
+    result_files = args.results or sorted(glob.glob(os.path.join("results", "*.json*")))
+    try:
+        latency = create_latency_model(args.latency, result_files, args.fit_strategies or NETWORK_STRATEGIES)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    scenarios = [scenario for config_file in args.configs
+                 for scenario in create_test_suite(config_file=config_file).get_scenarios()]
+    server = MockOpenAIServer(
+        scenarios,
+        latency=latency,
+        wrong_rate=args.wrong_rate,
+        error_429_rate=args.error_429,
+        error_500_rate=args.error_500,
+        retry_after_s=args.retry_after,
+        ttft_fraction=args.ttft_fraction,
+        cache_hit_factor=args.cache_hit_factor,
+        seed=args.seed
+    )
+    
+    print(f"Mock OpenAI server on http://{args.host}:{args.port}/v1 ({len(scenarios)} scenarios, "
+          f"latency {latency.describe()})")
+    print(f"Run against it with: OPENAI_API_KEY=mock python main.py --base-url http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever(args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def is_matrix_run(args: argparse.Namespace) -> bool:
+    """Whether the run compares several strategies, models or configs"""
+    return bool(args.strategies or args.models or args.configs)
+
+
+# Run modes a matrix can't be combined with: each runs a single tester
+MATRIX_INCOMPATIBLE = (("rate", "--rate"), ("sweep", "--sweep"), ("adaptive", "--adaptive"),
+                       ("workers", "--workers"), ("resume", "--resume"), ("use_async", "--async"))
+
+
+def check_run_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject option combinations a run would otherwise silently ignore"""
+    if args.adaptive:
+        # Adaptive rounds run on the threaded runner (--concurrency sets its parallelism)
+        if args.use_async:
+            parser.error("--async can't be combined with --adaptive (use --concurrency)")
+        if args.max_requests is not None and args.max_requests < 1:
+            parser.error("--max-requests must be at least 1")
+    
+    if not is_matrix_run(args):
+        return
+    for key, flag in MATRIX_INCOMPATIBLE:
+        if getattr(args, key):
+            parser.error(f"{flag} can't be combined with --strategies/--models/--configs")
+    if args.output_format == "jsonl":
+        parser.error("--output-format jsonl can't be combined with --strategies/--models/--configs "
+                     "(the matrix saves one combined JSON report)")
+
+
+def run_command(args: argparse.Namespace) -> None:
+    """Run a test suite against a reasoning strategy and save the results"""
     if args.quiet:
         args.verbose = False
     
+    # Workers take their whole configuration from the coordinator
+    if args.connect:
+        from runners.distributed import run_worker
+        sys.exit(run_worker(args.connect, verbose=args.verbose))
+    
+    from storage.checkpoint import RunCheckpoint
+    from scheduling.rate_limiter import RateLimiter
+    from transport.client_pool import configure_pool
+    
+    # A resumed run takes its configuration from the checkpoint
+    checkpoint_dir = os.path.join(args.output_dir, "checkpoints")
+    checkpoint = None
+    if args.resume:
+        try:
+            checkpoint = RunCheckpoint.load(checkpoint_dir, args.resume)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for key, value in checkpoint.config.items():
+            setattr(args, key, value)
+    
     # Check API key for OpenAI strategy
-    if args.strategy == "openai" and not os.environ.get("OPENAI_API_KEY"):
+    strategies = args.strategies or [args.strategy]
+    if (any(name.startswith("openai") for name in strategies) and not os.environ.get("OPENAI_API_KEY")
+            and not args.replay):
         print("Error: OPENAI_API_KEY environment variable not set")
         sys.exit(1)
     
+    cassette = None
     try:
+        # Must happen before any strategy creates its client
+        configure_pool(args.max_connections, args.max_keepalive, args.keepalive_expiry)
+        cassette = create_cassette(args.record, args.replay, args.replay_latency)
+        
+        rate_limited = bool(args.rpm or args.tpm)
+        rate_limiter = RateLimiter(args.rpm, args.tpm, max_retries=args.max_retries) if rate_limited else None
+        
+        if is_matrix_run(args):
+            from runners.matrix import MatrixRunner
+            
+            matrix = MatrixRunner(
+                strategies=strategies,
+                models=args.models or [args.model],
+                configs=args.configs or [args.config],
+                tags=args.tags,
+                concurrency=args.concurrency,
+                trials=args.trials,
+                warmup=args.warmup,
+                verbose=args.verbose,
+                log_file=args.log_file,
+                strategy_options=lambda: strategy_options(vars(args), cassette),
+                rate_limiter=rate_limiter,
+                connection_warmup=args.warm_connections,
+                cache_order=args.cache_order
+            )
+            report = matrix.run()
+            matrix.print_report(report)
+            matrix.save_report(report, args.output_dir)
+            return
+        
         # Create reasoning strategy
-        strategy = create_reasoning_strategy(
-            args.strategy,
-            model=args.model,
-            verbose=args.verbose
-        )
+        # Strategies stay quiet: per-request detail goes to the log file, off the hot path
+        strategy = create_reasoning_strategy(args.strategy, model=args.model, verbose=False,
+                                             **strategy_options(vars(args), cassette))
         
         # Create test suite
         test_suite = create_test_suite(
@@ -206,24 +1255,89 @@ def main():
         )
         
         # Create analyzer
+        from analyzers.combined_analyzer import CombinedAnalyzer
         analyzer = CombinedAnalyzer(verbose=args.verbose)
         
+        if args.sweep:
+            from runners.concurrency_sweep import ConcurrencySweep, parse_concurrency_levels
+            
+            sweep = ConcurrencySweep(
+                reasoning_strategy=strategy,
+                test_suite=test_suite,
+                levels=parse_concurrency_levels(args.sweep),
+                requests_per_level=args.sweep_requests,
+                warmup_requests=args.sweep_warmup,
+                use_async=args.use_async,
+                verbose=args.verbose
+            )
+            try:
+                report = sweep.run()
+            finally:
+                strategy.close()
+            sweep.print_report(report)
+            sweep.save_report(report, args.output_dir)
+            return
+        
         # Create tester
         tester = ModelPerformanceTester(
             reasoning_strategy=strategy,
             test_suite=test_suite,
             analyzer=analyzer,
-            verbose=args.verbose
+            verbose=args.verbose,
+            concurrency=args.concurrency,
+            trials=args.trials,
+            warmup=args.warmup,
+            rate_limiter=rate_limiter,
+            log_file=args.log_file,
+            connection_warmup=args.warm_connections,
+            cache_order=args.cache_order
         )
         
+        if args.output_format == "jsonl":
+            tester.stream_results_to(args.output_dir)
+        
+        # Checkpoint fixed closed-loop runs so they can be resumed (open-loop runs are time-based,
+        # distributed runs are re-sharded and adaptive runs re-plan from scratch)
+        if checkpoint:
+            changed = checkpoint.changed_scenarios(test_suite.get_scenarios())
+            if changed:
+                print(f"Warning: {len(changed)} scenario(s) changed since the checkpoint and will be re-run: {changed}")
+            tester.enable_checkpoint(checkpoint, resume=True)
+        elif not args.no_checkpoint and not (args.rate or args.workers or args.adaptive):
+            checkpoint = RunCheckpoint.create(
+                checkpoint_dir,
+                config={key: getattr(args, key) for key in CHECKPOINT_ARGS},
+                scenarios=test_suite.get_scenarios()
+            )
+            tester.enable_checkpoint(checkpoint)
+            if args.verbose:
+                print(f"Run ID: {checkpoint.run_id} (resume with --resume {checkpoint.run_id})")
+        
         # Run tests
-        results = tester.run_tests()
+        try:
+            run_tester(tester, args)
+        except KeyboardInterrupt:
+            if checkpoint:
+                checkpoint.close(status="interrupted")
+                print(f"\nInterrupted. Resume with: python main.py --resume {checkpoint.run_id} --output-dir {args.output_dir}")
+            sys.exit(130)
+        except Exception:
+            if checkpoint:
+                checkpoint.close(status="failed")
+            raise
+        finally:
+            strategy.close()
+        
+        if checkpoint:
+            checkpoint.close(status="complete")
         
         # Analyze results
         analysis = tester.analyze_results()
         
-        # Save results
+        # Save results; the checkpoint is only needed until they are on disk
         output_file = tester.save_results(args.output_dir)
+        if checkpoint:
+            checkpoint.discard()
         
         # Print summary
         if args.verbose:
@@ -233,14 +1347,20 @@ def main():
             print(f"Strategy: {strategy.name}")
             print(f"Test Suite: {test_suite.name}")
             print(f"Config File: {test_suite.config_file}")
-            print(f"Total Scenarios: {len(results)}")
+            print(f"Total Scenarios: {tester.result_count}")
             print(f"Success Rate: {analysis.get('accuracy', {}).get('success_rate', 0):.1f}%")
-            print(f"Average Latency: {analysis.get('latency', {}).get('average_ms', 0):.2f}ms")
+            latency = analysis.get('latency', {})
+            basis = " (response time from schedule)" if latency.get("basis") == "response_time" else ""
+            print(f"Average Latency: {latency.get('average_ms', 0):.2f}ms{basis}")
             print(f"Results saved to: {output_file}")
-        
+    
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        # Recordings are written in the background; flush the rest before exiting
+        if cassette:
+            cassette.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+# Mock server package
@@ -0,0 +1,161 @@
+"""
+Latency models for the mock server
+"""
+
+import json
+import math
+import random
+import statistics
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+# Strategies whose latencies are real API round trips; the rule-based Custom
+# strategy only sleeps for a simulated delay
+NETWORK_STRATEGIES = ("OpenAI", "AsyncOpenAI", "Endpoint")
+
+
+class LatencyModel(ABC):
+    """Draws the time a mock response takes, in ms"""
+    
+    @abstractmethod
+    def sample_ms(self, rng: random.Random) -> float:
+        """Draw one latency"""
+        pass
+    
+    @abstractmethod
+    def describe(self) -> str:
+        """Short human-readable description, printed when the server starts"""
+        pass
+
+
+class FixedLatency(LatencyModel):
+    """The same latency for every response"""
+    
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+    
+    def sample_ms(self, rng: random.Random) -> float:
+        return self.latency_ms
+    
+    def describe(self) -> str:
+        return f"fixed {self.latency_ms:g}ms"
+
+
+class LognormalLatency(LatencyModel):
+    """
+    Lognormal latency, the usual shape of API response times
+    
+    Parameterized by its median and the standard deviation of log latency
+    (sigma), so median_ms * exp(sigma) is roughly the p84.
+    """
+    
+    def __init__(self, median_ms: float, sigma: float):
+        self.median_ms = median_ms
+        self.sigma = sigma
+    
+    @classmethod
+    def fit(cls, samples_ms: List[float]) -> "LognormalLatency":
+        """Maximum-likelihood fit to observed latencies"""
+        logs = [math.log(s) for s in samples_ms if s > 0]
+        if len(logs) < 2:
+            raise ValueError("Fitting a lognormal needs at least 2 positive latencies")
+        return cls(math.exp(statistics.fmean(logs)), statistics.stdev(logs))
+    
+    def sample_ms(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma)
+    
+    def describe(self) -> str:
+        return f"lognormal median {self.median_ms:.1f}ms, sigma {self.sigma:.2f}"
+
+
+class EmpiricalLatency(LatencyModel):
+    """Resamples observed latencies"""
+    
+    def __init__(self, samples_ms: List[float]):
+        if not samples_ms:
+            raise ValueError("Empirical latency needs at least one observed latency")
+        self.samples_ms = sorted(samples_ms)
+    
+    def sample_ms(self, rng: random.Random) -> float:
+        return rng.choice(self.samples_ms)
+    
+    def describe(self) -> str:
+        return (f"empirical ({len(self.samples_ms)} samples, "
+                f"median {statistics.median(self.samples_ms):.1f}ms)")
+
+
+def load_latencies(result_files: List[str], strategies: Sequence[str] = NETWORK_STRATEGIES) -> List[float]:
+    """
+    Latencies of the successful API round trips in saved results files
+    
+    Reads files written by save_results() and the older tool_call_latency_results
+    files (a top-level "results" list). Requests that raised an error are skipped
+    (their timing says little about the model), and a warning is printed for each
+    file that contributes nothing.
+    
+    Args:
+        result_files: Results files to read
+        strategies: Only use runs whose strategy name starts with one of these;
+            the older files predate strategies and always measured the API
+    """
+    latencies = []
+    for filepath in result_files:
+        try:
+            strategy, samples = _file_latencies(filepath)
+        except (OSError, ValueError) as e:
+            print(f"Warning: skipping {filepath}: {e}")
+            continue
+        
+        if strategy is not None and not strategy.startswith(tuple(strategies)):
+            print(f"Warning: skipping {filepath}: strategy {strategy} is not one of {', '.join(strategies)}")
+        elif not samples:
+            print(f"Warning: skipping {filepath}: no successful requests")
+        else:
+            latencies.extend(samples)
+    return latencies
+
+
+def _file_latencies(filepath: str) -> Tuple[Optional[str], List[float]]:
+    """(strategy name or None, latencies of requests without an error) in one results file"""
+    from storage.result_files import load_result_file
+    
+    if not filepath.endswith(".jsonl"):
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            return None, [r["latency_ms"] for r in data["results"]
+                          if r.get("error") is None and r.get("latency_ms", 0) > 0]
+    
+    metadata, results = load_result_file(filepath)
+    return metadata.get("reasoning_strategy"), [r.latency_ms for r in results if r.error is None and r.latency_ms > 0]
+
+
+def create_latency_model(spec: str, result_files: Optional[List[str]] = None,
+                         strategies: Sequence[str] = NETWORK_STRATEGIES) -> LatencyModel:
+    """
+    Latency model from a command line spec
+    
+    Args:
+        spec: "fixed:<ms>", "lognormal:<median ms>,<sigma>", or "lognormal" /
+            "empirical" to fit the latencies in result_files
+        result_files: Saved results files to fit
+        strategies: Strategy name prefixes whose results are fitted
+    
+    Returns:
+        The latency model
+    """
+    kind, _, params = spec.partition(":")
+    if kind == "fixed":
+        return FixedLatency(float(params or 0))
+    
+    if kind == "lognormal" and params:
+        median_ms, _, sigma = params.partition(",")
+        return LognormalLatency(float(median_ms), float(sigma or 0.5))
+    
+    if kind in ("lognormal", "empirical"):
+        samples = load_latencies(result_files or [], strategies)
+        if not samples:
+            raise ValueError(f"No latencies to fit in {len(result_files or [])} results file(s)")
+        return LognormalLatency.fit(samples) if kind == "lognormal" else EmpiricalLatency(samples)
+    
+    raise ValueError(f"Unknown latency model: {spec}")
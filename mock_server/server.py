@@ -0,0 +1,314 @@
+"""
+Local stand-in for the OpenAI chat completions API
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+from tool_params.tool_definitions import TestScenario
+from .latency import LatencyModel, FixedLatency
+
+
+class MockOpenAIServer:
+    """
+    OpenAI-compatible HTTP server that answers with each scenario's expected tool calls
+    
+    Serves POST /v1/chat/completions (plain and streamed) and GET /v1/models over
+    HTTP/1.1 keep-alive, so the harness can be benchmarked end to end without
+    model calls or API noise. The scenario is found by the request's user
+    prompt; an unknown prompt gets a plain text answer.
+    
+    Each response waits out a latency drawn from the latency model. A configurable
+    share of requests get wrong tool calls or fail with 429 (with Retry-After) or
+    500, to exercise validation, retries and failure analysis.
+    
+    Prompt caching is imitated: once a (system prompt, tools) prefix has been
+    seen, later requests with it report the prefix as cached tokens and have
+    their latency scaled by cache_hit_factor.
+    """
+    
+    def __init__(self, scenarios: List[TestScenario],
+                 latency: Optional[LatencyModel] = None,
+                 wrong_rate: float = 0.0,
+                 error_429_rate: float = 0.0,
+                 error_500_rate: float = 0.0,
+                 retry_after_s: float = 1.0,
+                 ttft_fraction: float = 0.6,
+                 cache_hit_factor: float = 1.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            scenarios: Scenarios whose expected tool calls are returned
+            latency: Latency model for successful responses (default: none)
+            wrong_rate: Share of responses with wrong tool calls
+            error_429_rate: Share of requests rejected with 429
+            error_500_rate: Share of requests failed with 500
+            retry_after_s: Retry-After sent with 429s
+            ttft_fraction: Share of a streamed response's latency before its first chunk
+            cache_hit_factor: Latency multiplier for requests whose prompt prefix is cached
+            seed: Random seed for latencies and injected failures
+        """
+        self.scenarios = {scenario.prompt: scenario for scenario in scenarios}
+        self.latency = latency or FixedLatency(0)
+        self.wrong_rate = wrong_rate
+        self.error_429_rate = error_429_rate
+        self.error_500_rate = error_500_rate
+        self.retry_after_s = retry_after_s
+        self.ttft_fraction = ttft_fraction
+        self.cache_hit_factor = cache_hit_factor
+        self._cached_prefixes = set()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+    
+    def plan(self, body: Dict[str, Any]) -> Tuple[Optional[int], float, List[Dict[str, Any]], Optional[str], int]:
+        """
+        Decide how to answer a chat completion request
+        
+        Returns:
+            (error status or None, latency in ms, tool calls, text content, cached prompt tokens)
+        """
+        system_prompt = "".join(m.get("content") or "" for m in body.get("messages", []) if m.get("role") == "system")
+        prefix = system_prompt + json.dumps(body.get("tools"), sort_keys=True)
+        
+        with self._rng_lock:
+            draw = self._rng.random()
+            wrong = self._rng.random() < self.wrong_rate
+            latency_ms = self.latency.sample_ms(self._rng)
+        
+        if draw < self.error_429_rate:
+            return 429, 0.0, [], None, 0
+        if draw < self.error_429_rate + self.error_500_rate:
+            return 500, 0.0, [], None, 0
+        
+        # Only a served request warms the cache; a rejected one never reached the model
+        with self._rng_lock:
+            cache_hit = prefix in self._cached_prefixes
+            self._cached_prefixes.add(prefix)
+        
+        cached_tokens = len(prefix) // 4 if cache_hit else 0
+        if cache_hit:
+            latency_ms *= self.cache_hit_factor
+        
+        prompt = next((m.get("content") for m in reversed(body.get("messages", []))
+                       if m.get("role") == "user"), None)
+        scenario = self.scenarios.get(prompt)
+        tool_names = [tool["function"]["name"] for tool in body.get("tools") or []]
+        
+        tool_calls = list(scenario.expected_tool_calls) if scenario else []
+        if wrong:
+            tool_calls = self._wrong_tool_calls(tool_calls, tool_names)
+        content = None if tool_calls else "I can answer that without using a tool."
+        return None, latency_ms, tool_calls, content, cached_tokens
+    
+    @staticmethod
+    def _wrong_tool_calls(expected: List[Dict[str, Any]], tool_names: List[str]) -> List[Dict[str, Any]]:
+        """A plausible mistake: the wrong tool, a missing call, or a tool where none was needed"""
+        expected_names = {call["name"] for call in expected}
+        others = [name for name in tool_names if name not in expected_names]
+        if others:
+            return [{"name": others[0], "arguments": {}}]
+        if expected:
+            return expected[:-1]
+        return [{"name": tool_names[0], "arguments": {}}] if tool_names else []
+    
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serve on a background thread
+        
+        Returns:
+            The base URL to point an OpenAI client at (port 0 picks a free port)
+        """
+        self._bind(host, port)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self.base_url
+    
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """Serve on the calling thread until interrupted"""
+        self._bind(host, port)
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+    
+    def _bind(self, host: str, port: int) -> None:
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+    
+    def stop(self) -> None:
+        """Stop a server started with start()"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running server, including the /v1 prefix"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def _completion_id() -> str:
+    return f"chatcmpl-mock{uuid.uuid4().hex[:20]}"
+
+
+def _tool_call_entries(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tool calls in the API's message format (arguments as a JSON string)"""
+    return [{
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))}
+    } for call in tool_calls]
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server that treats a client hanging up mid-response as routine"""
+    
+    def handle_error(self, request, client_address):
+        # Hedged and cancelled requests close their connection before the reply is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler; the MockOpenAIServer is reached through self.server.mock"""
+    
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, Nagle's algorithm and
+    # delayed ACKs add ~40ms to every response
+    disable_nagle_algorithm = True
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [
+                {"id": "mock", "object": "model", "created": 0, "owned_by": "mock"}
+            ]})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "not_found"}})
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw_body = self.rfile.read(length)
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "not_found"}})
+            return
+        
+        try:
+            body = json.loads(raw_body)
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Request body is not JSON", "type": "invalid_request_error"}})
+            return
+        
+        mock: MockOpenAIServer = self.server.mock
+        status, latency_ms, tool_calls, content, cached_tokens = mock.plan(body)
+        if status == 429:
+            self._send_json(429, {"error": {"message": "Rate limit reached (injected)", "type": "rate_limit_error"}},
+                            {"Retry-After": f"{mock.retry_after_s:g}"})
+            return
+        if status == 500:
+            self._send_json(500, {"error": {"message": "Internal server error (injected)", "type": "server_error"}})
+            return
+        
+        usage = {
+            "prompt_tokens": len(raw_body) // 4,
+            "completion_tokens": max(1, len(json.dumps(tool_calls) if tool_calls else content) // 4)
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        usage["prompt_tokens_details"] = {"cached_tokens": cached_tokens}
+        usage["completion_tokens_details"] = {"reasoning_tokens": 0}
+        model = body.get("model", "mock")
+        
+        if body.get("stream"):
+            self._stream(model, latency_ms, tool_calls, content, usage, mock.ttft_fraction,
+                         (body.get("stream_options") or {}).get("include_usage", False))
+            return
+        
+        time.sleep(latency_ms / 1000)
+        message = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = _tool_call_entries(tool_calls)
+        self._send_json(200, {
+            "id": _completion_id(),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tool_calls else "stop"
+            }],
+            "usage": usage
+        }, {"openai-processing-ms": f"{latency_ms:.0f}"})
+    
+    def _stream(self, model: str, latency_ms: float, tool_calls: List[Dict[str, Any]],
+                content: Optional[str], usage: Dict[str, int], ttft_fraction: float,
+                include_usage: bool) -> None:
+        """Send a server-sent event stream, the first chunk after ttft_fraction of the latency"""
+        completion_id = _completion_id()
+        created = int(time.time())
+        
+        def chunk(delta: Optional[Dict[str, Any]], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+            return {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+        
+        chunks = [chunk({"role": "assistant", "content": None})]
+        if tool_calls:
+            for index, entry in enumerate(_tool_call_entries(tool_calls)):
+                chunks.append(chunk({"tool_calls": [{"index": index, "id": entry["id"], "type": "function",
+                                                     "function": {"name": entry["function"]["name"], "arguments": ""}}]}))
+                arguments = entry["function"]["arguments"]
+                for start in range(0, len(arguments), 16):
+                    chunks.append(chunk({"tool_calls": [{"index": index,
+                                                         "function": {"arguments": arguments[start:start + 16]}}]}))
+        else:
+            words = content.split(" ")
+            chunks.extend(chunk({"content": word if i == 0 else " " + word}) for i, word in enumerate(words))
+        chunks.append(chunk({}, "tool_calls" if tool_calls else "stop"))
+        if include_usage:
+            chunks.append({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                           "model": model, "choices": [], "usage": usage})
+        
+        # Like the real API, headers (and their processing time) arrive with the first chunk;
+        # the rest of the latency is spread evenly over the remaining chunks
+        time.sleep(latency_ms * ttft_fraction / 1000)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("x-request-id", f"req_{uuid.uuid4().hex}")
+        self.send_header("openai-processing-ms", f"{latency_ms * ttft_fraction:.0f}")
+        self.end_headers()
+        
+        gap_s = latency_ms * (1 - ttft_fraction) / 1000 / max(1, len(chunks) - 1)
+        for i, payload in enumerate(chunks):
+            if i > 0:
+                time.sleep(gap_s)
+            self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+    
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+    
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("x-request-id", f"req_{uuid.uuid4().hex}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,168 @@
+"""
+Async OpenAI reasoning strategy implementation
+"""
+
+import asyncio
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from .openai_strategy import OpenAIStrategy
+from tool_params.tool_definitions import TestScenario, ExecutionResult
+from transport.timing import PhaseTimer
+from .streaming import StreamAccumulator
+
+
+class AsyncOpenAIStrategy(OpenAIStrategy):
+    """
+    Reasoning strategy that uses OpenAI's async client for tool calling
+    
+    Designed for the asyncio runner, where a single thread can keep hundreds
+    of requests in flight. Synchronous callers fall back to a lazily created
+    blocking client so the strategy still works with run_tests().
+    """
+    
+    def __init__(self, model: str = "o3", api_key: Optional[str] = None, 
+                 verbose: bool = False, **kwargs):
+        super().__init__(model=model, api_key=api_key, verbose=verbose, **kwargs)
+        self.name = f"AsyncOpenAI-{model}"
+        self._sync_client = None
+        self._sync_client_lock = threading.Lock()
+    
+    def _create_client(self):
+        """Create the async API client used for requests"""
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(**self._client_options(asynchronous=True))
+    
+    def _blocking_client(self):
+        """Lazily created blocking client for synchronous callers"""
+        # Worker threads can race to create it; the lock makes them all share one
+        if self._sync_client is None:
+            with self._sync_client_lock:
+                if self._sync_client is None:
+                    from openai import OpenAI
+                    self._sync_client = OpenAI(**self._client_options())
+        return self._sync_client
+    
+    async def warm_up_async(self, connections: int) -> int:
+        """Open connections in the async pool before timing starts"""
+        if self._replaying():
+            return 0
+        
+        async def ping() -> bool:
+            try:
+                if self.raw_client:
+                    await self.raw_client.list_models_async()
+                else:
+                    await self.client.models.list()
+                return True
+            except Exception:
+                return False
+        
+        return sum(await asyncio.gather(*(ping() for _ in range(connections))))
+    
+    async def execute_scenario_async(self, scenario: TestScenario) -> ExecutionResult:
+        """Execute a test scenario using OpenAI's async API"""
+        
+        if self.verbose:
+            print(f"  Executing with model: {self.model}")
+        
+        if self._replaying():
+            result = self._replay(scenario)
+            if self.cassette.replay_latency:
+                await asyncio.sleep(result.latency_ms / 1000)
+            return result
+        
+        # Record start time and per-phase marks (see transport.timing.PHASES)
+        timer = PhaseTimer()
+        
+        with timer.activate():
+            try:
+                request = self._build_request(scenario)
+                timer.mark("build")
+                
+                # Make the API call without blocking the event loop
+                hedge_info = None
+                if self.hedging:
+                    response, hedge_info = await self._create_hedged_completion_async(request)
+                else:
+                    response = await self._complete_async(request)
+                
+                latency_ms = timer.elapsed_ms()
+                
+                result = self._build_result(response, latency_ms, hedge_info, timer)
+                if self.cassette:
+                    self.cassette.record(self._cassette_key(scenario), request, result)
+                return result
+            
+            except Exception as e:
+                return self._build_error_result(e, timer.elapsed_ms(), timer)
+    
+    async def _complete_async(self, request: Dict[str, Any]):
+        """Send a request and return the completion, or the consumed stream when streaming"""
+        if self.raw_client:
+            return await self.raw_client.complete_async(request)
+        
+        response = await self.client.chat.completions.create(**request)
+        if not self.stream:
+            return response
+        
+        accumulator = StreamAccumulator()
+        async for chunk in response:
+            accumulator.add(chunk)
+        return accumulator
+    
+    async def _timed_completion_async(self, request: Dict[str, Any]) -> Tuple[Any, float, PhaseTimer]:
+        """Send a request and return it with its own latency in ms and wire timings"""
+        attempt = PhaseTimer()
+        with attempt.activate():
+            response = await self._complete_async(request)
+        return response, attempt.elapsed_ms(), attempt
+    
+    async def _create_hedged_completion_async(self, request: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Send a request, and a duplicate if it hasn't answered within the hedge delay
+        
+        Whichever succeeds first is returned and the other is cancelled, which
+        closes its connection instead of waiting for the response.
+        
+        Returns:
+            (response, hedge info for the result metadata)
+        """
+        delay_ms = self.hedging.hedge_delay_ms()
+        primary = asyncio.ensure_future(self._timed_completion_async(request))
+        requests = {primary: "primary"}
+        
+        done, _ = await asyncio.wait({primary}, timeout=delay_ms / 1000 if delay_ms is not None else None)
+        if not done:
+            requests[asyncio.ensure_future(self._timed_completion_async(request))] = "hedge"
+        
+        pending = set(requests)
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        last_error = task.exception()
+                        continue
+                    
+                    response, own_latency_ms, attempt = task.result()
+                    self.hedging.record(own_latency_ms)
+                    self._merge_wire_marks(attempt, requests[task])
+                    return response, {"hedged": len(requests) > 1, "winner": requests[task], "delay_ms": delay_ms}
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise last_error
+    
+    def get_capabilities(self) -> Dict[str, Any]:
+        """Return information about this strategy's capabilities"""
+        capabilities = super().get_capabilities()
+        capabilities["supports_async"] = True
+        return capabilities
+    
+    def set_model(self, model: str):
+        """Change the model used by this strategy"""
+        super().set_model(model)
+        self.name = f"AsyncOpenAI-{model}"
@@ -33,6 +33,52 @@ class BaseReasoningStrategy(ABC):
         """
         pass
     
+    async def execute_scenario_async(self, scenario: TestScenario) -> ExecutionResult:
+        """
+        Execute a test scenario from an asyncio event loop
+        
+        The default implementation runs execute_scenario in the loop's default
+        executor. Strategies with a native async client should override this.
+        
+        Args:
+            scenario: The test scenario to execute
+            
+        Returns:
+            ExecutionResult containing the outcome of the execution
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute_scenario, scenario)
+    
+    def warm_up(self, connections: int) -> int:
+        """
+        Open connections before timing starts, so no scenario pays for connection setup
+        
+        The default does nothing; strategies that talk to a server override it.
+        
+        Args:
+            connections: Number of connections to open
+        
+        Returns:
+            Number of warmup requests that succeeded
+        """
+        return 0
+    
+    async def warm_up_async(self, connections: int) -> int:
+        """Event-loop version of warm_up(); the default runs warm_up in the loop's executor"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.warm_up, connections)
+    
+    def close(self) -> None:
+        """
+        Release resources held between requests, such as thread pools
+        
+        Called by the runner once it has finished with the strategy. The default
+        does nothing.
+        """
+        pass
+    
     @abstractmethod
     def get_capabilities(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,130 @@
+"""
+Multi-endpoint reasoning strategy for OpenAI-compatible servers
+"""
+
+import os
+import asyncio
+from typing import Dict, Any, List, Optional
+
+from .base_strategy import BaseReasoningStrategy
+from .async_openai_strategy import AsyncOpenAIStrategy
+from .routing import EndpointRouter, LEAST_OUTSTANDING
+from tool_params.tool_definitions import TestScenario, ExecutionResult
+
+
+class EndpointStrategy(BaseReasoningStrategy):
+    """
+    Reasoning strategy that load balances across OpenAI-compatible endpoints
+    
+    Each base URL (the hosted API, or a self-hosted server such as vLLM or
+    `main.py mock-server`) gets its own AsyncOpenAIStrategy and its own
+    connection pool, so a slow endpoint can't hold connections another one
+    needs. An EndpointRouter picks the endpoint for every request, and each
+    result records the endpoint that served it under metadata["endpoint"].
+    Works with both the threaded and the asyncio runner.
+    """
+    
+    def __init__(self, model: str = "o3", api_key: Optional[str] = None,
+                 verbose: bool = False, **kwargs):
+        """
+        Args:
+            model: Model name sent to every endpoint
+            api_key: Key sent to every endpoint (default: OPENAI_API_KEY; self-hosted
+                servers that ignore it work without one)
+            verbose: Print per-request detail
+            endpoints: Base URLs to route between (default: [base_url])
+            routing: "least-outstanding" or "ewma"
+            **kwargs: Passed on to each endpoint's AsyncOpenAIStrategy
+        """
+        super().__init__(name=f"Endpoint-{model}", verbose=verbose)
+        
+        endpoints = kwargs.pop("endpoints", None) or []
+        base_url = kwargs.pop("base_url", None)
+        if not endpoints and base_url:
+            endpoints = [base_url]
+        if not endpoints:
+            raise ValueError("The endpoint strategy needs at least one base URL (--endpoints)")
+        kwargs.pop("pool", None)
+        
+        # SDK retries would hide an endpoint's errors from the router and its stats;
+        # failed requests are reported instead (the rate limiter, when on, re-sends them)
+        if kwargs.get("client_max_retries") is None:
+            kwargs["client_max_retries"] = 0
+        
+        self.model = model
+        self.router = EndpointRouter(endpoints, kwargs.pop("routing", None) or LEAST_OUTSTANDING)
+        api_key = api_key or os.environ.get("OPENAI_API_KEY") or "unused"
+        self.endpoints: List[AsyncOpenAIStrategy] = [
+            AsyncOpenAIStrategy(model=model, api_key=api_key, verbose=verbose,
+                                base_url=url, pool=url, **kwargs)
+            for url in endpoints
+        ]
+    
+    @property
+    def system_prompt(self) -> str:
+        """System prompt shared by every endpoint (part of the prompt cache prefix)"""
+        return self.endpoints[0].system_prompt
+    
+    def execute_scenario(self, scenario: TestScenario) -> ExecutionResult:
+        """Execute a test scenario on the endpoint chosen by the router"""
+        index = self.router.acquire()
+        result = None
+        try:
+            result = self.endpoints[index].execute_scenario(scenario)
+            return self._label(result, index)
+        finally:
+            self._release(index, result)
+    
+    async def execute_scenario_async(self, scenario: TestScenario) -> ExecutionResult:
+        """Execute a test scenario on the endpoint chosen by the router, from an event loop"""
+        index = self.router.acquire()
+        result = None
+        try:
+            result = await self.endpoints[index].execute_scenario_async(scenario)
+            return self._label(result, index)
+        finally:
+            self._release(index, result)
+    
+    def _label(self, result: ExecutionResult, index: int) -> ExecutionResult:
+        """Record which endpoint served a result"""
+        result.metadata = {**(result.metadata or {}), "endpoint": self.router.endpoints[index].base_url}
+        return result
+    
+    def _release(self, index: int, result: Optional[ExecutionResult]) -> None:
+        """Report a finished request to the router (a missing result counts as an error)"""
+        if result is None:
+            self.router.release(index, None, success=False)
+        else:
+            self.router.release(index, result.latency_ms, success=result.error is None)
+    
+    def warm_up(self, connections: int) -> int:
+        """Open `connections` connections in each endpoint's pool before timing starts"""
+        return sum(endpoint.warm_up(connections) for endpoint in self.endpoints)
+    
+    async def warm_up_async(self, connections: int) -> int:
+        """Event-loop version of warm_up(), warming every endpoint at once"""
+        warmed = await asyncio.gather(*(endpoint.warm_up_async(connections) for endpoint in self.endpoints))
+        return sum(warmed)
+    
+    def close(self) -> None:
+        """Close every endpoint's strategy"""
+        for endpoint in self.endpoints:
+            endpoint.close()
+    
+    def get_capabilities(self) -> Dict[str, Any]:
+        """Return information about this strategy's capabilities"""
+        capabilities = self.endpoints[0].get_capabilities()
+        capabilities.update({
+            "name": self.name,
+            "provider": "OpenAI-compatible",
+            "routing": self.router.get_config(),
+            "endpoint_state": self.router.snapshot()
+        })
+        return capabilities
+    
+    def set_model(self, model: str):
+        """Change the model used on every endpoint"""
+        self.model = model
+        self.name = f"Endpoint-{model}"
+        for endpoint in self.endpoints:
+            endpoint.set_model(model)
@@ -0,0 +1,66 @@
+"""
+Hedged request policy for tail latency experiments
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+from analyzers import stats
+
+
+class HedgingPolicy:
+    """
+    Decides when to send a duplicate ("hedge") of a slow request
+    
+    The hedge goes out after a fixed delay, or after the given percentile of
+    recently observed request latencies. With a percentile and too little
+    history yet, requests aren't hedged unless a fixed delay is also set, which
+    is then used as the fallback.
+    """
+    
+    def __init__(self, delay_ms: Optional[float] = None,
+                 percentile: Optional[float] = None,
+                 min_history: int = 20,
+                 history_size: int = 1000):
+        """
+        Args:
+            delay_ms: Fixed hedge delay in milliseconds
+            percentile: Hedge at this percentile of observed latency, as a fraction (0.95 for p95)
+            min_history: Observations needed before the percentile is trusted
+            history_size: Number of most recent latencies kept
+        """
+        if delay_ms is None and percentile is None:
+            raise ValueError("Hedging needs a delay_ms, a percentile, or both")
+        if percentile is not None and not 0 < percentile < 1:
+            raise ValueError(f"Hedge percentile must be between 0 and 1, got {percentile}")
+        
+        self.delay_ms = delay_ms
+        self.percentile = percentile
+        self.min_history = min_history
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+    
+    def hedge_delay_ms(self) -> Optional[float]:
+        """Milliseconds to wait before hedging, or None to not hedge this request"""
+        if self.percentile is None:
+            return self.delay_ms
+        
+        with self._lock:
+            if len(self._history) < self.min_history:
+                return self.delay_ms
+            history = list(self._history)
+        
+        return stats.percentile(history, self.percentile)
+    
+    def record(self, latency_ms: float) -> None:
+        """Add a completed request's own latency (from its send) to the history"""
+        with self._lock:
+            self._history.append(latency_ms)
+    
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            "delay_ms": self.delay_ms,
+            "percentile": self.percentile,
+            "min_history": self.min_history
+        }
@@ -3,13 +3,14 @@ OpenAI reasoning strategy implementation
 """
 
 import os
-import time
 import json
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base_strategy import BaseReasoningStrategy
 from tool_params.tool_definitions import TestScenario, ExecutionResult
+from transport.timing import PhaseTimer, current_timer
+from transport.raw_chat import RawChatClient, RawCompletion
+from .streaming import StreamAccumulator
 
 
 class OpenAIStrategy(BaseReasoningStrategy):
@@ -24,11 +25,26 @@ class OpenAIStrategy(BaseReasoningStrategy):
         self.model = model
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         
-        if not self.api_key:
+        # Optional ResponseCassette: record responses, or replay them instead of calling the API
+        self.cassette = kwargs.get("cassette", None)
+        
+        if not self.api_key and not self._replaying():
             raise ValueError("OpenAI API key not provided and OPENAI_API_KEY environment variable not set")
         
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        # Retries inside the SDK would hide 429s in latency; None keeps the SDK default
+        self.client_max_retries = kwargs.get("client_max_retries", None)
+        
+        # API endpoint, e.g. a local mock server (None keeps the SDK default / OPENAI_BASE_URL)
+        self.base_url = kwargs.get("base_url", None)
+        
+        # Named connection pool (see transport.client_pool); None shares the process-wide one
+        self.pool = kwargs.get("pool", None)
+        
+        # Send pre-serialized requests over the pooled HTTP client instead of through the SDK
+        self.raw_http = kwargs.get("raw_http", False)
+        
+        # Initialize OpenAI client (a replayed or raw HTTP run never uses it, so it has none)
+        self.client = None if self._replaying() or self.raw_http else self._create_client()
         
         # Additional configuration
         self.system_prompt = kwargs.get("system_prompt", 
@@ -36,6 +52,42 @@ class OpenAIStrategy(BaseReasoningStrategy):
         self.temperature = kwargs.get("temperature", 0.1)
         self.max_tokens = kwargs.get("max_tokens", None)
         self.timeout = kwargs.get("timeout", 30)
+        
+        # Stream responses, recording time to first token / tool name / complete arguments
+        self.stream = kwargs.get("stream", False)
+        if self.stream and self.raw_http:
+            raise ValueError("The raw HTTP path only sends non-streamed requests")
+        self.raw_client = (RawChatClient(self.api_key, self.base_url, self.timeout, self.pool)
+                           if self.raw_http and not self._replaying() else None)
+        
+        # Optional HedgingPolicy: send a duplicate request when the first one is slow
+        self.hedging = kwargs.get("hedging", None)
+        self._hedge_executor = None
+        if self.hedging:
+            from concurrent.futures import ThreadPoolExecutor
+            # Most requests the runner keeps in flight; each needs a thread for its primary and its hedge
+            max_in_flight = kwargs.get("max_in_flight", None) or 1
+            self._hedge_executor = ThreadPoolExecutor(max_workers=2 * max_in_flight)
+    
+    def _create_client(self):
+        """Create the API client used for requests"""
+        # Imported here so runs that never create a client (e.g. custom strategy, --help)
+        # don't pay for loading openai, httpx and pydantic
+        from openai import OpenAI
+        return OpenAI(**self._client_options())
+    
+    def _client_options(self, asynchronous: bool = False) -> Dict[str, Any]:
+        """Keyword arguments shared by every client this strategy creates"""
+        from transport.client_pool import get_http_client
+        
+        # All strategies share one pooled HTTP client, which also marks send/first byte/
+        # last byte and connection reuse on the request's PhaseTimer
+        options = {"api_key": self.api_key, "http_client": get_http_client(asynchronous, self.pool)}
+        if self.client_max_retries is not None:
+            options["max_retries"] = self.client_max_retries
+        if self.base_url:
+            options["base_url"] = self.base_url
+        return options
     
     def execute_scenario(self, scenario: TestScenario) -> ExecutionResult:
         """Execute a test scenario using OpenAI's API"""
@@ -43,90 +95,366 @@ class OpenAIStrategy(BaseReasoningStrategy):
         if self.verbose:
             print(f"  Executing with model: {self.model}")
         
-        # Record start time
-        start_time = time.time()
+        if self._replaying():
+            result = self._replay(scenario)
+            if self.cassette.replay_latency:
+                import time
+                time.sleep(result.latency_ms / 1000)
+            return result
         
-        try:
-            # Prepare tools for OpenAI API
-            tools = [tool.to_dict() for tool in scenario.tools]
-            
-            # Make the API call
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self.system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": scenario.prompt
-                    }
-                ],
-                tools=tools if tools else None,
-                tool_choice="auto" if tools else None,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                timeout=self.timeout
-            )
-            
-            # Record end time
-            end_time = time.time()
-            latency_ms = (end_time - start_time) * 1000
-            
-            # Extract tool calls
-            actual_tool_calls = []
-            if response.choices[0].message.tool_calls:
-                for tc in response.choices[0].message.tool_calls:
-                    try:
-                        arguments = json.loads(tc.function.arguments) if tc.function.arguments else {}
-                    except json.JSONDecodeError:
-                        arguments = {"_raw": tc.function.arguments}
-                    
-                    actual_tool_calls.append({
-                        "name": tc.function.name,
-                        "arguments": arguments
-                    })
+        # Record start time and per-phase marks (see transport.timing.PHASES)
+        timer = PhaseTimer()
+        losers = []
+        
+        with timer.activate():
+            try:
+                request = self._build_request(scenario)
+                timer.mark("build")
+                
+                # Make the API call
+                hedge_info = None
+                if self.hedging:
+                    response, hedge_info, losers = self._create_hedged_completion(request)
+                else:
+                    response = self._complete(request)
+                
+                latency_ms = timer.elapsed_ms()
+                
+                result = self._build_result(response, latency_ms, hedge_info, timer)
+                if self.cassette:
+                    self.cassette.record(self._cassette_key(scenario), request, result)
+                return result
             
-            # Extract token usage
-            tokens_used = None
-            if response.usage:
-                tokens_used = {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                }
+            except Exception as e:
+                return self._build_error_result(e, timer.elapsed_ms(), timer)
             
-            return ExecutionResult(
-                success=True,
-                latency_ms=round(latency_ms, 2),
-                actual_tool_calls=actual_tool_calls,
-                model_response=response.choices[0].message.content,
-                tokens_used=tokens_used,
-                metadata={
-                    "model": self.model,
-                    "finish_reason": response.choices[0].finish_reason,
-                    "system_prompt": self.system_prompt
+            finally:
+                # After the latency is taken, so the wait isn't part of it
+                self._drain(losers)
+    
+    def _replaying(self) -> bool:
+        """Whether responses come from a cassette instead of the API"""
+        return self.cassette is not None and self.cassette.replaying
+    
+    def _cassette_key(self, scenario: TestScenario) -> str:
+        """Cassette key for a scenario under this strategy's model and settings"""
+        from storage.cassette import request_key
+        return request_key(self.model, self.system_prompt, scenario, {
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": self.stream
+        })
+    
+    def _replay(self, scenario: TestScenario) -> ExecutionResult:
+        """The cassette's recorded result for a scenario, or a failure if it has none"""
+        result = self.cassette.replay(self._cassette_key(scenario))
+        if result is not None:
+            return result
+        return ExecutionResult(
+            success=False,
+            latency_ms=0.0,
+            actual_tool_calls=None,
+            error=f"No recorded response in cassette {self.cassette.path}",
+            metadata={"model": self.model, "system_prompt": self.system_prompt, "cassette": "miss"}
+        )
+    
+    def _create_completion(self, request: Dict[str, Any]):
+        """Send a chat completion request with the blocking client"""
+        return self._blocking_client().chat.completions.create(**request)
+    
+    def _blocking_client(self):
+        """Client for calls made from a thread rather than an event loop"""
+        return self.client
+    
+    def warm_up(self, connections: int) -> int:
+        """
+        Open connections to the API before timing starts
+        
+        Sends `connections` concurrent model-list requests (no tokens used), so
+        each one needs its own connection, which then stays in the shared pool.
+        A raw HTTP run sends them through its own client and never builds an SDK
+        client.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if self._replaying():
+            return 0
+        
+        list_models = self.raw_client.list_models if self.raw_client else self._blocking_client().models.list
+        
+        def ping(_) -> bool:
+            try:
+                list_models()
+                return True
+            except Exception:
+                return False
+        
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(ping, range(connections)))
+    
+    def _complete(self, request: Dict[str, Any]):
+        """Send a request and return the completion, or the consumed stream when streaming"""
+        if self.raw_client:
+            return self.raw_client.complete(request)
+        
+        response = self._create_completion(request)
+        if not self.stream:
+            return response
+        
+        accumulator = StreamAccumulator()
+        for chunk in response:
+            accumulator.add(chunk)
+        return accumulator
+    
+    def _timed_completion(self, request: Dict[str, Any], attempt: PhaseTimer) -> Tuple[Any, float, PhaseTimer]:
+        """Send a request on the given timer and return it with its own latency in ms and wire timings"""
+        with attempt.activate():
+            response = self._complete(request)
+        return response, attempt.elapsed_ms(), attempt
+    
+    def _create_hedged_completion(self, request: Dict[str, Any]) -> Tuple[Any, Dict[str, Any], List[Any]]:
+        """
+        Send a request, and a duplicate if it hasn't answered within the hedge delay
+        
+        Whichever succeeds first is returned and the other is aborted (see
+        PhaseTimer.abort): a response already arriving has its connection shut
+        down, and one still waiting for headers is dropped when they arrive. The
+        aborted loser is handed back for the caller to drain once the winner's
+        latency is taken (see _drain).
+        
+        Returns:
+            (response, hedge info for the result metadata, unfinished losers)
+        """
+        from concurrent.futures import wait, FIRST_COMPLETED
+        
+        attempts: Dict[Any, PhaseTimer] = {}
+        
+        def send():
+            attempt = PhaseTimer()
+            future = self._hedge_executor.submit(self._timed_completion, request, attempt)
+            attempts[future] = attempt
+            return future
+        
+        delay_ms = self.hedging.hedge_delay_ms()
+        primary = send()
+        requests = {primary: "primary"}
+        
+        done, _ = wait([primary], timeout=delay_ms / 1000 if delay_ms is not None else None)
+        if not done:
+            requests[send()] = "hedge"
+        
+        pending = set(requests)
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception():
+                    last_error = future.exception()
+                    continue
+                
+                response, own_latency_ms, attempt = future.result()
+                self.hedging.record(own_latency_ms)
+                self._merge_wire_marks(attempt, requests[future])
+                losers = [loser for loser in pending if not loser.cancel()]
+                for loser in losers:
+                    attempts[loser].abort()
+                return (response, {"hedged": len(requests) > 1, "winner": requests[future], "delay_ms": delay_ms},
+                        losers)
+        
+        raise last_error
+    
+    def _merge_wire_marks(self, attempt: PhaseTimer, winner: str) -> None:
+        """
+        Copy the winning attempt's wire marks to the request's timer
+        
+        A winning hedge was sent after the hedge delay; its send mark is skipped so
+        that wait counts toward first_byte rather than harness overhead.
+        """
+        timer = current_timer()
+        if timer is not None:
+            phases = ("send", "first_byte", "last_byte") if winner == "primary" else ("first_byte", "last_byte")
+            timer.merge(attempt, *phases)
+    
+    def _drain(self, losers: List[Any]) -> None:
+        """
+        Wait for aborted hedge losers to unwind, feeding any that finished anyway to the policy
+        
+        The request's slot stays busy until its loser is done, so losers never
+        pile up behind later requests and load the server while those are timed.
+        """
+        from concurrent.futures import wait
+        
+        wait(losers)
+        for loser in losers:
+            if not loser.cancelled() and not loser.exception():
+                self.hedging.record(loser.result()[1])
+    
+    def close(self) -> None:
+        """Shut down the hedging thread pool"""
+        if self._hedge_executor:
+            self._hedge_executor.shutdown(wait=True, cancel_futures=True)
+            self._hedge_executor = None
+    
+    def _build_request(self, scenario: TestScenario):
+        """Build the chat completion request arguments for a scenario (the encoded body for raw HTTP)"""
+        # Tools are compiled once per unique tool set (see compile_tools)
+        tools = scenario.compiled_tools().payload
+        
+        request = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": scenario.prompt
                 }
-            )
-            
-        except Exception as e:
-            end_time = time.time()
-            latency_ms = (end_time - start_time) * 1000
-            
-            if self.verbose:
-                print(f"  Error executing scenario: {str(e)}")
+            ],
+            "tool_choice": "auto" if tools else None,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "timeout": self.timeout
+        }
+        
+        if tools:
+            # Passed through extra_body, the tools skip the SDK's per-request transform
+            # of their nested schemas, which would otherwise be timed as build overhead
+            request["extra_body"] = {"tools": tools}
+        
+        if self.stream:
+            # Ask for a final usage chunk so token counts match non-streamed runs
+            request["stream"] = True
+            request["stream_options"] = {"include_usage": True}
+        
+        if self.raw_client:
+            return self.raw_client.encode_request(request, scenario.compiled_tools())
+        return request
+    
+    def _build_result(self, response, latency_ms: float,
+                      hedge_info: Optional[Dict[str, Any]] = None,
+                      timer: Optional[PhaseTimer] = None) -> ExecutionResult:
+        """Convert a chat completion response (or consumed stream) into an ExecutionResult"""
+        usage = None
+        if isinstance(response, RawCompletion):
+            raw_tool_calls = response.tool_calls
+            content = response.content
+            finish_reason = response.finish_reason
+        elif isinstance(response, StreamAccumulator):
+            raw_tool_calls = response.tool_calls
+            content = response.content
+            finish_reason = response.finish_reason
+            usage = response.usage
+        else:
+            message = response.choices[0].message
+            raw_tool_calls = [(tc.function.name, tc.function.arguments) for tc in message.tool_calls or []]
+            content = message.content
+            finish_reason = response.choices[0].finish_reason
+            usage = response.usage
+        
+        # Extract tool calls
+        actual_tool_calls = []
+        for name, raw_arguments in raw_tool_calls:
+            try:
+                arguments = json.loads(raw_arguments) if raw_arguments else {}
+            except json.JSONDecodeError:
+                arguments = {"_raw": raw_arguments}
             
-            return ExecutionResult(
-                success=False,
-                latency_ms=round(latency_ms, 2),
-                actual_tool_calls=None,
-                error=str(e),
-                metadata={
-                    "model": self.model,
-                    "system_prompt": self.system_prompt
-                }
+            actual_tool_calls.append({
+                "name": name,
+                "arguments": arguments
+            })
+        
+        # Extract token usage
+        tokens_used = response.tokens_used if isinstance(response, RawCompletion) else None
+        if usage:
+            tokens_used = {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            }
+            # Prompt tokens served from the provider's prompt cache, and hidden reasoning
+            # tokens (both only when the provider reports them)
+            prompt_details = getattr(usage, "prompt_tokens_details", None)
+            if prompt_details is not None and prompt_details.cached_tokens is not None:
+                tokens_used["cached_tokens"] = prompt_details.cached_tokens
+            completion_details = getattr(usage, "completion_tokens_details", None)
+            if completion_details is not None and completion_details.reasoning_tokens is not None:
+                tokens_used["reasoning_tokens"] = completion_details.reasoning_tokens
+        
+        metadata = {
+            "model": self.model,
+            "finish_reason": finish_reason,
+            "system_prompt": self.system_prompt
+        }
+        
+        if timer is not None:
+            timer.mark("parse")
+            self._add_wire_metadata(metadata, timer)
+            if isinstance(response, StreamAccumulator):
+                metadata["streaming"] = response.timings(timer.start_ns)
+        
+        # latency_ms is the effective latency (first answer); a duplicate costs about as
+        # much as the winner, since even a cancelled request has had its prompt processed
+        if hedge_info is not None:
+            hedge_info["extra_tokens_estimate"] = (
+                tokens_used["total_tokens"] if hedge_info["hedged"] and tokens_used else 0
             )
+            metadata["hedge"] = hedge_info
+        
+        return ExecutionResult(
+            success=True,
+            latency_ms=round(latency_ms, 2),
+            actual_tool_calls=actual_tool_calls,
+            model_response=content,
+            tokens_used=tokens_used,
+            metadata=metadata
+        )
+    
+    @staticmethod
+    def _add_wire_metadata(metadata: Dict[str, Any], timer: PhaseTimer) -> None:
+        """Record phase marks, connection reuse and the server's request ID / processing time"""
+        metadata["timing_ns"] = timer.to_dict()
+        metadata["connection_reused"] = timer.connection_reused
+        if timer.request_id is not None:
+            metadata["request_id"] = timer.request_id
+        if timer.server_processing_ms is not None:
+            metadata["server_processing_ms"] = timer.server_processing_ms
+    
+    def _build_error_result(self, error: Exception, latency_ms: float,
+                            timer: Optional[PhaseTimer] = None) -> ExecutionResult:
+        """Convert a failed request into an ExecutionResult"""
+        if self.verbose:
+            print(f"  Error executing scenario: {str(error)}")
+        
+        metadata = {
+            "model": self.model,
+            "system_prompt": self.system_prompt
+        }
+        
+        # Keep the HTTP status so callers can tell throttling (429/503) from real failures
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            metadata["status_code"] = status_code
+            response = getattr(error, "response", None)
+            retry_after = response.headers.get("retry-after") if response is not None else None
+            if retry_after:
+                try:
+                    metadata["retry_after_s"] = float(retry_after)
+                except ValueError:
+                    pass
+        
+        if timer is not None:
+            self._add_wire_metadata(metadata, timer)
+        
+        return ExecutionResult(
+            success=False,
+            latency_ms=round(latency_ms, 2),
+            actual_tool_calls=None,
+            error=str(error),
+            metadata=metadata
+        )
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Return information about this strategy's capabilities"""
@@ -135,7 +463,11 @@ class OpenAIStrategy(BaseReasoningStrategy):
             "provider": "OpenAI",
             "model": self.model,
             "supports_tool_calls": True,
-            "supports_streaming": False,
+            "supports_streaming": True,
+            "streaming": self.stream,
+            "transport": "raw_http" if self.raw_http else "sdk",
+            "hedging": self.hedging.get_config() if self.hedging else None,
+            "cassette": self.cassette.get_config() if self.cassette else None,
             "max_tokens": self.max_tokens,
             "temperature": self.temperature,
             "system_prompt": self.system_prompt
@@ -0,0 +1,128 @@
+"""
+Request routing across several API endpoints
+"""
+
+import time
+import threading
+from typing import Dict, Any, List, Optional
+
+
+LEAST_OUTSTANDING = "least-outstanding"
+EWMA = "ewma"
+ROUTING_POLICIES = (LEAST_OUTSTANDING, EWMA)
+
+
+class EndpointState:
+    """Live counters for one endpoint"""
+    
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.ewma_ms: Optional[float] = None
+        self.updated_at = 0.0  # time.monotonic() of the last finished request
+
+
+class EndpointRouter:
+    """
+    Picks the endpoint for each request
+    
+    "least-outstanding" sends to the endpoint with the fewest requests in
+    flight. "ewma" sends to the endpoint with the lowest expected latency: its
+    exponentially weighted moving average times (requests in flight + 1), so a
+    fast endpoint takes extra work only until its queue outweighs its speed,
+    and a slower one still gets its share under concurrency. Each endpoint is
+    tried once before it has any history, and an idle endpoint whose average is
+    older than probe_interval_s is probed again, so one slow spell doesn't
+    starve an endpoint for the rest of the run. A failed request counts as
+    error_penalty times the endpoint's current average, so an endpoint that
+    fails fast (e.g. refuses connections) doesn't look like the fastest one.
+    Remaining ties rotate, so equal endpoints share the load.
+    """
+    
+    def __init__(self, endpoints: List[str], policy: str = LEAST_OUTSTANDING,
+                 alpha: float = 0.3, error_penalty: float = 2.0, probe_interval_s: float = 10.0):
+        """
+        Args:
+            endpoints: Base URLs to route between
+            policy: "least-outstanding" or "ewma"
+            alpha: Weight of the newest latency in the moving average
+            error_penalty: Factor applied to the moving average on a failed request
+            probe_interval_s: Seconds after which an idle endpoint's average is stale
+                and its next request measures it afresh
+        """
+        if not endpoints:
+            raise ValueError("Routing needs at least one endpoint")
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy: {policy} (choose from {', '.join(ROUTING_POLICIES)})")
+        if not 0 < alpha <= 1:
+            raise ValueError(f"EWMA alpha must be in (0, 1], got {alpha}")
+        if probe_interval_s <= 0:
+            raise ValueError(f"Probe interval must be positive, got {probe_interval_s}")
+        
+        self.policy = policy
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.probe_interval_s = probe_interval_s
+        self.endpoints = [EndpointState(base_url) for base_url in endpoints]
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> int:
+        """Choose an endpoint for a request and count it as outstanding; returns its index"""
+        with self._lock:
+            count = len(self.endpoints)
+            rotation = [(self._next + i) % count for i in range(count)]
+            self._next = (self._next + 1) % count
+            now = time.monotonic()
+            index = min(rotation, key=lambda i: self._rank(self.endpoints[i], now))
+            self.endpoints[index].outstanding += 1
+            return index
+    
+    def release(self, index: int, latency_ms: Optional[float], success: bool) -> None:
+        """Finish a request sent with acquire(), updating the endpoint's average latency"""
+        with self._lock:
+            endpoint = self.endpoints[index]
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            if not success:
+                endpoint.errors += 1
+                sample = max(endpoint.ewma_ms or 0.0, latency_ms or 0.0) * self.error_penalty
+            else:
+                sample = latency_ms
+            if sample is None:
+                return
+            now = time.monotonic()
+            if endpoint.ewma_ms is None or now - endpoint.updated_at >= self.probe_interval_s:
+                endpoint.ewma_ms = sample
+            else:
+                endpoint.ewma_ms += self.alpha * (sample - endpoint.ewma_ms)
+            endpoint.updated_at = now
+    
+    def _rank(self, endpoint: EndpointState, now: float):
+        """Sort key for an endpoint under the routing policy (lower is better)"""
+        if self.policy == LEAST_OUTSTANDING:
+            return endpoint.outstanding
+        # Endpoints without history, or idle with a stale average, rank first so they get measured
+        if endpoint.ewma_ms is None or (endpoint.outstanding == 0
+                                        and now - endpoint.updated_at >= self.probe_interval_s):
+            return (-1.0, endpoint.outstanding)
+        return (endpoint.ewma_ms * (endpoint.outstanding + 1), endpoint.outstanding)
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Current counters for every endpoint"""
+        with self._lock:
+            return [{
+                "base_url": endpoint.base_url,
+                "outstanding": endpoint.outstanding,
+                "requests": endpoint.requests,
+                "errors": endpoint.errors,
+                "ewma_ms": endpoint.ewma_ms
+            } for endpoint in self.endpoints]
+    
+    def get_config(self) -> Dict[str, Any]:
+        """Settings recorded alongside results"""
+        return {"policy": self.policy, "alpha": self.alpha, "error_penalty": self.error_penalty,
+                "probe_interval_s": self.probe_interval_s,
+                "endpoints": [endpoint.base_url for endpoint in self.endpoints]}
@@ -0,0 +1,92 @@
+"""
+Reassembly and timing of streamed chat completions
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class StreamAccumulator:
+    """
+    Rebuilds a streamed chat completion from its chunks and times their arrival
+    
+    Tool call deltas are merged by index: the first delta for an index carries
+    the id and function name, later ones append to the arguments string. Each
+    chunk is stamped with perf_counter_ns on arrival, giving time to first
+    token, time to the first tool name, time until the tool arguments were
+    complete, and the gaps between chunks.
+    """
+    
+    def __init__(self):
+        self.content_parts: List[str] = []
+        self.finish_reason: Optional[str] = None
+        self.usage = None
+        self._tool_calls: Dict[int, Dict[str, str]] = {}
+        self._chunk_times: List[int] = []
+        self._first_token_ns: Optional[int] = None
+        self._first_tool_name_ns: Optional[int] = None
+        self._last_tool_delta_ns: Optional[int] = None
+    
+    def add(self, chunk) -> None:
+        """Fold one ChatCompletionChunk in, stamping its arrival time"""
+        now = time.perf_counter_ns()
+        self._chunk_times.append(now)
+        
+        # With include_usage, the final chunk has the usage and no choices
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+        if not chunk.choices:
+            return
+        
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        
+        delta = choice.delta
+        if delta is None:
+            return
+        
+        if delta.content:
+            self.content_parts.append(delta.content)
+            if self._first_token_ns is None:
+                self._first_token_ns = now
+        
+        for tc in delta.tool_calls or []:
+            call = self._tool_calls.setdefault(tc.index, {"name": "", "arguments": ""})
+            if tc.function is not None:
+                if tc.function.name:
+                    call["name"] += tc.function.name
+                    if self._first_tool_name_ns is None:
+                        self._first_tool_name_ns = now
+                if tc.function.arguments:
+                    call["arguments"] += tc.function.arguments
+            self._last_tool_delta_ns = now
+            if self._first_token_ns is None:
+                self._first_token_ns = now
+    
+    @property
+    def content(self) -> Optional[str]:
+        return "".join(self.content_parts) if self.content_parts else None
+    
+    @property
+    def tool_calls(self) -> List[Tuple[str, str]]:
+        """(name, raw arguments) per tool call, in index order"""
+        return [(call["name"], call["arguments"]) for _, call in sorted(self._tool_calls.items())]
+    
+    def timings(self, start_ns: int) -> Dict[str, Any]:
+        """
+        Stream timings relative to the request start, in ms
+        
+        Metrics that didn't occur (e.g. no tool call) are None.
+        """
+        def since_start(ns: Optional[int]) -> Optional[float]:
+            return round((ns - start_ns) / 1e6, 2) if ns is not None else None
+        
+        gaps = [round((later - earlier) / 1e6, 2) for earlier, later in zip(self._chunk_times, self._chunk_times[1:])]
+        return {
+            "chunks": len(self._chunk_times),
+            "ttft_ms": since_start(self._first_token_ns),
+            "first_tool_name_ms": since_start(self._first_tool_name_ns),
+            "tool_args_complete_ms": since_start(self._last_tool_delta_ns),
+            "chunk_gaps_ms": gaps
+        }
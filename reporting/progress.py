@@ -0,0 +1,186 @@
+"""
+Background progress reporting for the run loop
+"""
+
+import sys
+import time
+import queue
+import threading
+from collections import deque
+from typing import Any, Optional, TextIO
+
+from analyzers import stats
+from tool_params.tool_definitions import ValidationResult
+
+
+# Events put on the queue when a request starts being served and when reporting ends
+_STARTED = object()
+_STOP = object()
+
+
+class ProgressReporter:
+    """
+    Status line and per-result log, kept off the hot path
+    
+    The run loop only puts events on a queue (started() / finished()); a
+    background thread drains it, keeps the counters and a sliding window of
+    latencies, writes one detail line per result to the log file and redraws a
+    single status line with throughput, in-flight count and live p50/p95.
+    Nothing in the run loop waits on terminal or file I/O.
+    """
+    
+    def __init__(self, total: Optional[int] = None, log_file: Optional[str] = None,
+                 interval_s: float = 0.5, window: int = 1000,
+                 stream: Optional[TextIO] = None):
+        """
+        Args:
+            total: Expected number of results (None if open-ended)
+            log_file: File that receives one detail line per result (None to skip)
+            interval_s: Status line refresh interval on a terminal
+            window: Most recent latencies used for the live percentiles
+            stream: Where the status line goes (default stdout)
+        """
+        self.total = total
+        self.log_file = log_file
+        self.stream = stream or sys.stdout
+        
+        # Redrawing in place needs a terminal; elsewhere (CI logs) print a line now and then
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.interval_s = interval_s if self._tty else max(interval_s, 5.0)
+        
+        self._events: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._latencies = deque(maxlen=window)
+        self._started = 0
+        self._completed = 0
+        self._failures = 0
+        self._start_time = None
+        self._thread: Optional[threading.Thread] = None
+        self._logger = None
+        self._line_width = 0
+    
+    def __enter__(self) -> "ProgressReporter":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def start(self) -> "ProgressReporter":
+        """Open the log file and start the background thread"""
+        if self.log_file:
+            import logging
+            
+            self._logger = logging.getLogger(f"{__name__}.{id(self)}")
+            self._logger.propagate = False
+            self._logger.setLevel(logging.INFO)
+            handler = logging.FileHandler(self.log_file)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._logger.addHandler(handler)
+        
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="progress-reporter", daemon=True)
+        self._thread.start()
+        return self
+    
+    def started(self) -> None:
+        """Note that a request started being served (called from the run loop)"""
+        self._events.put(_STARTED)
+    
+    def finished(self, result: ValidationResult, source: Optional[str] = None) -> None:
+        """Hand a finished result to the reporter (called from the run loop)"""
+        self._events.put((result, source))
+    
+    def stop(self) -> None:
+        """Drain remaining events, draw the final status line and close the log"""
+        if self._thread is None:
+            return
+        
+        self._events.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        
+        if self._logger:
+            for handler in list(self._logger.handlers):
+                handler.close()
+                self._logger.removeHandler(handler)
+            self._logger = None
+    
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.interval_s
+        while True:
+            try:
+                event = self._events.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                event = None
+            
+            if event is _STOP:
+                break
+            if event is not None:
+                self._handle(event)
+            
+            # Redraw on schedule even while events keep arriving
+            if time.monotonic() >= deadline:
+                self._render()
+                deadline = time.monotonic() + self.interval_s
+        
+        self._render(final=True)
+    
+    def _handle(self, event: Any) -> None:
+        if event is _STARTED:
+            self._started += 1
+            return
+        
+        result, source = event
+        self._completed += 1
+        if not result.success:
+            self._failures += 1
+        if not result.warmup:
+            self._latencies.append(result.latency_ms)
+        if self._logger:
+            self._logger.info(self._format_result(result, source))
+    
+    def _format_result(self, result: ValidationResult, source: Optional[str]) -> str:
+        """One log line with everything the verbose run loop used to print"""
+        parts = [f"[{self._completed}/{self.total or '?'}]"]
+        if source:
+            parts.append(f"{source}:")
+        parts.append(result.scenario_name)
+        if result.trial is not None:
+            parts.append(f"trial={result.trial}")
+        parts.append("OK" if result.success else "FAIL")
+        parts.append(f"latency={result.latency_ms:.2f}ms")
+        if result.queue_wait_ms is not None:
+            parts.append(f"queued={result.queue_wait_ms:.2f}ms")
+        if result.throttle_wait_ms:
+            parts.append(f"throttled={result.throttle_wait_ms:.2f}ms retries={result.retries}")
+        if result.actual_tool_calls:
+            calls = ", ".join(f"{tc['name']}({tc['arguments']})" for tc in result.actual_tool_calls)
+            parts.append(f"tools=[{calls}]")
+        if not result.success:
+            parts.append(f"reason={result.validation_details.get('reason', 'Unknown')!r}")
+        if result.error:
+            parts.append(f"error={result.error!r}")
+        if (result.metadata or {}).get("request_id"):
+            parts.append(f"request_id={result.metadata['request_id']}")
+        return " ".join(parts)
+    
+    def _render(self, final: bool = False) -> None:
+        elapsed = time.perf_counter() - self._start_time
+        rps = self._completed / elapsed if elapsed > 0 else 0.0
+        
+        line = f"[{self._completed}/{self.total or '?'}] {rps:.2f} req/s"
+        if self._started:
+            line += f" | in flight {self._started - self._completed}"
+        if self._latencies:
+            p50 = stats.percentile(self._latencies, 0.50)
+            p95 = stats.percentile(self._latencies, 0.95)
+            line += f" | p50 {p50:.0f}ms p95 {p95:.0f}ms"
+        if self._failures:
+            line += f" | failed {self._failures}"
+        
+        if self._tty:
+            padding = " " * max(0, self._line_width - len(line))
+            self._line_width = len(line)
+            self.stream.write("\r" + line + padding + ("\n" if final else ""))
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
@@ -0,0 +1 @@
+# Runners package
@@ -0,0 +1,228 @@
+"""
+Adaptive sampling runner that stops once latency percentiles converge
+"""
+
+import math
+import time
+import random
+import statistics
+from typing import Dict, Any, List, Optional, Tuple
+
+from tool_params.tool_definitions import TestScenario
+
+
+class AdaptiveSampler:
+    """
+    Keeps resampling scenarios until a latency percentile is pinned down
+    
+    After an initial `min_trials` per scenario, each round computes a bootstrap
+    confidence interval of the chosen percentile, either per scenario or over
+    all results, and schedules another batch only where the interval is still
+    wider than the target. Wider (noisier) scenarios get a larger share of each
+    batch, so stable scenarios stop early and the budget goes where it's needed.
+    The run also stops when a time, request or token budget runs out.
+    """
+    
+    def __init__(self, tester,
+                 percentile: float = 0.95,
+                 scope: str = "scenario",
+                 target_width_ms: Optional[float] = None,
+                 target_relative_width: float = 0.10,
+                 confidence: float = 0.95,
+                 min_trials: int = 5,
+                 batch_size: Optional[int] = None,
+                 max_duration_s: Optional[float] = None,
+                 max_requests: Optional[int] = None,
+                 max_tokens: Optional[int] = None,
+                 bootstrap_samples: int = 1000,
+                 seed: Optional[int] = None,
+                 verbose: bool = True):
+        """
+        Args:
+            tester: ModelPerformanceTester whose strategy, suite and CombinedAnalyzer are used
+            percentile: Percentile to converge, as a fraction (0.95 for p95)
+            scope: "scenario" to converge every scenario's percentile, "overall" for the pooled one
+            target_width_ms: Stop once the interval is at most this wide, in milliseconds
+            target_relative_width: Used when target_width_ms is unset: interval width as a
+                                   fraction of the percentile estimate
+            confidence: Confidence level of the bootstrap interval
+            min_trials: Trials per scenario before the first convergence check
+            batch_size: Requests per round after the first (default: number of scenarios)
+            max_duration_s: Stop after this many seconds
+            max_requests: Stop after this many requests
+            max_tokens: Stop after this many total tokens (as reported by the strategy)
+            bootstrap_samples: Resamples per confidence interval
+            seed: Random seed for the bootstrap
+            verbose: Print per-round progress
+        """
+        if scope not in ("scenario", "overall"):
+            raise ValueError(f"Unknown adaptive scope: {scope}")
+        if not 0 < percentile < 1:
+            raise ValueError(f"Percentile must be between 0 and 1, got {percentile}")
+        if min_trials <= tester.warmup + 1:
+            raise ValueError(f"min_trials must exceed warmup + 1 to measure spread, got {min_trials}")
+        if max_requests is not None and max_requests < 1:
+            raise ValueError(f"max_requests must be at least 1, got {max_requests}")
+        
+        self.tester = tester
+        self.percentile = percentile
+        self.scope = scope
+        self.target_width_ms = target_width_ms
+        self.target_relative_width = target_relative_width
+        self.confidence = confidence
+        self.min_trials = min_trials
+        self.batch_size = batch_size
+        self.max_duration_s = max_duration_s
+        self.max_requests = max_requests
+        self.max_tokens = max_tokens
+        self.bootstrap_samples = bootstrap_samples
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._trials_run: Dict[str, int] = {}
+    
+    def run(self):
+        """Sample until convergence or a budget runs out, returning the tester's results"""
+        analyzer = self.tester.analyzer
+        scenarios = self.tester.test_suite.get_scenarios()
+        if not scenarios:
+            return self.tester.results
+        
+        self.tester._print_run_header()
+        self.tester.warm_up_connections()
+        self.tester._compile_scenarios(scenarios)
+        batch_size = self.batch_size or len(scenarios)
+        start = time.perf_counter()
+        rounds = 0
+        intervals: Dict[str, Dict[str, Any]] = {}
+        
+        # Round 0 is interleaved by trial, like a fixed run with min_trials
+        jobs = [(scenario, trial) for trial in range(1, self.min_trials + 1) for scenario in scenarios]
+        
+        while True:
+            # Budgets are checked before each round is dispatched, so none starts past its deadline
+            stop_reason = self._budget_exhausted(start)
+            if stop_reason:
+                break
+            jobs = self._within_request_budget(jobs)
+            if not jobs:
+                stop_reason = "request_budget"
+                break
+            
+            rounds += 1
+            # Trimmed to the budget first, so cache ordering doesn't change which jobs run
+            self.tester.run_jobs(self.tester._cache_ordered(jobs))
+            
+            intervals = self._intervals(analyzer, scenarios)
+            unconverged = [name for name, ci in intervals.items() if not ci["converged"]]
+            
+            if self.verbose:
+                widest = max(intervals.values(), key=lambda ci: ci["width"])
+                print(f"Round {rounds}: {self.tester.result_count} requests, "
+                      f"{len(intervals) - len(unconverged)}/{len(intervals)} converged, "
+                      f"widest p{self._label()} CI {widest['width']:.2f}ms")
+            
+            if not unconverged:
+                stop_reason = "converged"
+                break
+            
+            jobs = self._next_jobs(scenarios, intervals, analyzer.latency_samples(), batch_size)
+        
+        elapsed = time.perf_counter() - start
+        self.tester.trials = max(self._trials_run.values(), default=0)
+        self.tester.run_info = {
+            "mode": "adaptive",
+            "percentile": self.percentile,
+            "scope": self.scope,
+            "confidence": self.confidence,
+            "target_width_ms": self.target_width_ms,
+            "target_relative_width": None if self.target_width_ms else self.target_relative_width,
+            "stop_reason": stop_reason,
+            "rounds": rounds,
+            "requests": self.tester.result_count,
+            "total_tokens": self.tester.total_tokens,
+            "duration_s": round(elapsed, 2),
+            "trials_per_scenario": dict(self._trials_run),
+            "confidence_intervals": intervals
+        }
+        
+        if self.verbose:
+            print(f"\nAdaptive sampling stopped ({stop_reason}) after {rounds} round(s), "
+                  f"{self.tester.result_count} requests in {elapsed:.2f}s")
+        
+        return self.tester.results
+    
+    def _min_samples(self) -> int:
+        """
+        Fewest samples that can say anything about the percentile
+        
+        Below 1 / (1 - p) samples (20 for p95) the tail has not been observed yet,
+        and bootstrap resamples of the maximum give a deceptively narrow interval.
+        """
+        return max(2, math.ceil(1 / (1 - self.percentile)))
+    
+    def _label(self) -> str:
+        return f"{self.percentile * 100:g}"
+    
+    def _intervals(self, analyzer, scenarios: List[TestScenario]) -> Dict[str, Dict[str, Any]]:
+        """Confidence interval per scenario, or a single "overall" entry"""
+        samples = analyzer.latency_samples()
+        if self.scope == "overall":
+            groups = {"overall": [latency for latencies in samples.values() for latency in latencies]}
+        else:
+            groups = {s.name: samples.get(s.name, []) for s in scenarios}
+        
+        intervals = {}
+        for name, latencies in groups.items():
+            ci = analyzer.bootstrap_percentile_ci(latencies, self.percentile, self.confidence,
+                                                  self.bootstrap_samples, self._rng)
+            target = self.target_width_ms if self.target_width_ms else self.target_relative_width * ci["estimate"]
+            ci["samples"] = len(latencies)
+            ci["converged"] = len(latencies) >= self._min_samples() and ci["width"] <= target
+            intervals[name] = ci
+        return intervals
+    
+    def _next_jobs(self, scenarios: List[TestScenario], intervals: Dict[str, Dict[str, Any]],
+                   samples: Dict[str, List[float]], batch_size: int) -> List[Tuple[TestScenario, int]]:
+        """
+        Split the next batch across scenarios, weighted by how noisy each one is
+        
+        Per-scenario scope weights unconverged scenarios by their interval width.
+        Overall scope weights every scenario by its latency standard deviation,
+        since the noisiest scenarios contribute most to the pooled interval.
+        """
+        if self.scope == "overall":
+            weights = {s.name: self._spread(samples.get(s.name, [])) for s in scenarios}
+        else:
+            weights = {s.name: intervals[s.name]["width"] for s in scenarios if not intervals[s.name]["converged"]}
+        
+        total_weight = sum(weights.values())
+        jobs = []
+        for scenario in scenarios:
+            if scenario.name not in weights:
+                continue
+            share = weights[scenario.name] / total_weight if total_weight else 1 / len(weights)
+            last_trial = self._trials_run.get(scenario.name, 0)
+            for n in range(1, max(1, math.ceil(batch_size * share)) + 1):
+                jobs.append((scenario, last_trial + n))
+        return jobs
+    
+    def _spread(self, latencies: List[float]) -> float:
+        return statistics.stdev(latencies) if len(latencies) > 1 else 0.0
+    
+    def _within_request_budget(self, jobs: List[Tuple[TestScenario, int]]) -> List[Tuple[TestScenario, int]]:
+        """Trim a batch so it doesn't overrun max_requests, keeping trial counters in step"""
+        if self.max_requests is not None:
+            jobs = jobs[:max(0, self.max_requests - self.tester.result_count)]
+        
+        for scenario, trial in jobs:
+            self._trials_run[scenario.name] = max(self._trials_run.get(scenario.name, 0), trial)
+        return jobs
+    
+    def _budget_exhausted(self, start: float) -> Optional[str]:
+        if self.max_duration_s is not None and time.perf_counter() - start >= self.max_duration_s:
+            return "time_budget"
+        if self.max_requests is not None and self.tester.result_count >= self.max_requests:
+            return "request_budget"
+        if self.max_tokens is not None and self.tester.total_tokens >= self.max_tokens:
+            return "token_budget"
+        return None
@@ -0,0 +1,293 @@
+"""
+Concurrency ramp / saturation sweep runner
+"""
+
+import os
+import json
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from reasoning_strategies.base_strategy import BaseReasoningStrategy
+from test_suites.base_test_suite import BaseTestSuite
+from analyzers.combined_analyzer import CombinedAnalyzer
+from tool_params.tool_definitions import TestScenario, ExecutionResult, ValidationResult
+
+
+class CycledTestSuite(BaseTestSuite):
+    """
+    Test suite view that repeats another suite's scenarios up to a fixed count
+    
+    Lets a concurrency level run enough requests to keep every worker busy
+    even when the underlying scenario set is small.
+    """
+    
+    def __init__(self, base_suite: BaseTestSuite, total_scenarios: int):
+        super().__init__(name=base_suite.name, config_file=base_suite.config_file,
+                         tags=base_suite.filter_tags, verbose=base_suite.verbose)
+        self.base_suite = base_suite
+        self.total_scenarios = total_scenarios
+    
+    def get_scenarios(self, tags: Optional[List[str]] = None) -> List[TestScenario]:
+        scenarios = self.base_suite.get_scenarios(tags)
+        if not scenarios:
+            return []
+        return [scenarios[i % len(scenarios)] for i in range(self.total_scenarios)]
+    
+    def validate_result(self, scenario: TestScenario, result: ExecutionResult) -> ValidationResult:
+        return self.base_suite.validate_result(scenario, result)
+
+
+class ConcurrencySweep:
+    """
+    Steps concurrency over the same scenario set and records the saturation curve
+    
+    Each level runs through its own ModelPerformanceTester and CombinedAnalyzer.
+    The report gives throughput, latency percentiles and error rate per level, and
+    marks where latency starts to bend upward and where throughput stops growing.
+    
+    Before the first level, a discarded pass absorbs first-request costs (imports,
+    client setup, DNS/TLS), and every level opens its connections before timing
+    starts, so no level's statistics include connection setup.
+    """
+    
+    def __init__(self, reasoning_strategy: BaseReasoningStrategy,
+                 test_suite: BaseTestSuite,
+                 levels: List[int],
+                 requests_per_level: Optional[int] = None,
+                 warmup_requests: Optional[int] = None,
+                 use_async: bool = False,
+                 latency_knee_threshold: float = 0.25,
+                 throughput_plateau_threshold: float = 0.10,
+                 verbose: bool = True):
+        """
+        Args:
+            reasoning_strategy: Strategy shared by every level
+            test_suite: Scenario source shared by every level
+            levels: Concurrency levels to step through, in order
+            requests_per_level: Requests per level (default: max(scenarios, 4 x level))
+            warmup_requests: Discarded requests at the first level before the sweep
+                (default: one pass over the scenarios, at least the first level; 0 to skip)
+            use_async: Run each level on the asyncio runner instead of the thread pool
+            latency_knee_threshold: Relative p50 growth over the first level that marks the latency knee
+            throughput_plateau_threshold: Minimum relative throughput gain for a level to count as growth
+            verbose: Print per-level progress
+        """
+        if not levels or any(level < 1 for level in levels):
+            raise ValueError(f"Concurrency levels must be positive integers, got {levels}")
+        
+        self.reasoning_strategy = reasoning_strategy
+        self.test_suite = test_suite
+        self.levels = levels
+        self.requests_per_level = requests_per_level
+        self.warmup_requests = warmup_requests
+        self.use_async = use_async
+        self.latency_knee_threshold = latency_knee_threshold
+        self.throughput_plateau_threshold = throughput_plateau_threshold
+        self.verbose = verbose
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def run(self) -> Dict[str, Any]:
+        """Run every concurrency level and return the sweep report"""
+        if not self.use_async:
+            return self._run_levels()
+        
+        # Every async level runs on one event loop: the shared async HTTP client's
+        # connections belong to the loop that opened them and can't outlive it
+        self._loop = asyncio.new_event_loop()
+        try:
+            return self._run_levels()
+        finally:
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())
+            self._loop.close()
+            self._loop = None
+    
+    def _run_levels(self) -> Dict[str, Any]:
+        from main import ModelPerformanceTester
+        
+        base_count = len(self.test_suite.get_scenarios())
+        warmup_requests = self.warmup_requests
+        if warmup_requests is None:
+            warmup_requests = max(base_count, self.levels[0])
+        if warmup_requests > 0:
+            if self.verbose:
+                print(f"Warmup: running {warmup_requests} discarded requests at concurrency {self.levels[0]}...")
+            self._run_level(ModelPerformanceTester, self.levels[0], warmup_requests)
+        
+        steps = []
+        for level in self.levels:
+            total = self.requests_per_level or max(base_count, 4 * level)
+            
+            if self.verbose:
+                print(f"Concurrency {level:>4}: running {total} requests...", end="", flush=True)
+            
+            tester, elapsed = self._run_level(ModelPerformanceTester, level, total)
+            
+            step = self._summarize_step(level, tester.results, tester.analyze_results(), elapsed)
+            steps.append(step)
+            
+            if self.verbose:
+                print(f" {step['throughput_rps']:.2f} req/s, p50 {step['p50_ms']:.0f}ms, "
+                      f"p95 {step['p95_ms']:.0f}ms, errors {step['error_rate']:.1f}%")
+        
+        return {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "reasoning_strategy": self.reasoning_strategy.name,
+                "test_suite": self.test_suite.name,
+                "levels": self.levels,
+                "warmup_requests": warmup_requests,
+                "runner": "async" if self.use_async else "thread_pool",
+                "latency_knee_threshold": self.latency_knee_threshold,
+                "throughput_plateau_threshold": self.throughput_plateau_threshold
+            },
+            "steps": steps,
+            "saturation": self._find_saturation(steps)
+        }
+    
+    def _run_level(self, tester_class, level: int, total: int):
+        """
+        Run `total` requests at one concurrency level
+        
+        The level's connections are opened before timing starts.
+        
+        Returns:
+            (tester holding the results, elapsed seconds)
+        """
+        tester = tester_class(
+            reasoning_strategy=self.reasoning_strategy,
+            test_suite=CycledTestSuite(self.test_suite, total),
+            analyzer=CombinedAnalyzer(verbose=False),
+            verbose=False,
+            concurrency=level,
+            connection_warmup=level
+        )
+        
+        if self.use_async:
+            async def run_level() -> float:
+                # Warm the pool inside the level's own event loop, then time only the requests
+                await tester.warm_up_connections_async()
+                tester.connection_warmup = 0
+                start = time.perf_counter()
+                await tester.run_tests_async()
+                return time.perf_counter() - start
+            return tester, self._loop.run_until_complete(run_level())
+        
+        tester.warm_up_connections()
+        tester.connection_warmup = 0
+        start = time.perf_counter()
+        tester.run_tests()
+        return tester, time.perf_counter() - start
+    
+    def _summarize_step(self, level: int, results: List[ValidationResult],
+                        analysis: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        """Reduce one level's results and analysis to a curve point"""
+        percentiles = analysis.get("latency", {}).get("percentiles", {})
+        errors = sum(1 for r in results if r.error)
+        
+        return {
+            "concurrency": level,
+            "requests": len(results),
+            "duration_s": round(elapsed, 2),
+            "throughput_rps": round(len(results) / elapsed, 2) if elapsed > 0 else 0,
+            "p50_ms": percentiles.get("p50", 0),
+            "p95_ms": percentiles.get("p95", 0),
+            "p99_ms": percentiles.get("p99", 0),
+            "error_rate": round(errors / len(results) * 100, 1) if results else 0,
+            "success_rate": analysis.get("accuracy", {}).get("success_rate", 0),
+            "analysis": analysis
+        }
+    
+    def _find_saturation(self, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Locate the latency knee and throughput plateau on the curve"""
+        if not steps:
+            return {}
+        
+        baseline_p50 = steps[0]["p50_ms"]
+        latency_knee = None
+        for step in steps[1:]:
+            if baseline_p50 and step["p50_ms"] > baseline_p50 * (1 + self.latency_knee_threshold):
+                latency_knee = step["concurrency"]
+                break
+        
+        throughput_plateau = None
+        peak_throughput_concurrency = steps[0]["concurrency"]
+        for previous, step in zip(steps, steps[1:]):
+            if step["throughput_rps"] < previous["throughput_rps"] * (1 + self.throughput_plateau_threshold):
+                throughput_plateau = step["concurrency"]
+                break
+            peak_throughput_concurrency = step["concurrency"]
+        
+        # The highest level reached before either latency bends or throughput flattens
+        limits = [level for level in (latency_knee, throughput_plateau) if level is not None]
+        recommended = steps[-1]["concurrency"]
+        if limits:
+            below_limit = [s["concurrency"] for s in steps if s["concurrency"] < min(limits)]
+            recommended = below_limit[-1] if below_limit else steps[0]["concurrency"]
+        
+        return {
+            "latency_knee_concurrency": latency_knee,
+            "throughput_plateau_concurrency": throughput_plateau,
+            "peak_throughput_concurrency": peak_throughput_concurrency,
+            "peak_throughput_rps": max(s["throughput_rps"] for s in steps),
+            "recommended_concurrency": recommended
+        }
+    
+    def print_report(self, report: Dict[str, Any]) -> None:
+        """Print the saturation curve in a human-readable format"""
+        print("\n" + "=" * 80)
+        print("CONCURRENCY SWEEP")
+        print("=" * 80)
+        
+        metadata = report.get("metadata", {})
+        print(f"\nStrategy: {metadata.get('reasoning_strategy', 'Unknown')}")
+        print(f"Test Suite: {metadata.get('test_suite', 'Unknown')}")
+        
+        print(f"\n{'Concurrency':>11} {'Requests':>9} {'Req/s':>9} {'P50':>10} {'P95':>10} {'P99':>10} {'Errors':>8}")
+        print("-" * 71)
+        for step in report.get("steps", []):
+            print(f"{step['concurrency']:>11} {step['requests']:>9} {step['throughput_rps']:>9.2f} "
+                  f"{step['p50_ms']:>8.2f}ms {step['p95_ms']:>8.2f}ms {step['p99_ms']:>8.2f}ms "
+                  f"{step['error_rate']:>7.1f}%")
+        
+        saturation = report.get("saturation", {})
+        print(f"\nLatency knee at concurrency: {saturation.get('latency_knee_concurrency') or 'not reached'}")
+        print(f"Throughput plateau at concurrency: {saturation.get('throughput_plateau_concurrency') or 'not reached'}")
+        print(f"Peak throughput: {saturation.get('peak_throughput_rps', 0):.2f} req/s")
+        print(f"Recommended concurrency: {saturation.get('recommended_concurrency')}")
+        print("\n" + "=" * 80)
+    
+    def save_report(self, report: Dict[str, Any], output_dir: str = "results") -> str:
+        """Save the sweep report to a JSON file"""
+        os.makedirs(output_dir, exist_ok=True)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"sweep_{self.reasoning_strategy.name}_{self.test_suite.name}_{timestamp}.json"
+        filepath = os.path.join(output_dir, filename)
+        
+        with open(filepath, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        if self.verbose:
+            print(f"\nSweep report saved to: {filepath}")
+        
+        return filepath
+
+
+def parse_concurrency_levels(spec: str) -> List[int]:
+    """
+    Parse a concurrency level spec
+    
+    Accepts a comma-separated list ("1,2,4,8") or a power-of-two range ("1-256").
+    """
+    if "-" in spec:
+        low, high = (int(part) for part in spec.split("-", 1))
+        levels = []
+        level = max(1, low)
+        while level <= high:
+            levels.append(level)
+            level *= 2
+        return levels
+    return [int(part) for part in spec.split(",") if part.strip()]
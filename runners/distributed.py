@@ -0,0 +1,422 @@
+"""
+Coordinator / worker mode for spreading load across processes and machines
+
+Coordinator and workers talk newline-delimited JSON over a plain TCP socket:
+    
+    worker -> coordinator   {"type": "hello", "worker": "<host>:<pid>"}
+    coordinator -> worker   {"type": "assign", "shard": k, "num_shards": n, "config": {...},
+                             "scenario_hashes": [...]}
+    worker -> coordinator   {"type": "result", "index": i, "result": {...}}   (one per result)
+    worker -> coordinator   {"type": "done", "count": m}  or  {"type": "error", "error": "..."}
+
+Scenario i goes to shard i % n, so the split is the same on every run. Shards
+are only assigned once every worker has connected, so all workers start
+sending load together. The run's --rpm / --tpm budget is divided between
+workers in proportion to their shard's share of the scenarios; workers do not
+coordinate their limits while running.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import asyncio
+import threading
+import subprocess
+from typing import Dict, Any, List, Optional, Tuple
+
+from test_suites.base_test_suite import BaseTestSuite
+from analyzers.combined_analyzer import CombinedAnalyzer
+from tool_params.tool_definitions import TestScenario, ExecutionResult, ValidationResult
+from scheduling.rate_limiter import RateLimiter
+
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# Seconds a connected peer has to send its hello before it is dropped
+HELLO_TIMEOUT_S = 5.0
+
+
+def parse_address(address: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+    """Parse 'host:port' or ':port' into a (host, port) tuple"""
+    host, _, port = address.rpartition(":")
+    return host or default_host, int(port)
+
+
+class ShardedTestSuite(BaseTestSuite):
+    """
+    Test suite view holding every `num_shards`-th scenario of another suite
+    
+    Shard k gets scenarios k, k + n, k + 2n, ... of the base suite.
+    """
+    
+    def __init__(self, base_suite: BaseTestSuite, shard: int, num_shards: int):
+        super().__init__(name=base_suite.name, config_file=base_suite.config_file,
+                         tags=base_suite.filter_tags, verbose=base_suite.verbose)
+        self.base_suite = base_suite
+        self.shard = shard
+        self.num_shards = num_shards
+    
+    def get_scenarios(self, tags: Optional[List[str]] = None) -> List[TestScenario]:
+        scenarios = self.base_suite.get_scenarios(tags)
+        return [s for i, s in enumerate(scenarios) if i % self.num_shards == self.shard]
+    
+    def validate_result(self, scenario: TestScenario, result: ExecutionResult) -> ValidationResult:
+        return self.base_suite.validate_result(scenario, result)
+
+
+class ShardPositions:
+    """
+    Maps a shard's results back to their scenario's position in the full suite
+    
+    Scenarios with identical content share a hash, so each (hash, trial) result
+    takes the next of that hash's positions in the shard rather than all
+    landing on the first one.
+    """
+    
+    def __init__(self, hashes: List[str], shard: int, num_shards: int):
+        self._positions: Dict[str, List[int]] = {}
+        for i, content_hash in enumerate(hashes):
+            if i % num_shards == shard:
+                self._positions.setdefault(content_hash, []).append(i)
+        self._seen: Dict[Tuple[str, Optional[int]], int] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def count(self) -> int:
+        """Number of scenarios in the shard"""
+        return sum(len(positions) for positions in self._positions.values())
+    
+    def index(self, result: ValidationResult) -> int:
+        """Position in the full suite of the scenario a result belongs to"""
+        key = (result.scenario_hash, result.trial)
+        with self._lock:
+            occurrence = self._seen.get(key, 0)
+            self._seen[key] = occurrence + 1
+        positions = self._positions[result.scenario_hash]
+        return positions[occurrence % len(positions)]
+
+
+class _Connection:
+    """Line-oriented JSON messages over a socket"""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._reader = sock.makefile('r', encoding='utf-8')
+        self._write_lock = threading.Lock()
+    
+    def send(self, message: Dict[str, Any]) -> None:
+        data = (json.dumps(message, default=str) + "\n").encode('utf-8')
+        with self._write_lock:
+            self.sock.sendall(data)
+    
+    def receive(self) -> Optional[Dict[str, Any]]:
+        """Next message, or None once the peer has closed the connection"""
+        line = self._reader.readline()
+        if not line:
+            return None
+        return json.loads(line)
+    
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class DistributedCoordinator:
+    """
+    Shards a run across worker processes and merges their results
+    
+    Results are fed into the given tester as they arrive, so its analyzer,
+    JSONL stream and save_results() behave exactly as for a local run.
+    """
+    
+    def __init__(self, tester, config: Dict[str, Any],
+                 num_workers: int,
+                 local_workers: Optional[int] = None,
+                 listen: str = "127.0.0.1:0",
+                 connect_timeout: float = 60.0,
+                 verbose: bool = True):
+        """
+        Args:
+            tester: ModelPerformanceTester that collects the merged results
+            config: Settings every worker runs with (strategy, model, config, tags,
+                    concurrency, trials, warmup, use_async, rate limits)
+            num_workers: Total number of workers to shard across
+            local_workers: How many of them to start as local subprocesses (default: all)
+            listen: Address to accept worker connections on; use 0.0.0.0:<port> for remote workers
+            connect_timeout: Seconds to wait for every worker to connect
+            verbose: Print worker progress
+        """
+        if num_workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {num_workers}")
+        
+        self.tester = tester
+        self.config = config
+        self.num_workers = num_workers
+        self.local_workers = num_workers if local_workers is None else local_workers
+        self.listen = listen
+        self.connect_timeout = connect_timeout
+        self.verbose = verbose
+        self._processes: List[subprocess.Popen] = []
+        self._connections: List[Tuple[str, _Connection]] = []
+    
+    def run(self) -> List[ValidationResult]:
+        """Run every shard to completion and return the merged results in job order"""
+        scenarios = self.tester.test_suite.get_scenarios()
+        hashes = [s.content_hash() for s in scenarios]
+        already_recorded = self.tester.result_count
+        
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(parse_address(self.listen))
+        server.listen(self.num_workers)
+        host, port = server.getsockname()
+        
+        if self.verbose:
+            print(f"\nCoordinator listening on {host}:{port}, waiting for {self.num_workers} worker(s)...")
+        
+        finished = False
+        try:
+            try:
+                self._start_local_workers(port)
+                connections = self._accept_workers(server)
+            finally:
+                server.close()
+            
+            messages: "queue.Queue[Tuple[str, Optional[Dict[str, Any]]]]" = queue.Queue()
+            start = time.perf_counter()
+            for shard, (worker, connection) in enumerate(connections):
+                connection.send({
+                    "type": "assign",
+                    "shard": shard,
+                    "num_shards": self.num_workers,
+                    "config": self.config,
+                    "scenario_hashes": hashes
+                })
+                threading.Thread(target=self._read_worker, args=(worker, connection, messages), daemon=True).start()
+            
+            # Per-result detail goes to the tester's progress reporter (status line + log file)
+            with self.tester._progress(len(scenarios) * self.tester.trials):
+                indexed_results = self._merge(messages, len(scenarios), len(connections))
+            elapsed = time.perf_counter() - start
+            finished = True
+        finally:
+            self._shut_down(terminate=not finished)
+        
+        results = [result for _, result in sorted(indexed_results, key=lambda item: item[0])]
+        self.tester._keep(results)
+        merged = self.tester.result_count - already_recorded
+        self.tester.run_info = {
+            "mode": "distributed",
+            "workers": self.num_workers,
+            "local_workers": self.local_workers,
+            "duration_s": round(elapsed, 2),
+            "achieved_rps": round(merged / elapsed, 2) if elapsed > 0 else 0
+        }
+        
+        if self.verbose:
+            print(f"\nMerged {merged} results from {len(connections)} worker(s) in {elapsed:.2f}s")
+        
+        return self.tester.results
+    
+    def _shut_down(self, terminate: bool) -> None:
+        """
+        Close every worker connection and reap the local worker processes
+        
+        After a failure (e.g. not every worker connected in time) the local
+        workers are terminated rather than left running orphaned.
+        """
+        for _, connection in self._connections:
+            connection.close()
+        self._connections = []
+        
+        for process in self._processes:
+            if terminate and process.poll() is None:
+                process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self._processes = []
+    
+    def _start_local_workers(self, port: int) -> None:
+        for _ in range(self.local_workers):
+            self._processes.append(subprocess.Popen(
+                [sys.executable, MAIN_SCRIPT, "run", "--connect", f"127.0.0.1:{port}", "--quiet"]
+            ))
+    
+    def _accept_workers(self, server: socket.socket) -> List[Tuple[str, _Connection]]:
+        """Wait until every worker has connected and said hello"""
+        # Kept on the coordinator, so the connections are closed even if not everyone connects
+        connections = self._connections
+        deadline = time.monotonic() + self.connect_timeout
+        
+        while len(connections) < self.num_workers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Only {len(connections)} of {self.num_workers} workers connected "
+                                   f"within {self.connect_timeout:.0f}s")
+            server.settimeout(remaining)
+            try:
+                sock, address = server.accept()
+            except socket.timeout:
+                continue
+            
+            # A peer that is not a worker (a port scan, a stray client) must not hold up the others
+            sock.settimeout(min(HELLO_TIMEOUT_S, max(deadline - time.monotonic(), 0.1)))
+            connection = _Connection(sock)
+            try:
+                hello = connection.receive()
+            except (OSError, ValueError):
+                hello = None
+            if not isinstance(hello, dict) or hello.get("type") != "hello":
+                if self.verbose:
+                    print(f"  Dropped {address[0]}:{address[1]}: no worker hello")
+                connection.close()
+                continue
+            sock.settimeout(None)
+            
+            worker = hello.get("worker", f"{address[0]}:{address[1]}")
+            connections.append((worker, connection))
+            if self.verbose:
+                print(f"  Worker {len(connections)}/{self.num_workers} connected: {worker}")
+        
+        return connections
+    
+    def _read_worker(self, worker: str, connection: _Connection,
+                     messages: "queue.Queue[Tuple[str, Optional[Dict[str, Any]]]]") -> None:
+        """Forward a worker's messages to the merge loop; None marks a lost connection"""
+        try:
+            while True:
+                message = connection.receive()
+                messages.put((worker, message))
+                if message is None or message.get("type") in ("done", "error"):
+                    return
+        except (OSError, ValueError):
+            messages.put((worker, None))
+    
+    def _merge(self, messages: "queue.Queue[Tuple[str, Optional[Dict[str, Any]]]]",
+               num_scenarios: int, num_workers: int) -> List[Tuple[int, ValidationResult]]:
+        """
+        Feed worker results into the tester on this thread until every worker finishes
+        
+        Returns:
+            (job index, result) pairs, where job index follows the same trial-major
+            order as a local run; empty when the tester streams results to JSONL
+        """
+        indexed_results = []
+        finished = 0
+        
+        while finished < num_workers:
+            worker, message = messages.get()
+            
+            if message is None:
+                finished += 1
+                print(f"Warning: worker {worker} disconnected before finishing; its remaining results are missing")
+            elif message["type"] == "result":
+                result = ValidationResult.from_dict(message["result"])
+                index = ((result.trial or 1) - 1) * num_scenarios + message["index"]
+                if self.tester.keep_results:
+                    indexed_results.append((index, result))
+                self.tester._record_result(result, index)
+            elif message["type"] == "done":
+                finished += 1
+            elif message["type"] == "error":
+                finished += 1
+                print(f"Warning: worker {worker} failed: {message.get('error')}")
+        
+        return indexed_results
+
+
+def run_worker(address: str, verbose: bool = False) -> int:
+    """
+    Connect to a coordinator, run the assigned shard and stream results back
+    
+    Args:
+        address: Coordinator address as 'host:port'
+        verbose: Print per-scenario progress on the worker
+    
+    Returns:
+        Process exit code
+    """
+    from main import (ModelPerformanceTester, create_reasoning_strategy, create_test_suite,
+                      create_cassette, strategy_options)
+    from transport.client_pool import configure_pool
+    
+    connection = _Connection(socket.create_connection(parse_address(address)))
+    connection.send({"type": "hello", "worker": f"{socket.gethostname()}:{os.getpid()}"})
+    
+    assignment = connection.receive()
+    if not assignment or assignment.get("type") != "assign":
+        connection.close()
+        return 1
+    
+    config = assignment["config"]
+    strategy = None
+    cassette = None
+    try:
+        rate_limited = bool(config.get("rpm") or config.get("tpm"))
+        configure_pool(config.get("max_connections"), config.get("max_keepalive"), config.get("keepalive_expiry"))
+        cassette = create_cassette(config.get("record"), config.get("replay"), config.get("replay_latency", False))
+        strategy = create_reasoning_strategy(config["strategy"], model=config["model"], verbose=False,
+                                             **strategy_options(config, cassette))
+        test_suite = create_test_suite(config_file=config["config"], tags=config["tags"], verbose=False)
+        
+        # A remote worker with a different config file would silently run different scenarios
+        scenarios = test_suite.get_scenarios()
+        hashes = [s.content_hash() for s in scenarios]
+        if hashes != assignment["scenario_hashes"]:
+            raise ValueError(f"Scenarios in {test_suite.config_file} don't match the coordinator's")
+        positions = ShardPositions(hashes, assignment["shard"], assignment["num_shards"])
+        
+        # Each worker gets the slice of the run's rate limits its share of the scenarios needs,
+        # so shards of unequal size still finish together
+        rate_limiter = None
+        if rate_limited:
+            share = positions.count / len(hashes) if hashes else 0.0
+            rate_limiter = RateLimiter(
+                rpm=config["rpm"] * share if config.get("rpm") else None,
+                tpm=config["tpm"] * share if config.get("tpm") else None,
+                max_retries=config.get("max_retries", 5)
+            )
+        
+        tester = ModelPerformanceTester(
+            reasoning_strategy=strategy,
+            test_suite=ShardedTestSuite(test_suite, assignment["shard"], assignment["num_shards"]),
+            analyzer=CombinedAnalyzer(verbose=False),
+            verbose=verbose,
+            concurrency=config["concurrency"],
+            trials=config["trials"],
+            warmup=config["warmup"],
+            rate_limiter=rate_limiter,
+            connection_warmup=config.get("warm_connections") or 0,
+            cache_order=config.get("cache_order", False),
+            on_result=lambda result: connection.send({
+                "type": "result",
+                "index": positions.index(result),
+                "result": result.to_dict()
+            })
+        )
+        
+        if config.get("use_async"):
+            asyncio.run(tester.run_tests_async())
+        else:
+            tester.run_tests()
+        
+        connection.send({"type": "done", "count": tester.result_count})
+        return 0
+    except Exception as e:
+        connection.send({"type": "error", "error": str(e)})
+        return 1
+    finally:
+        if strategy:
+            strategy.close()
+        if cassette:
+            cassette.close()
+        connection.close()
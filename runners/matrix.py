@@ -0,0 +1,272 @@
+"""
+Strategy x model x config matrix runner
+"""
+
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from itertools import zip_longest
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from analyzers.combined_analyzer import CombinedAnalyzer
+from reporting.progress import ProgressReporter
+from tool_params.tool_definitions import TestScenario, ValidationResult
+
+
+class MatrixCell:
+    """One strategy/model/config combination and the tester that records its results"""
+    
+    def __init__(self, strategy_name: str, model: Optional[str], config_file: str, tester):
+        self.strategy_name = strategy_name
+        self.model = model
+        self.config_file = config_file
+        self.tester = tester
+    
+    @property
+    def label(self) -> str:
+        return f"{self.tester.reasoning_strategy.name} / {os.path.basename(self.config_file)}"
+
+
+class MatrixRunner:
+    """
+    Runs every strategy x model x config combination in one invocation
+    
+    All cells share a single worker pool, and their jobs are interleaved
+    round-robin (cell A job 1, cell B job 1, ..., cell A job 2, ...), so every
+    cell samples the endpoint over the same window instead of one after another.
+    Each cell keeps its own tester and analyzer; the report puts them side by side.
+    """
+    
+    def __init__(self, strategies: List[str], models: List[str], configs: List[Optional[str]],
+                 tags: Optional[List[str]] = None,
+                 concurrency: int = 1,
+                 trials: int = 1,
+                 warmup: int = 0,
+                 verbose: bool = True,
+                 log_file: Optional[str] = None,
+                 strategy_options: Optional[Callable[[], Dict[str, Any]]] = None,
+                 rate_limiter=None,
+                 connection_warmup: int = 0,
+                 cache_order: bool = False):
+        """
+        Args:
+            strategies: Strategy names accepted by create_reasoning_strategy
+            models: Models to run each strategy with (ignored by strategies without a model)
+            configs: Scenario config files (None for the default config)
+            tags: Scenario tag filter applied to every config
+            concurrency: Requests in flight across the whole matrix
+            trials: Trials per scenario in every cell
+            warmup: Leading trials per scenario excluded from latency statistics
+            verbose: Show a progress status line while running
+            log_file: File that receives one detail line per request (verbose mode only)
+            strategy_options: Returns create_reasoning_strategy keyword arguments (hedging,
+                streaming, cassette, base URL, ...); called once per strategy, as in
+                main.strategy_options, so no state is shared between strategies
+            rate_limiter: Optional RateLimiter shared by every cell (the limits apply to the whole run)
+            connection_warmup: Connections each strategy opens before timing starts
+            cache_order: Run each cell's scenarios sharing a prompt prefix back-to-back
+        """
+        from main import ModelPerformanceTester, create_reasoning_strategy, create_test_suite
+        
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+        
+        self.concurrency = concurrency
+        self.trials = trials
+        self.warmup = warmup
+        self.verbose = verbose
+        self.log_file = log_file
+        self.connection_warmup = connection_warmup
+        self.cells: List[MatrixCell] = []
+        
+        seen = set()
+        for strategy_name in strategies:
+            for model in models:
+                options = strategy_options() if strategy_options else {}
+                strategy = create_reasoning_strategy(strategy_name, model=model, verbose=False, **options)
+                for config_file in configs:
+                    test_suite = create_test_suite(config_file=config_file, tags=tags, verbose=False)
+                    
+                    # Strategies that ignore the model (e.g. custom) would otherwise repeat per model
+                    key = (strategy.name, test_suite.config_file)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    
+                    tester = ModelPerformanceTester(
+                        reasoning_strategy=strategy,
+                        test_suite=test_suite,
+                        analyzer=CombinedAnalyzer(verbose=False),
+                        verbose=False,
+                        concurrency=concurrency,
+                        trials=trials,
+                        warmup=warmup,
+                        rate_limiter=rate_limiter,
+                        connection_warmup=connection_warmup,
+                        cache_order=cache_order
+                    )
+                    self.cells.append(MatrixCell(strategy_name, model, test_suite.config_file, tester))
+    
+    def run(self) -> Dict[str, Any]:
+        """Run every cell on the shared pool and return the matrix report"""
+        jobs = self._interleave_jobs()
+        self._warm_up_connections()
+        per_cell: Dict[int, List[Optional[ValidationResult]]] = {
+            c: [None] * sum(1 for job in jobs if job[0] == c) for c in range(len(self.cells))
+        }
+        
+        if self.verbose:
+            print(f"\nRunning {len(jobs)} requests across {len(self.cells)} cells "
+                  f"(concurrency {self.concurrency})...")
+            if self.log_file:
+                print(f"Log File: {self.log_file}")
+        
+        # Cell testers are quiet; the matrix reports progress for all of them, labelled by cell
+        progress = ProgressReporter(len(jobs), log_file=self.log_file) if self.verbose else None
+        if progress:
+            progress.start()
+            for cell in self.cells:
+                cell.tester.progress = progress
+                cell.tester.progress_label = cell.label
+        
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                submitted_at = time.perf_counter()
+                futures = {
+                    executor.submit(self.cells[c].tester._run_scenario, scenario, submitted_at, trial): (c, i)
+                    for c, i, scenario, trial in jobs
+                }
+                
+                try:
+                    for future in as_completed(futures):
+                        c, i = futures[future]
+                        validated_result = future.result()
+                        per_cell[c][i] = validated_result
+                        self.cells[c].tester._record_result(validated_result, i)
+                except KeyboardInterrupt:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            if progress:
+                progress.stop()
+                for cell in self.cells:
+                    cell.tester.progress = None
+            self._close_strategies()
+        elapsed = time.perf_counter() - start
+        
+        for c, cell in enumerate(self.cells):
+            cell.tester.results.extend(per_cell[c])
+        
+        return {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "cells": len(self.cells),
+                "total_requests": len(jobs),
+                "concurrency": self.concurrency,
+                "trials": self.trials,
+                "warmup": self.warmup,
+                "rate_limit": self.cells[0].tester.rate_limiter.get_config()
+                if self.cells and self.cells[0].tester.rate_limiter else None,
+                "duration_s": round(elapsed, 2)
+            },
+            "comparison": [self._summarize_cell(cell) for cell in self.cells],
+            "cells": [
+                {
+                    "strategy": cell.strategy_name,
+                    "model": cell.model,
+                    "reasoning_strategy": cell.tester.reasoning_strategy.name,
+                    "config_file": cell.config_file,
+                    "analysis": cell.tester.analyze_results(),
+                    "detailed_results": cell.tester._detailed_results()
+                }
+                for cell in self.cells
+            ]
+        }
+    
+    def _warm_up_connections(self) -> None:
+        """Open each strategy's connections once (cells share a strategy across configs)"""
+        if self.connection_warmup <= 0:
+            return
+        warmed = set()
+        for cell in self.cells:
+            if id(cell.tester.reasoning_strategy) not in warmed:
+                warmed.add(id(cell.tester.reasoning_strategy))
+                cell.tester.warm_up_connections()
+    
+    def _close_strategies(self) -> None:
+        """Close each strategy once (cells share a strategy across configs)"""
+        strategies = {id(cell.tester.reasoning_strategy): cell.tester.reasoning_strategy for cell in self.cells}
+        for strategy in strategies.values():
+            strategy.close()
+    
+    def _interleave_jobs(self) -> List[Tuple[int, int, TestScenario, int]]:
+        """
+        Round-robin every cell's (scenario, trial) jobs into one queue
+        
+        Returns:
+            List of (cell index, job index within the cell, scenario, trial)
+        """
+        cell_jobs = [
+            [(c, i, scenario, trial)
+             for i, (scenario, trial) in enumerate(cell.tester._build_jobs(cell.tester.test_suite.get_scenarios()))]
+            for c, cell in enumerate(self.cells)
+        ]
+        return [job for row in zip_longest(*cell_jobs) for job in row if job is not None]
+    
+    def _summarize_cell(self, cell: MatrixCell) -> Dict[str, Any]:
+        """One row of the comparison table"""
+        analysis = cell.tester.analyze_results()
+        latency = analysis.get("latency", {})
+        percentiles = latency.get("percentiles", {})
+        results = cell.tester.results
+        errors = sum(1 for r in results if r.error)
+        
+        return {
+            "cell": cell.label,
+            "strategy": cell.strategy_name,
+            "model": cell.model,
+            "config_file": cell.config_file,
+            "requests": len(results),
+            "success_rate": analysis.get("accuracy", {}).get("success_rate", 0),
+            "error_rate": round(errors / len(results) * 100, 1) if results else 0,
+            "average_ms": latency.get("average_ms", 0),
+            "p50_ms": percentiles.get("p50", 0),
+            "p95_ms": percentiles.get("p95", 0),
+            "p99_ms": percentiles.get("p99", 0)
+        }
+    
+    def print_report(self, report: Dict[str, Any]) -> None:
+        """Print the comparison table in a human-readable format"""
+        print("\n" + "=" * 100)
+        print("MATRIX COMPARISON")
+        print("=" * 100)
+        
+        metadata = report.get("metadata", {})
+        print(f"\nCells: {metadata.get('cells', 0)}  Requests: {metadata.get('total_requests', 0)}  "
+              f"Concurrency: {metadata.get('concurrency', 1)}  Duration: {metadata.get('duration_s', 0):.2f}s")
+        
+        print(f"\n{'Cell':<40} {'Requests':>8} {'Success':>8} {'Errors':>7} {'Avg':>10} {'P50':>10} {'P95':>10}")
+        print("-" * 97)
+        for row in report.get("comparison", []):
+            print(f"{row['cell'][:40]:<40} {row['requests']:>8} {row['success_rate']:>7.1f}% "
+                  f"{row['error_rate']:>6.1f}% {row['average_ms']:>8.2f}ms {row['p50_ms']:>8.2f}ms "
+                  f"{row['p95_ms']:>8.2f}ms")
+        print("\n" + "=" * 100)
+    
+    def save_report(self, report: Dict[str, Any], output_dir: str = "results") -> str:
+        """Save the combined matrix results to a JSON file"""
+        os.makedirs(output_dir, exist_ok=True)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filepath = os.path.join(output_dir, f"matrix_{timestamp}.json")
+        
+        with open(filepath, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        if self.verbose:
+            print(f"\nMatrix results saved to: {filepath}")
+        
+        return filepath
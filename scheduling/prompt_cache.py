@@ -0,0 +1,36 @@
+"""
+Request ordering for provider prompt caching
+"""
+
+import hashlib
+from typing import Dict, List, Tuple
+
+from tool_params.tool_definitions import TestScenario
+
+
+def prompt_prefix_key(system_prompt: str, scenario: TestScenario) -> str:
+    """
+    Hash of the part of a request that precedes the user prompt
+    
+    Requests with the same key share their system prompt and tool block, which
+    is the prefix a provider's prompt cache can reuse.
+    """
+    prefix = f"{scenario.compiled_tools().key}\n{system_prompt}"
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+def order_for_prompt_cache(jobs: List[Tuple[TestScenario, int]], system_prompt: str) -> List[Tuple[TestScenario, int]]:
+    """
+    Reorder (scenario, trial) jobs so requests sharing a prompt prefix run back-to-back
+    
+    Groups keep the order in which their first scenario appears, and jobs keep
+    their relative order inside a group (so trials stay interleaved across the
+    group's scenarios).
+    """
+    group_index: Dict[str, int] = {}
+    keys = [prompt_prefix_key(system_prompt, scenario) for scenario, _ in jobs]
+    for key in keys:
+        group_index.setdefault(key, len(group_index))
+    
+    order = sorted(range(len(jobs)), key=lambda i: group_index[keys[i]])
+    return [jobs[i] for i in order]
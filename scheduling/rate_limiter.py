@@ -0,0 +1,161 @@
+"""
+Requests-per-minute / tokens-per-minute rate limiting
+"""
+
+import time
+import random
+import threading
+from typing import Any, Dict, Optional
+
+from tool_params.tool_definitions import TestScenario, ExecutionResult
+
+
+# Status codes that mean "slow down and try again" rather than a real failure
+RETRYABLE_STATUS_CODES = (429, 503)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills continuously up to its capacity
+    
+    reserve() always succeeds: it takes the tokens immediately (letting the
+    balance go negative) and returns how long the caller must wait before
+    sending. Callers are therefore served in the order they reserved, and the
+    same bucket works for threads (time.sleep) and coroutines (asyncio.sleep).
+    """
+    
+    def __init__(self, capacity: float, refill_per_s: float):
+        self.capacity = capacity
+        self.refill_per_s = refill_per_s
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens and return the seconds to wait before using them"""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_s
+    
+    def credit(self, amount: float) -> None:
+        """Return tokens (or take more, with a negative amount) after the fact"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_s)
+        self._updated = now
+
+
+class RateLimiter:
+    """
+    Shared scheduler that keeps a run within provider RPM/TPM limits
+    
+    Every request reserves one request token and an estimate of its total tokens
+    before it is sent; once the response reports actual usage the difference is
+    settled. Requests rejected with 429/503 are retried after a jittered
+    exponential backoff (or the server's Retry-After). Time spent waiting here is
+    returned to the caller so it can be reported apart from model latency.
+    """
+    
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_retries: int = 5,
+                 backoff_base_s: float = 1.0,
+                 backoff_max_s: float = 60.0,
+                 default_completion_tokens: int = 256):
+        """
+        Args:
+            rpm: Requests per minute (None for no request limit)
+            tpm: Tokens per minute (None for no token limit)
+            max_retries: Retries per request after a 429/503
+            backoff_base_s: First backoff ceiling; doubles with each retry
+            backoff_max_s: Upper bound on a single backoff
+            default_completion_tokens: Completion allowance when the strategy sets no max_tokens
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.default_completion_tokens = default_completion_tokens
+        
+        # A full minute's budget up front would allow a burst of rpm requests at t=0,
+        # so capacity is one second's worth (at least one request)
+        self._requests = TokenBucket(max(1.0, rpm / 60), rpm / 60) if rpm else None
+        self._tokens = TokenBucket(max(1.0, tpm / 60), tpm / 60) if tpm else None
+    
+    def estimate_tokens(self, scenario: TestScenario, system_prompt: str = "",
+                        max_completion_tokens: Optional[int] = None) -> int:
+        """
+        Rough total-token estimate for a scenario, made before sending it
+        
+        Uses ~4 characters per token over the system prompt, user prompt and tool
+        schemas, plus the completion allowance.
+        """
+        tools_chars = len(scenario.compiled_tools().json_bytes)
+        prompt_chars = len(system_prompt) + len(scenario.prompt) + tools_chars
+        return prompt_chars // 4 + (max_completion_tokens or self.default_completion_tokens)
+    
+    def acquire(self, estimated_tokens: int) -> float:
+        """Block until a request of this size may be sent; returns seconds waited"""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, estimated_tokens: int) -> float:
+        """Event-loop version of acquire()"""
+        import asyncio
+        
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def settle(self, estimated_tokens: int, result: ExecutionResult) -> None:
+        """Correct the token budget once the actual usage is known"""
+        if self._tokens and result.tokens_used:
+            actual = result.tokens_used.get("total_tokens", estimated_tokens)
+            self._tokens.credit(estimated_tokens - actual)
+    
+    def should_retry(self, result: ExecutionResult, attempt: int) -> bool:
+        """Whether a failed attempt was throttled and has retries left"""
+        if result.success or attempt >= self.max_retries:
+            return False
+        return (result.metadata or {}).get("status_code") in RETRYABLE_STATUS_CODES
+    
+    def backoff_delay(self, result: ExecutionResult, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a throttled attempt
+        
+        Honors the server's Retry-After when given, otherwise uses "full jitter":
+        a uniform draw up to base * 2^attempt, so retrying workers spread out
+        instead of hitting the limit again in lockstep.
+        """
+        retry_after = (result.metadata or {}).get("retry_after_s")
+        if retry_after is not None:
+            return min(float(retry_after), self.backoff_max_s)
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+    
+    def _reserve(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self._requests:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens:
+            wait = max(wait, self._tokens.reserve(estimated_tokens))
+        return wait
+    
+    def get_config(self) -> Dict[str, Any]:
+        """Settings recorded alongside results"""
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "max_retries": self.max_retries,
+            "backoff_base_s": self.backoff_base_s,
+            "backoff_max_s": self.backoff_max_s
+        }
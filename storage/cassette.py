@@ -0,0 +1,174 @@
+"""
+Record/replay cache of API responses
+"""
+
+import json
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from tool_params.tool_definitions import TestScenario, ExecutionResult
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+def request_key(model: str, system_prompt: str, scenario: TestScenario,
+                params: Dict[str, Any]) -> str:
+    """
+    Key identifying a request by everything that affects its response
+    
+    Args:
+        model: Model name
+        system_prompt: System prompt sent with the request
+        scenario: Scenario providing the user prompt and tools
+        params: Sampling and response settings (temperature, max_tokens, stream, ...)
+    
+    Returns:
+        Hex digest of the model, prompts, tools hash and params
+    """
+    import hashlib
+    payload = json.dumps({
+        "model": model,
+        "system_prompt": system_prompt,
+        "prompt": scenario.prompt,
+        "tools": scenario.compiled_tools().key,
+        "params": params
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class ResponseCassette:
+    """
+    SQLite file of recorded responses, for re-running a past run offline
+    
+    In record mode every successful response is stored under its request key
+    (see request_key) along with the request and its measured latency. Records
+    are only ever appended, so resumed runs and distributed workers can share a
+    file; record into a fresh path to start over. record() only queues the row:
+    a writer thread inserts queued rows and commits them together, so requests
+    (and the event loop) never wait on SQLite. close() writes whatever is left.
+    
+    In replay mode no request is sent: each call for a key returns the next of
+    its recordings in order (cycling when there are more calls than
+    recordings), with the recorded latency. Keys that were never recorded
+    return None.
+    """
+    
+    def __init__(self, path: str, mode: str = REPLAY, replay_latency: bool = False):
+        """
+        Args:
+            path: SQLite database file (created in record mode)
+            mode: "record" or "replay"
+            replay_latency: In replay mode, wait out each response's recorded latency
+        """
+        import os
+        import sqlite3
+        
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == REPLAY and not os.path.exists(path):
+            raise FileNotFoundError(f"No cassette at {path}")
+        
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._replays: Dict[str, List[Tuple[Dict[str, Any], float]]] = {}
+        self._replay_counts: Dict[str, int] = {}
+        self._rows: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                request TEXT NOT NULL,
+                result TEXT NOT NULL,
+                latency_ms REAL NOT NULL,
+                recorded_at TEXT NOT NULL,
+                PRIMARY KEY (key, seq)
+            )
+        """)
+        self._db.commit()
+    
+        if mode == RECORD:
+            self._writer = threading.Thread(target=self._write_rows, daemon=True)
+            self._writer.start()
+    
+    @property
+    def replaying(self) -> bool:
+        """Whether responses are served from the cassette rather than the API"""
+        return self.mode == REPLAY
+    
+    def record(self, key: str, request: Union[Dict[str, Any], bytes], result: ExecutionResult) -> None:
+        """Store a response (as its ExecutionResult) under a request key, with the request arguments or body"""
+        if self.mode != RECORD or not result.success:
+            return
+        
+        row_request = request.decode("utf-8") if isinstance(request, bytes) else json.dumps(request, default=str)
+        row_result = json.dumps(result.to_dict(), default=str)
+        self._rows.put((key, row_request, row_result, result.latency_ms, datetime.now().isoformat(), key))
+    
+    def close(self) -> None:
+        """Write any queued recordings and close the file"""
+        if self._writer:
+            self._rows.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def _write_rows(self) -> None:
+        """Insert queued rows on the writer thread, one commit per burst"""
+        done = False
+        while not done:
+            rows = [self._rows.get()]
+            while True:
+                try:
+                    rows.append(self._rows.get_nowait())
+                except queue.Empty:
+                    break
+            if None in rows:
+                done = True
+                rows = [row for row in rows if row is not None]
+            if not rows:
+                continue
+            with self._lock:
+                # One statement per row, so workers appending to the same file can't take the same seq
+                self._db.executemany("""
+                    INSERT INTO responses
+                    SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ?, ? FROM responses WHERE key = ?
+                """, rows)
+                self._db.commit()
+    
+    def replay(self, key: str) -> Optional[ExecutionResult]:
+        """The next recorded response for a request key, or None if it was never recorded"""
+        with self._lock:
+            if key not in self._replays:
+                rows = self._db.execute("SELECT result, latency_ms FROM responses WHERE key = ? ORDER BY seq",
+                                        (key,)).fetchall()
+                self._replays[key] = [(json.loads(result), latency_ms) for result, latency_ms in rows]
+            recordings = self._replays[key]
+            if not recordings:
+                return None
+            index = self._replay_counts.get(key, 0)
+            self._replay_counts[key] = index + 1
+        
+        data, latency_ms = recordings[index % len(recordings)]
+        result = ExecutionResult(**data)
+        result.latency_ms = latency_ms
+        result.metadata = {**(result.metadata or {}), "cassette": "replay"}
+        return result
+    
+    def get_config(self) -> Dict[str, Any]:
+        """Settings recorded alongside results"""
+        return {"path": self.path, "mode": self.mode, "replay_latency": self.replay_latency}
@@ -0,0 +1,130 @@
+"""
+Run checkpoints for resuming interrupted runs
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from tool_params.tool_definitions import TestScenario, ValidationResult
+from .jsonl_results import JsonlResultWriter, read_jsonl_results
+
+
+class RunCheckpoint:
+    """
+    On-disk checkpoint for a single run
+    
+    A checkpoint lives in `<base_dir>/<run_id>/` and holds:
+    - manifest.json: run id, strategy/suite/runner configuration and scenario content hashes
+    - results.jsonl: every completed result, appended as it finishes
+    
+    Results are keyed by (scenario content hash, trial), so a resumed run only
+    executes the jobs that have no result yet, and a scenario whose content changed
+    since the checkpoint was written is run again rather than reusing stale results.
+    
+    Once a run's results are saved, discard() removes its checkpoint; only
+    interrupted or failed runs leave one behind.
+    """
+    
+    MANIFEST_FILE = "manifest.json"
+    RESULTS_FILE = "results.jsonl"
+    
+    def __init__(self, base_dir: str, run_id: str, manifest: Dict[str, Any]):
+        self.base_dir = base_dir
+        self.run_id = run_id
+        self.manifest = manifest
+        self.directory = os.path.join(base_dir, run_id)
+        self._writer: Optional[JsonlResultWriter] = None
+    
+    @classmethod
+    def create(cls, base_dir: str, config: Dict[str, Any],
+               scenarios: List[TestScenario]) -> "RunCheckpoint":
+        """
+        Start a new checkpoint
+        
+        Args:
+            base_dir: Directory holding all checkpoints
+            config: Everything needed to recreate the run (strategy, suite and runner settings)
+            scenarios: The scenarios the run will execute
+        """
+        import uuid
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        manifest = {
+            "run_id": run_id,
+            "created": datetime.now().isoformat(),
+            "status": "running",
+            "config": config,
+            "scenarios": [{"name": s.name, "hash": s.content_hash()} for s in scenarios]
+        }
+        
+        checkpoint = cls(base_dir, run_id, manifest)
+        os.makedirs(checkpoint.directory, exist_ok=True)
+        checkpoint._save_manifest()
+        return checkpoint
+    
+    @classmethod
+    def load(cls, base_dir: str, run_id: str) -> "RunCheckpoint":
+        """Load an existing checkpoint by run id"""
+        manifest_path = os.path.join(base_dir, run_id, cls.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No checkpoint found for run '{run_id}' in {base_dir}")
+        
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        
+        return cls(base_dir, run_id, manifest)
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self.manifest.get("config", {})
+    
+    @property
+    def results_path(self) -> str:
+        return os.path.join(self.directory, self.RESULTS_FILE)
+    
+    def completed_results(self) -> List[ValidationResult]:
+        """Results already recorded for this run, in the order they finished"""
+        if not os.path.exists(self.results_path):
+            return []
+        return list(read_jsonl_results(self.results_path))
+    
+    def changed_scenarios(self, scenarios: List[TestScenario]) -> List[str]:
+        """Names of scenarios whose content no longer matches the checkpoint"""
+        recorded = {entry["hash"] for entry in self.manifest.get("scenarios", [])}
+        return [s.name for s in scenarios if s.content_hash() not in recorded]
+    
+    def record(self, result: ValidationResult) -> None:
+        """Append a completed result to the checkpoint"""
+        if self._writer is None:
+            self._writer = JsonlResultWriter(self.results_path, metadata={"run_id": self.run_id}).open()
+        self._writer.write(result)
+    
+    def close(self, status: Optional[str] = None) -> None:
+        """Flush recorded results and optionally update the run status"""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        
+        if status:
+            self.manifest["status"] = status
+            self.manifest["updated"] = datetime.now().isoformat()
+            self._save_manifest()
+    
+    def discard(self) -> None:
+        """Delete the checkpoint, once the run's results are saved elsewhere"""
+        import shutil
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        # Drop the checkpoints directory too when this was the last one in it
+        try:
+            os.rmdir(self.base_dir)
+        except OSError:
+            pass
+    
+    def _save_manifest(self) -> None:
+        path = os.path.join(self.directory, self.MANIFEST_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,183 @@
+"""
+Streaming JSONL result files
+
+A JSONL result file holds one JSON object per line:
+- a "header" record with run metadata,
+- one "result" record per ValidationResult, appended as each scenario finishes,
+- a "trailer" record with the final analysis, written when the run completes.
+
+A crashed run still leaves every flushed result on disk. Readers treat a
+missing trailer or a truncated final line as an incomplete run.
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Any, Iterator, List, Optional
+
+from tool_params.tool_definitions import ValidationResult
+
+
+class JsonlResultWriter:
+    """
+    Appends results to a JSONL file as they complete
+    
+    write() only serializes the record into an in-memory batch, so it is cheap
+    enough to call from an event loop. A background thread writes and fsyncs each
+    batch once `flush_every` records are pending, and at least every
+    `flush_interval_s` seconds, so at most that much work is lost if the process dies.
+    """
+    
+    def __init__(self, filepath: str, metadata: Optional[Dict[str, Any]] = None,
+                 flush_every: int = 50, flush_interval_s: float = 1.0):
+        self.filepath = filepath
+        self.metadata = metadata or {}
+        self.flush_every = flush_every
+        self.flush_interval_s = flush_interval_s
+        self.results_written = 0
+        
+        self._file = None
+        self._batch: List[str] = []
+        self._lock = threading.Lock()  # Guards the batch
+        self._io_lock = threading.Lock()  # Keeps batches in order on disk
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+    
+    def open(self) -> "JsonlResultWriter":
+        """Create the file and write the header record"""
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._file = open(self.filepath, 'a', encoding='utf-8')
+        self._write_record({"type": "header", **self.metadata})
+        
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+        return self
+    
+    def write(self, result: ValidationResult, index: Optional[int] = None) -> None:
+        """
+        Append a result record
+        
+        Args:
+            result: The validation result to append
+            index: Optional position of the result in the run, so readers can restore
+                   submission order when results complete out of order
+        """
+        record = {"type": "result", **result.to_dict()}
+        if index is not None:
+            record["index"] = index
+        line = self._serialize(record)
+        
+        with self._lock:
+            self._batch.append(line)
+            self.results_written += 1
+            if len(self._batch) >= self.flush_every:
+                self._wake.set()
+    
+    def close(self, analysis: Optional[Dict[str, Any]] = None) -> str:
+        """Write the trailer record, flush and close the file"""
+        self._stop.set()
+        self._wake.set()
+        if self._flusher:
+            self._flusher.join()
+        
+        with self._io_lock:
+            if self._file is None:
+                return self.filepath
+            
+            self._write_record({
+                "type": "trailer",
+                "total_results": self.results_written,
+                "analysis": analysis
+            })
+            self._file.close()
+            self._file = None
+        
+        return self.filepath
+    
+    def flush(self) -> None:
+        """Write and fsync pending records"""
+        with self._io_lock:
+            with self._lock:
+                lines, self._batch = self._batch, []
+            if self._file is None or not lines:
+                return
+            self._file.writelines(lines)
+            self._sync()
+    
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def _flush_periodically(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self.flush()
+    
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        """Write a record straight to disk, after any batched results"""
+        with self._lock:
+            lines, self._batch = self._batch, []
+        self._file.writelines(lines + [self._serialize(record)])
+        self._sync()
+    
+    @staticmethod
+    def _serialize(record: Dict[str, Any]) -> str:
+        return json.dumps(record, default=str) + "\n"
+    
+    def __enter__(self) -> "JsonlResultWriter":
+        return self.open()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def iter_jsonl_records(filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw records from a JSONL result file
+    
+    A truncated final line (left by a crash mid-write) is skipped.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def read_jsonl_results(filepath: str) -> Iterator[ValidationResult]:
+    """Stream ValidationResult objects from a JSONL result file"""
+    for record in iter_jsonl_records(filepath):
+        if record.get("type") == "result":
+            yield ValidationResult.from_dict(record)
+
+
+def read_jsonl_summary(filepath: str) -> Dict[str, Any]:
+    """
+    Read the header and trailer of a JSONL result file without keeping results
+    
+    Returns:
+        Dict with "metadata" (header), "analysis" (None if the run didn't finish),
+        "total_results" and "complete"
+    """
+    summary = {"metadata": {}, "analysis": None, "total_results": 0, "complete": False}
+    
+    for record in iter_jsonl_records(filepath):
+        record_type = record.get("type")
+        if record_type == "header":
+            summary["metadata"] = {k: v for k, v in record.items() if k != "type"}
+        elif record_type == "result":
+            summary["total_results"] += 1
+        elif record_type == "trailer":
+            summary["analysis"] = record.get("analysis")
+            summary["complete"] = True
+    
+    return summary
@@ -0,0 +1,46 @@
+"""
+Loading saved result files back into ValidationResult objects
+"""
+
+import json
+from typing import Dict, Any, List, Tuple
+
+from tool_params.tool_definitions import ValidationResult
+from .jsonl_results import iter_jsonl_records, read_jsonl_results
+
+
+def load_result_file(filepath: str) -> Tuple[Dict[str, Any], List[ValidationResult]]:
+    """
+    Load the results written by ModelPerformanceTester.save_results()
+    
+    Handles JSON files with flat or trial-nested detailed_results, and streamed
+    JSONL files (including ones from interrupted runs).
+    
+    Returns:
+        (run metadata, results)
+    """
+    if filepath.endswith(".jsonl"):
+        header = next(iter_jsonl_records(filepath), {})
+        metadata = {k: v for k, v in header.items() if k != "type"}
+        return metadata, list(read_jsonl_results(filepath))
+    
+    with open(filepath, 'r') as f:
+        data = json.load(f)
+    
+    if "detailed_results" not in data:
+        raise ValueError(f"{filepath} is not a results file (no detailed_results)")
+    
+    results = []
+    for entry in data["detailed_results"]:
+        if "trials" in entry:
+            # Repeated trials are nested under their scenario
+            for trial in entry["trials"]:
+                results.append(ValidationResult.from_dict({
+                    **trial,
+                    "scenario_name": entry["scenario_name"],
+                    "expected_tool_calls": entry["expected_tool_calls"]
+                }))
+        else:
+            results.append(ValidationResult.from_dict(entry))
+    
+    return data.get("metadata", {}), results
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup
+"""
+
+import os
+import sys
+
+# Modules import each other from the project root, as they do when run through main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
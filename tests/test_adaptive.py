@@ -0,0 +1,78 @@
+"""
+Tests for the adaptive sampler's budgets
+"""
+
+import os
+import random
+
+import pytest
+
+from main import ModelPerformanceTester
+from analyzers.combined_analyzer import CombinedAnalyzer
+from reasoning_strategies.base_strategy import BaseReasoningStrategy
+from runners.adaptive import AdaptiveSampler
+from test_suites.base_test_suite import BaseTestSuite
+from tool_params.tool_definitions import ExecutionResult
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+class NoisyStrategy(BaseReasoningStrategy):
+    """Answers instantly with a random reported latency"""
+    
+    def __init__(self):
+        super().__init__(name="Noisy")
+        self.rng = random.Random(0)
+    
+    def execute_scenario(self, scenario) -> ExecutionResult:
+        return ExecutionResult(success=True, latency_ms=self.rng.lognormvariate(4, 1), actual_tool_calls=[],
+                               tokens_used={"total_tokens": 10})
+    
+    def get_capabilities(self):
+        return {"name": self.name}
+
+
+def make_sampler(**kwargs) -> AdaptiveSampler:
+    tester = ModelPerformanceTester(
+        reasoning_strategy=NoisyStrategy(),
+        test_suite=BaseTestSuite(config_file=CONFIG_FILE),
+        analyzer=CombinedAnalyzer(verbose=False),
+        verbose=False
+    )
+    return AdaptiveSampler(tester, min_trials=3, bootstrap_samples=50, seed=1, verbose=False, **kwargs)
+
+
+def test_request_budget_caps_the_run():
+    sampler = make_sampler(max_requests=7)
+    
+    sampler.run()
+    
+    assert sampler.tester.result_count == 7
+    assert sampler.tester.run_info["stop_reason"] == "request_budget"
+
+
+def test_token_budget_stops_before_the_next_round():
+    sampler = make_sampler(max_tokens=1)
+    scenarios = len(sampler.tester.test_suite.get_scenarios())
+    
+    sampler.run()
+    
+    assert sampler.tester.result_count == 3 * scenarios
+    assert sampler.tester.run_info["stop_reason"] == "token_budget"
+    assert sampler.tester.run_info["rounds"] == 1
+
+
+def test_spent_time_budget_dispatches_nothing():
+    sampler = make_sampler(max_duration_s=0)
+    
+    sampler.run()
+    
+    assert sampler.tester.result_count == 0
+    assert sampler.tester.run_info["stop_reason"] == "time_budget"
+    assert sampler.tester.run_info["rounds"] == 0
+
+
+def test_empty_request_budget_is_rejected():
+    with pytest.raises(ValueError):
+        make_sampler(max_requests=0)
@@ -0,0 +1,78 @@
+"""
+Tests for the asyncio runner and the default execute_scenario_async
+"""
+
+import asyncio
+import os
+
+from main import ModelPerformanceTester
+from analyzers.combined_analyzer import CombinedAnalyzer
+from reasoning_strategies.base_strategy import BaseReasoningStrategy
+from test_suites.base_test_suite import BaseTestSuite
+from tool_params.tool_definitions import ExecutionResult
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+class AsyncSleepStrategy(BaseReasoningStrategy):
+    """Waits on the event loop and records the most requests it saw in flight at once"""
+    
+    def __init__(self):
+        super().__init__(name="AsyncSleep")
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    def execute_scenario(self, scenario) -> ExecutionResult:
+        raise AssertionError("the async runner should not call the blocking path")
+    
+    async def execute_scenario_async(self, scenario) -> ExecutionResult:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        return ExecutionResult(success=True, latency_ms=50.0, actual_tool_calls=[])
+    
+    def get_capabilities(self):
+        return {"name": self.name}
+
+
+class BlockingStrategy(BaseReasoningStrategy):
+    def __init__(self):
+        super().__init__(name="Blocking")
+    
+    def execute_scenario(self, scenario) -> ExecutionResult:
+        return ExecutionResult(success=True, latency_ms=10.0, actual_tool_calls=[])
+    
+    def get_capabilities(self):
+        return {"name": self.name}
+
+
+def make_tester(strategy: BaseReasoningStrategy, concurrency: int) -> ModelPerformanceTester:
+    return ModelPerformanceTester(
+        reasoning_strategy=strategy,
+        test_suite=BaseTestSuite(config_file=CONFIG_FILE),
+        analyzer=CombinedAnalyzer(verbose=False),
+        verbose=False,
+        concurrency=concurrency
+    )
+
+
+def test_async_run_bounds_in_flight_and_keeps_scenario_order():
+    strategy = AsyncSleepStrategy()
+    tester = make_tester(strategy, concurrency=2)
+    
+    results = asyncio.run(tester.run_tests_async())
+    
+    assert [r.scenario_name for r in results] == [s.name for s in tester.test_suite.get_scenarios()]
+    assert strategy.max_in_flight == 2
+    assert max(r.queue_wait_ms for r in results) >= 40
+
+
+def test_blocking_strategy_runs_in_the_executor():
+    tester = make_tester(BlockingStrategy(), concurrency=2)
+    
+    results = asyncio.run(tester.run_tests_async())
+    
+    assert len(results) == len(tester.test_suite.get_scenarios())
+    assert all(r.latency_ms == 10.0 for r in results)
@@ -0,0 +1,54 @@
+"""
+Tests for bootstrap percentile confidence intervals
+"""
+
+import random
+
+from analyzers.combined_analyzer import CombinedAnalyzer
+
+
+def interval(data, percentile=0.95, seed=7, **kwargs):
+    return CombinedAnalyzer(verbose=False).bootstrap_percentile_ci(data, percentile, rng=random.Random(seed), **kwargs)
+
+
+def test_empty_data_gives_a_zero_interval():
+    assert interval([]) == {"estimate": 0.0, "low": 0.0, "high": 0.0, "width": 0.0}
+
+
+def test_constant_data_gives_a_zero_width_interval():
+    ci = interval([120.0] * 50)
+    
+    assert ci == {"estimate": 120.0, "low": 120.0, "high": 120.0, "width": 0.0}
+
+
+def test_interval_brackets_the_estimate():
+    rng = random.Random(1)
+    data = [rng.lognormvariate(4, 0.5) for _ in range(200)]
+    
+    ci = interval(data)
+    
+    assert ci["low"] <= ci["estimate"] <= ci["high"]
+    assert ci["width"] == round(ci["high"] - ci["low"], 2)
+
+
+def test_same_seed_gives_the_same_interval():
+    data = [float(x) for x in range(1, 101)]
+    
+    assert interval(data, seed=3) == interval(data, seed=3)
+
+
+def test_interval_narrows_with_more_samples():
+    rng = random.Random(2)
+    population = [rng.gauss(100, 20) for _ in range(1000)]
+    
+    narrow = interval(population, percentile=0.5, samples=200)
+    wide = interval(population[:20], percentile=0.5, samples=200)
+    
+    assert narrow["width"] < wide["width"]
+
+
+def test_lower_confidence_gives_a_narrower_interval():
+    rng = random.Random(4)
+    data = [rng.gauss(100, 20) for _ in range(300)]
+    
+    assert interval(data, confidence=0.5)["width"] < interval(data, confidence=0.99)["width"]
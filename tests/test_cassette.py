@@ -0,0 +1,58 @@
+"""
+Tests for recording and replaying responses through a cassette
+"""
+
+import threading
+
+import pytest
+
+from storage.cassette import ResponseCassette, RECORD, REPLAY
+from tool_params.tool_definitions import ExecutionResult
+
+
+def response(latency_ms: float, success: bool = True) -> ExecutionResult:
+    return ExecutionResult(success=success, latency_ms=latency_ms,
+                           actual_tool_calls=[{"name": "get_weather", "arguments": {}}])
+
+
+def test_recordings_replay_in_order_after_close(tmp_path):
+    path = str(tmp_path / "run.cassette")
+    cassette = ResponseCassette(path, mode=RECORD)
+    for latency_ms in (10.0, 20.0, 30.0):
+        cassette.record("weather", {"model": "o3"}, response(latency_ms))
+    cassette.record("weather", {"model": "o3"}, response(99.0, success=False))
+    cassette.close()
+    
+    replay = ResponseCassette(path, mode=REPLAY)
+    latencies = [replay.replay("weather").latency_ms for _ in range(4)]
+    
+    # Failed responses aren't recorded, and replays cycle once recordings run out
+    assert latencies == [10.0, 20.0, 30.0, 10.0]
+    assert replay.replay("unknown") is None
+    replay.close()
+
+
+def test_concurrent_recordings_all_reach_the_file(tmp_path):
+    path = str(tmp_path / "run.cassette")
+    cassette = ResponseCassette(path, mode=RECORD)
+    
+    def record_many(key: str):
+        for i in range(50):
+            cassette.record(key, b'{"model": "o3"}', response(float(i)))
+    
+    threads = [threading.Thread(target=record_many, args=(f"key-{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cassette.close()
+    
+    replay = ResponseCassette(path, mode=REPLAY)
+    for n in range(4):
+        assert [replay.replay(f"key-{n}").latency_ms for _ in range(50)] == [float(i) for i in range(50)]
+    replay.close()
+
+
+def test_replaying_a_missing_cassette_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ResponseCassette(str(tmp_path / "missing.cassette"), mode=REPLAY)
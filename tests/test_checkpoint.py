@@ -0,0 +1,127 @@
+"""
+Tests for run checkpoints and resuming interrupted runs
+"""
+
+import os
+from collections import Counter
+
+from main import ModelPerformanceTester
+from analyzers.combined_analyzer import CombinedAnalyzer
+from reasoning_strategies.base_strategy import BaseReasoningStrategy
+from storage.checkpoint import RunCheckpoint
+from storage.jsonl_results import read_jsonl_results, read_jsonl_summary
+from test_suites.base_test_suite import BaseTestSuite
+from tool_params.tool_definitions import ExecutionResult
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+class CountingStrategy(BaseReasoningStrategy):
+    """Answers instantly and counts how often each scenario was executed"""
+    
+    def __init__(self):
+        super().__init__(name="Counting")
+        self.calls = Counter()
+    
+    def execute_scenario(self, scenario) -> ExecutionResult:
+        self.calls[scenario.name] += 1
+        return ExecutionResult(success=True, latency_ms=10.0, actual_tool_calls=[])
+    
+    def get_capabilities(self):
+        return {"name": self.name}
+
+
+def make_tester(strategy: CountingStrategy, trials: int) -> ModelPerformanceTester:
+    return ModelPerformanceTester(
+        reasoning_strategy=strategy,
+        test_suite=BaseTestSuite(config_file=CONFIG_FILE),
+        analyzer=CombinedAnalyzer(verbose=False),
+        verbose=False,
+        trials=trials
+    )
+
+
+def interrupted_run(base_dir: str, trials: int, completed_trials: int) -> RunCheckpoint:
+    """A checkpointed run stopped after its first `completed_trials` trials"""
+    tester = make_tester(CountingStrategy(), completed_trials)
+    scenarios = tester.test_suite.get_scenarios()
+    checkpoint = RunCheckpoint.create(base_dir, config={"trials": trials}, scenarios=scenarios)
+    tester.enable_checkpoint(checkpoint)
+    tester.run_tests()
+    checkpoint.close(status="interrupted")
+    return checkpoint
+
+
+def test_resume_runs_only_missing_jobs(tmp_path):
+    base_dir = str(tmp_path / "checkpoints")
+    run_id = interrupted_run(base_dir, trials=3, completed_trials=1).run_id
+    
+    checkpoint = RunCheckpoint.load(base_dir, run_id)
+    assert checkpoint.manifest["status"] == "interrupted"
+    assert checkpoint.config == {"trials": 3}
+    
+    strategy = CountingStrategy()
+    tester = make_tester(strategy, trials=3)
+    tester.enable_checkpoint(checkpoint, resume=True)
+    results = tester.run_tests()
+    
+    scenarios = tester.test_suite.get_scenarios()
+    assert strategy.calls == {scenario.name: 2 for scenario in scenarios}
+    assert len(results) == 3 * len(scenarios)
+    assert sorted((r.scenario_hash, r.trial) for r in results) == sorted(
+        (scenario.content_hash(), trial) for scenario in scenarios for trial in (1, 2, 3)
+    )
+
+
+def test_resume_records_new_results_to_the_checkpoint(tmp_path):
+    base_dir = str(tmp_path / "checkpoints")
+    run_id = interrupted_run(base_dir, trials=2, completed_trials=1).run_id
+    
+    checkpoint = RunCheckpoint.load(base_dir, run_id)
+    tester = make_tester(CountingStrategy(), trials=2)
+    tester.enable_checkpoint(checkpoint, resume=True)
+    tester.run_tests()
+    checkpoint.close(status="complete")
+    
+    # A second resume finds nothing left to run
+    strategy = CountingStrategy()
+    tester = make_tester(strategy, trials=2)
+    tester.enable_checkpoint(RunCheckpoint.load(base_dir, run_id), resume=True)
+    tester.run_tests()
+    
+    assert not strategy.calls
+    assert len(tester.results) == 2 * len(tester.test_suite.get_scenarios())
+
+
+def test_resumed_jsonl_stream_includes_completed_results(tmp_path):
+    base_dir = str(tmp_path / "checkpoints")
+    run_id = interrupted_run(base_dir, trials=2, completed_trials=1).run_id
+    
+    tester = make_tester(CountingStrategy(), trials=2)
+    path = tester.stream_results_to(str(tmp_path))
+    tester.enable_checkpoint(RunCheckpoint.load(base_dir, run_id), resume=True)
+    tester.run_tests()
+    tester.save_results(str(tmp_path))
+    
+    expected = 2 * len(tester.test_suite.get_scenarios())
+    results = list(read_jsonl_results(path))
+    assert len(results) == expected
+    assert sorted(r.trial for r in results) == [1] * (expected // 2) + [2] * (expected // 2)
+    assert read_jsonl_summary(path)["analysis"]["metadata"]["total_results"] == expected
+
+
+def test_changed_scenarios_are_reported(tmp_path):
+    scenarios = BaseTestSuite(config_file=CONFIG_FILE).get_scenarios()
+    checkpoint = RunCheckpoint.create(str(tmp_path), config={}, scenarios=scenarios[1:])
+    
+    assert checkpoint.changed_scenarios(scenarios) == [scenarios[0].name]
+
+
+def test_discard_removes_the_checkpoint(tmp_path):
+    base_dir = str(tmp_path / "checkpoints")
+    checkpoint = interrupted_run(base_dir, trials=1, completed_trials=1)
+    
+    checkpoint.discard()
+    
+    assert not os.path.exists(base_dir)
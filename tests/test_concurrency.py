@@ -0,0 +1,77 @@
+"""
+Tests for bounded concurrent scenario execution
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from main import ModelPerformanceTester
+from analyzers.combined_analyzer import CombinedAnalyzer
+from reasoning_strategies.base_strategy import BaseReasoningStrategy
+from test_suites.base_test_suite import BaseTestSuite
+from tool_params.tool_definitions import ExecutionResult
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+class SlowStrategy(BaseReasoningStrategy):
+    """Sleeps for every request and records the most requests it saw in flight at once"""
+    
+    def __init__(self, delay_s: float = 0.05):
+        super().__init__(name="Slow")
+        self.delay_s = delay_s
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+    
+    def execute_scenario(self, scenario) -> ExecutionResult:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay_s)
+        with self._lock:
+            self.in_flight -= 1
+        return ExecutionResult(success=True, latency_ms=self.delay_s * 1000, actual_tool_calls=[])
+    
+    def get_capabilities(self):
+        return {"name": self.name}
+
+
+def make_tester(strategy: BaseReasoningStrategy, concurrency: int) -> ModelPerformanceTester:
+    return ModelPerformanceTester(
+        reasoning_strategy=strategy,
+        test_suite=BaseTestSuite(config_file=CONFIG_FILE),
+        analyzer=CombinedAnalyzer(verbose=False),
+        verbose=False,
+        concurrency=concurrency
+    )
+
+
+def test_concurrent_run_returns_results_in_scenario_order():
+    tester = make_tester(SlowStrategy(), concurrency=3)
+    
+    results = tester.run_tests()
+    
+    assert [r.scenario_name for r in results] == [s.name for s in tester.test_suite.get_scenarios()]
+
+
+def test_concurrency_bounds_requests_in_flight():
+    strategy = SlowStrategy()
+    tester = make_tester(strategy, concurrency=2)
+    
+    results = tester.run_tests()
+    
+    assert len(results) > 2
+    assert strategy.max_in_flight == 2
+    # Whatever did not fit in the pool waited for a free worker, outside its service time
+    assert max(r.queue_wait_ms for r in results) >= 40
+    assert all(r.latency_ms == 50.0 for r in results)
+
+
+def test_concurrency_below_one_is_rejected():
+    with pytest.raises(ValueError):
+        make_tester(SlowStrategy(), concurrency=0)
@@ -0,0 +1,47 @@
+"""
+Tests for the coordinator's worker handshake and shard bookkeeping
+"""
+
+import json
+import socket
+
+from runners import distributed
+from runners.distributed import DistributedCoordinator, ShardPositions
+
+
+def listening_socket() -> socket.socket:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(4)
+    return server
+
+
+def test_peers_without_a_hello_are_dropped(monkeypatch):
+    monkeypatch.setattr(distributed, "HELLO_TIMEOUT_S", 0.2)
+    coordinator = DistributedCoordinator(tester=None, config={}, num_workers=1, local_workers=0,
+                                         connect_timeout=10, verbose=False)
+    server = listening_socket()
+    address = server.getsockname()
+    
+    silent = socket.create_connection(address)
+    garbled = socket.create_connection(address)
+    garbled.sendall(b"GET / HTTP/1.1\r\n\r\n")
+    worker = socket.create_connection(address)
+    worker.sendall((json.dumps({"type": "hello", "worker": "w1"}) + "\n").encode("utf-8"))
+    try:
+        connections = coordinator._accept_workers(server)
+        
+        assert [name for name, _ in connections] == ["w1"]
+        # The accepted worker's socket blocks again once the handshake is done
+        assert connections[0][1].sock.gettimeout() is None
+    finally:
+        for _, connection in coordinator._connections:
+            connection.close()
+        for sock in (silent, garbled, worker, server):
+            sock.close()
+
+
+def test_shard_positions_count_the_shard_scenarios():
+    hashes = ["a", "b", "c", "a", "d"]
+    
+    assert [ShardPositions(hashes, shard, 2).count for shard in range(2)] == [3, 2]
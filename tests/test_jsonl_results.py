@@ -0,0 +1,126 @@
+"""
+Tests for streamed JSONL results and ValidationResult serialization
+"""
+
+import os
+
+from main import ModelPerformanceTester
+from analyzers.combined_analyzer import CombinedAnalyzer
+from reasoning_strategies.base_strategy import BaseReasoningStrategy
+from storage.jsonl_results import JsonlResultWriter, read_jsonl_results, read_jsonl_summary
+from test_suites.base_test_suite import BaseTestSuite
+from tool_params.tool_definitions import ExecutionResult, ValidationResult
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+class InstantStrategy(BaseReasoningStrategy):
+    def __init__(self):
+        super().__init__(name="Instant")
+    
+    def execute_scenario(self, scenario) -> ExecutionResult:
+        return ExecutionResult(success=True, latency_ms=10.0, actual_tool_calls=[],
+                               tokens_used={"total_tokens": 30})
+    
+    def get_capabilities(self):
+        return {"name": self.name}
+
+
+def make_result(name: str = "Weather", latency_ms: float = 100.0, trial: int = 1,
+                success: bool = True) -> ValidationResult:
+    return ValidationResult(
+        scenario_name=name,
+        success=success,
+        latency_ms=latency_ms,
+        actual_tool_calls=[{"name": "get_weather", "arguments": {"location": "Paris"}}],
+        expected_tool_calls=[{"name": "get_weather"}],
+        validation_details={"tool_match": success},
+        error=None if success else "wrong tool",
+        tokens_used={"prompt_tokens": 50, "completion_tokens": 10, "total_tokens": 60},
+        metadata={"status_code": 200},
+        queue_wait_ms=1.5,
+        trial=trial,
+        scenario_hash="abc123",
+        throttle_wait_ms=0.0,
+        retries=1
+    )
+
+
+def write_results(path: str, results) -> None:
+    with JsonlResultWriter(path, metadata={"reasoning_strategy": "Test", "test_suite": "Suite"}) as writer:
+        for i, result in enumerate(results):
+            writer.write(result, index=i)
+
+
+def test_from_dict_round_trips_to_dict():
+    result = make_result()
+    
+    assert ValidationResult.from_dict(result.to_dict()) == result
+
+
+def test_from_dict_ignores_unknown_keys():
+    data = {**make_result().to_dict(), "type": "result", "index": 3, "added_later": True}
+    
+    assert ValidationResult.from_dict(data) == make_result()
+
+
+def test_results_round_trip_through_jsonl(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    results = [make_result(trial=1), make_result(latency_ms=250.0, trial=2, success=False)]
+    write_results(path, results)
+    
+    assert list(read_jsonl_results(path)) == results
+
+
+def test_analyze_jsonl_skips_truncated_last_line(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    write_results(path, [make_result(latency_ms=100.0, trial=1), make_result(latency_ms=300.0, trial=2),
+                         make_result(latency_ms=900.0, trial=3)])
+    # A crash mid-write leaves half of the last record and no analysis trailer
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:-2])
+        f.write(lines[-2][:len(lines[-2]) // 2])
+    
+    report = CombinedAnalyzer(verbose=False).analyze_jsonl(path)
+    
+    assert report["metadata"]["total_results"] == 2
+    assert report["metadata"]["strategy_name"] == "Test"
+    assert report["latency"]["average_ms"] == 200.0
+    
+    summary = read_jsonl_summary(path)
+    assert summary["total_results"] == 2
+    assert summary["complete"] is False
+    assert summary["analysis"] is None
+
+
+def test_analyze_jsonl_of_file_without_results(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    write_results(path, [])
+    
+    assert CombinedAnalyzer(verbose=False).analyze_jsonl(path) == {"error": "No results to analyze"}
+
+
+def test_streamed_run_keeps_results_on_disk_only(tmp_path):
+    tester = ModelPerformanceTester(
+        reasoning_strategy=InstantStrategy(),
+        test_suite=BaseTestSuite(config_file=CONFIG_FILE),
+        analyzer=CombinedAnalyzer(verbose=False),
+        verbose=False,
+        concurrency=3,
+        trials=2
+    )
+    path = tester.stream_results_to(str(tmp_path))
+    tester.run_tests()
+    expected = 2 * len(tester.test_suite.get_scenarios())
+    
+    assert tester.results == []
+    assert tester.result_count == expected
+    assert tester.total_tokens == 30 * expected
+    assert tester.analyze_results()["metadata"]["total_results"] == expected
+    
+    assert tester.save_results(str(tmp_path)) == path
+    assert len(list(read_jsonl_results(path))) == expected
+    assert read_jsonl_summary(path)["complete"] is True
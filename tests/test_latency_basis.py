@@ -0,0 +1,44 @@
+"""
+Tests for the headline latency of closed-loop versus open-loop (scheduled) runs
+"""
+
+from analyzers.combined_analyzer import CombinedAnalyzer
+from tool_params.tool_definitions import ValidationResult
+
+
+def make_result(latency_ms: float, queue_wait_ms: float, scheduled: bool) -> ValidationResult:
+    return ValidationResult(
+        scenario_name="Weather",
+        success=True,
+        latency_ms=latency_ms,
+        actual_tool_calls=[],
+        expected_tool_calls=[],
+        validation_details={},
+        queue_wait_ms=queue_wait_ms,
+        scheduled=scheduled
+    )
+
+
+def latency_report(scheduled: bool):
+    results = [make_result(100.0, 0.0, scheduled), make_result(100.0, 300.0, scheduled)]
+    return CombinedAnalyzer(verbose=False).analyze(results, "Test", "Suite")["latency"]
+
+
+def test_closed_loop_headline_is_service_time():
+    latency = latency_report(scheduled=False)
+    
+    assert latency["basis"] == "service_time"
+    assert latency["average_ms"] == 100.0
+    assert latency["response_time"]["average_ms"] == 250.0
+    assert "service_time" not in latency
+
+
+def test_open_loop_headline_is_response_time_from_the_schedule():
+    latency = latency_report(scheduled=True)
+    
+    assert latency["basis"] == "response_time"
+    assert latency["average_ms"] == 250.0
+    assert latency["percentiles"]["p50"] == 250.0
+    assert latency["max_ms"] == 400.0
+    assert latency["service_time"]["average_ms"] == 100.0
+    assert "response_time" not in latency
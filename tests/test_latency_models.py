@@ -0,0 +1,60 @@
+"""
+Tests for fitting mock server latency to saved results
+"""
+
+import json
+
+import pytest
+
+from mock_server.latency import create_latency_model, load_latencies
+from storage.jsonl_results import JsonlResultWriter
+from tool_params.tool_definitions import ValidationResult
+
+
+def write_run(path: str, strategy: str, latencies) -> str:
+    with JsonlResultWriter(path, metadata={"reasoning_strategy": strategy, "test_suite": "Suite"}) as writer:
+        for i, latency_ms in enumerate(latencies):
+            writer.write(ValidationResult(scenario_name="Weather", success=True, latency_ms=latency_ms,
+                                          actual_tool_calls=[], expected_tool_calls=[],
+                                          validation_details={}), index=i)
+    return path
+
+
+def write_legacy(path: str, entries) -> str:
+    with open(path, "w") as f:
+        json.dump({"timestamp": "2025-06-17T15:56:26", "model": "gpt-4o-mini", "results": entries}, f)
+    return path
+
+
+def test_legacy_results_files_are_read(tmp_path):
+    path = write_legacy(str(tmp_path / "tool_call_latency_results.json"), [
+        {"scenario": "Weather Query", "success": True, "latency_ms": 410.0},
+        {"scenario": "Math", "success": False, "latency_ms": 90.0, "error": "Error code: 401"},
+    ])
+    
+    assert load_latencies([path]) == [410.0]
+
+
+def test_only_network_backed_strategies_are_fitted(tmp_path, capsys):
+    api = write_run(str(tmp_path / "api.jsonl"), "OpenAI-gpt-4o-mini", [300.0, 500.0])
+    custom = write_run(str(tmp_path / "custom.jsonl"), "Custom", [60.0])
+    
+    assert load_latencies([api, custom]) == [300.0, 500.0]
+    assert "custom.jsonl: strategy Custom" in capsys.readouterr().out
+    assert load_latencies([api, custom], strategies=["Custom"]) == [60.0]
+
+
+def test_files_without_samples_are_reported(tmp_path, capsys):
+    failed = write_legacy(str(tmp_path / "failed.json"), [
+        {"scenario": "Weather Query", "success": False, "latency_ms": 340.0, "error": "Error code: 401"},
+    ])
+    other = str(tmp_path / "other.json")
+    with open(other, "w") as f:
+        json.dump({"summary": {}}, f)
+    
+    with pytest.raises(ValueError):
+        create_latency_model("empirical", [failed, other])
+    
+    out = capsys.readouterr().out
+    assert "failed.json: no successful requests" in out
+    assert "other.json" in out
@@ -0,0 +1,107 @@
+"""
+Tests for the RPM/TPM rate limiter and its 429/503 backoff
+"""
+
+import random
+
+import pytest
+
+from scheduling import rate_limiter
+from scheduling.rate_limiter import RateLimiter, TokenBucket
+from tool_params.tool_definitions import ExecutionResult
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake)
+    return fake
+
+
+def failed(status_code: int, retry_after_s=None) -> ExecutionResult:
+    metadata = {"status_code": status_code}
+    if retry_after_s is not None:
+        metadata["retry_after_s"] = retry_after_s
+    return ExecutionResult(success=False, latency_ms=5.0, actual_tool_calls=None,
+                           error="rejected", metadata=metadata)
+
+
+def test_bucket_serves_its_capacity_then_queues_callers(clock):
+    bucket = TokenBucket(capacity=2, refill_per_s=1)
+    
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    # Each later caller waits one more refill interval, in the order they reserved
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(capacity=2, refill_per_s=4)
+    bucket.reserve(2)
+    
+    clock.now += 0.25
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(0.25)
+    
+    # A long idle period refills no further than capacity
+    clock.now += 60
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve(1) > 0
+
+
+def test_rpm_limit_spaces_requests(clock):
+    limiter = RateLimiter(rpm=120)
+    
+    # Capacity is one second's worth: 2 requests, then one every 0.5s
+    waits = [limiter._reserve(100) for _ in range(4)]
+    
+    assert waits == pytest.approx([0.0, 0.0, 0.5, 1.0])
+
+
+def test_settle_returns_overestimated_tokens(clock):
+    limiter = RateLimiter(tpm=6000)
+    limiter._reserve(100)
+    
+    usage = ExecutionResult(success=True, latency_ms=5.0, actual_tool_calls=[],
+                            tokens_used={"total_tokens": 40})
+    limiter.settle(100, usage)
+    
+    # The 60 unused tokens came back: a 60-token request fits, anything more waits
+    assert limiter._reserve(60) == 0.0
+    assert limiter._reserve(10) == pytest.approx(0.1)
+
+
+def test_only_throttled_attempts_are_retried():
+    limiter = RateLimiter(rpm=60, max_retries=2)
+    
+    assert limiter.should_retry(failed(429), attempt=0)
+    assert limiter.should_retry(failed(503), attempt=1)
+    assert not limiter.should_retry(failed(429), attempt=2)
+    assert not limiter.should_retry(failed(500), attempt=0)
+    assert not limiter.should_retry(ExecutionResult(success=True, latency_ms=5.0, actual_tool_calls=[]), attempt=0)
+
+
+def test_backoff_honors_retry_after_up_to_the_cap():
+    limiter = RateLimiter(rpm=60, backoff_max_s=10)
+    
+    assert limiter.backoff_delay(failed(429, retry_after_s=3), attempt=0) == 3.0
+    assert limiter.backoff_delay(failed(429, retry_after_s="120"), attempt=0) == 10.0
+
+
+def test_backoff_uses_full_jitter_within_an_exponential_ceiling(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "random", random.Random(0))
+    limiter = RateLimiter(rpm=60, backoff_base_s=0.5, backoff_max_s=3)
+    
+    for attempt, ceiling in [(0, 0.5), (1, 1.0), (2, 2.0), (3, 3.0), (8, 3.0)]:
+        delays = [limiter.backoff_delay(failed(429), attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling * 0.8
@@ -0,0 +1,26 @@
+"""
+Tests for sending requests over the raw HTTP transport
+"""
+
+import os
+
+from mock_server.server import MockOpenAIServer
+from reasoning_strategies.async_openai_strategy import AsyncOpenAIStrategy
+from test_suites.base_test_suite import BaseTestSuite
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+def test_raw_http_warm_up_never_builds_an_sdk_client():
+    server = MockOpenAIServer(BaseTestSuite(config_file=CONFIG_FILE).get_scenarios())
+    strategy = AsyncOpenAIStrategy(model="mock", api_key="mock", base_url=server.start(), raw_http=True)
+    try:
+        warmed = strategy.warm_up(3)
+    finally:
+        strategy.close()
+        server.stop()
+    
+    assert warmed == 3
+    assert strategy.client is None
+    assert strategy._sync_client is None
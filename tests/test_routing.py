@@ -0,0 +1,176 @@
+"""
+Tests for endpoint selection in EndpointRouter
+"""
+
+import os
+import asyncio
+from collections import Counter
+
+import pytest
+
+from main import ModelPerformanceTester
+from analyzers.combined_analyzer import CombinedAnalyzer
+from mock_server.latency import FixedLatency
+from mock_server.server import MockOpenAIServer
+from reasoning_strategies import routing
+from reasoning_strategies.endpoint_strategy import EndpointStrategy
+from reasoning_strategies.routing import EndpointRouter, EWMA, LEAST_OUTSTANDING
+from test_suites.base_test_suite import BaseTestSuite
+
+ENDPOINTS = ["http://a/v1", "http://b/v1", "http://c/v1"]
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "test_scenarios.json")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(routing.time, "monotonic", fake)
+    return fake
+
+
+def measured(router: EndpointRouter, clock: FakeClock, *averages: float) -> EndpointRouter:
+    """Give each endpoint a fresh moving average"""
+    for endpoint, ewma_ms in zip(router.endpoints, averages):
+        endpoint.ewma_ms = ewma_ms
+        endpoint.updated_at = clock.now
+    return router
+
+
+def test_least_outstanding_picks_the_idlest_endpoint():
+    router = EndpointRouter(ENDPOINTS, LEAST_OUTSTANDING)
+    
+    first = [router.acquire() for _ in range(3)]
+    assert sorted(first) == [0, 1, 2]
+    
+    router.release(1, 50.0, success=True)
+    assert router.acquire() == 1
+
+
+def test_equal_endpoints_share_sequential_load():
+    router = EndpointRouter(ENDPOINTS, LEAST_OUTSTANDING)
+    counts = Counter()
+    
+    for _ in range(30):
+        index = router.acquire()
+        counts[index] += 1
+        router.release(index, 10.0, success=True)
+    
+    assert counts == {0: 10, 1: 10, 2: 10}
+
+
+def test_ewma_measures_every_endpoint_then_prefers_the_fastest():
+    router = EndpointRouter(ENDPOINTS, EWMA)
+    latencies = {0: 80.0, 1: 20.0, 2: 50.0}
+    
+    tried = []
+    for _ in range(3):
+        index = router.acquire()
+        tried.append(index)
+        router.release(index, latencies[index], success=True)
+    assert sorted(tried) == [0, 1, 2]
+    
+    for _ in range(5):
+        index = router.acquire()
+        assert index == 1
+        router.release(index, latencies[index], success=True)
+
+
+def test_ewma_moves_away_from_an_endpoint_that_slows_down(clock):
+    router = measured(EndpointRouter(ENDPOINTS[:2], EWMA, alpha=0.5), clock, 20.0, 40.0)
+    
+    index = router.acquire()
+    assert index == 0
+    router.release(index, 100.0, success=True)
+    
+    assert router.endpoints[0].ewma_ms == 60.0
+    assert router.acquire() == 1
+
+
+def test_failures_are_penalized_even_when_fast(clock):
+    router = measured(EndpointRouter(ENDPOINTS[:2], EWMA, alpha=0.5, error_penalty=2.0), clock, 30.0, 40.0)
+    
+    index = router.acquire()
+    router.release(index, 1.0, success=False)
+    
+    state = router.snapshot()[0]
+    assert state["errors"] == 1
+    # The failure counts as twice the current average (60ms), not as 1ms
+    assert state["ewma_ms"] == 45.0
+    assert router.acquire() == 1
+
+
+def test_ewma_spreads_concurrent_requests_by_expected_latency(clock):
+    router = measured(EndpointRouter(ENDPOINTS[:2], EWMA), clock, 20.0, 50.0)
+    
+    # Nothing finishes: the fast endpoint takes work until its queue makes it the slower choice
+    counts = Counter(router.acquire() for _ in range(7))
+    
+    assert counts == {0: 5, 1: 2}
+
+
+def test_ewma_reprobes_an_idle_endpoint_once_its_average_is_stale(clock):
+    router = measured(EndpointRouter(ENDPOINTS[:2], EWMA, probe_interval_s=10), clock, 20.0, 500.0)
+    router.endpoints[0].updated_at = clock.now + 30
+    
+    clock.now += 30
+    index = router.acquire()
+    assert index == 1
+    
+    # The probe's measurement replaces the stale average instead of blending with it
+    router.release(index, 15.0, success=True)
+    assert router.endpoints[1].ewma_ms == 15.0
+    assert router.acquire() == 1
+
+
+def test_ewma_routes_real_requests_to_both_mock_servers():
+    suite = BaseTestSuite(config_file=CONFIG_FILE)
+    servers = [MockOpenAIServer(suite.get_scenarios(), latency=FixedLatency(ms), seed=0) for ms in (20, 60)]
+    fast_url, slow_url = [server.start() for server in servers]
+    strategy = EndpointStrategy(endpoints=[fast_url, slow_url], routing=EWMA)
+    try:
+        tester = ModelPerformanceTester(strategy, suite, CombinedAnalyzer(verbose=False),
+                                        verbose=False, concurrency=8, trials=16)
+        results = asyncio.run(tester.run_tests_async())
+    finally:
+        strategy.close()
+        for server in servers:
+            server.stop()
+    
+    served = Counter(result.metadata["endpoint"] for result in results)
+    assert all(result.success for result in results)
+    assert served[fast_url] > served[slow_url]
+    # Under concurrency the slower endpoint keeps a share instead of being starved
+    assert served[slow_url] >= len(results) // 10
+
+
+def test_snapshot_counts_requests_in_flight():
+    router = EndpointRouter(ENDPOINTS[:2])
+    index = router.acquire()
+    
+    snapshot = router.snapshot()
+    assert snapshot[index]["outstanding"] == 1
+    assert snapshot[index]["requests"] == 0
+    
+    router.release(index, 10.0, success=True)
+    assert router.snapshot()[index]["outstanding"] == 0
+    assert router.snapshot()[index]["requests"] == 1
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"endpoints": []},
+    {"endpoints": ENDPOINTS, "policy": "random"},
+    {"endpoints": ENDPOINTS, "alpha": 0},
+    {"endpoints": ENDPOINTS, "probe_interval_s": 0},
+])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        EndpointRouter(**kwargs)
@@ -0,0 +1,30 @@
+"""
+Tests for the shared percentile helper
+"""
+
+import pytest
+
+from analyzers import stats
+from reasoning_strategies.hedging import HedgingPolicy
+
+
+def test_percentile_interpolates_between_ranks():
+    values = [40.0, 10.0, 30.0, 20.0]
+    
+    assert stats.percentile(values, 0.0) == 10.0
+    assert stats.percentile(values, 0.5) == 25.0
+    assert stats.percentile(values, 0.95) == pytest.approx(38.5)
+    assert stats.percentile(values, 1.0) == 40.0
+
+
+def test_percentile_of_nothing_is_zero():
+    assert stats.percentile([], 0.95) == 0.0
+
+
+def test_hedge_delay_uses_the_same_percentile_as_the_report():
+    policy = HedgingPolicy(percentile=0.95, min_history=4)
+    latencies = [40.0, 10.0, 30.0, 20.0]
+    for latency in latencies:
+        policy.record(latency)
+    
+    assert policy.hedge_delay_ms() == stats.percentile(latencies, 0.95)
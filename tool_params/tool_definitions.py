@@ -2,9 +2,10 @@
 Shared tool definitions and data structures
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
 from typing import Dict, List, Any, Optional, Callable
 import json
+import threading
 
 
 @dataclass
@@ -26,6 +27,45 @@ class ToolDefinition:
         }
 
 
+@dataclass(frozen=True)
+class CompiledTools:
+    """
+    A tool set converted to the OpenAI request format once and shared
+    
+    Treat `payload` as read-only: the same lists and dicts are sent by every
+    request (and every scenario) that uses an identical tool set.
+    """
+    key: str  # Content hash of the serialized tools
+    payload: List[Dict[str, Any]]  # OpenAI tool format
+    json_bytes: bytes  # Compact JSON encoding of payload, ready to splice into a request body
+
+
+# Compiled tool sets by content hash, so scenarios sharing tools share one payload
+_compiled_tools: Dict[str, CompiledTools] = {}
+_compiled_tools_lock = threading.Lock()
+
+
+def compile_tools(tools: List[ToolDefinition]) -> CompiledTools:
+    """
+    Return the compiled payload for a tool set, building it on first use
+    
+    Args:
+        tools: Tool definitions in request order
+    
+    Returns:
+        The CompiledTools shared by every identical tool set
+    """
+    import hashlib
+    payload = [tool.to_dict() for tool in tools]
+    json_bytes = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    key = hashlib.sha256(json_bytes).hexdigest()[:16]
+    with _compiled_tools_lock:
+        compiled = _compiled_tools.get(key)
+        if compiled is None:
+            compiled = _compiled_tools[key] = CompiledTools(key=key, payload=payload, json_bytes=json_bytes)
+    return compiled
+
+
 @dataclass
 class TestScenario:
     """Represents a test scenario"""
@@ -36,6 +76,9 @@ class TestScenario:
     expected_tool_calls: List[Dict[str, Any]]  # Expected tool names and arguments
     validation_function: Optional[Callable] = None
     tags: List[str] = None
+    # Memoized compile_tools() / content_hash() results; scenarios are not modified once built
+    _compiled_tools: Optional[CompiledTools] = field(default=None, init=False, repr=False, compare=False)
+    _content_hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.tags is None:
@@ -47,10 +90,24 @@ class TestScenario:
             "name": self.name,
             "description": self.description,
             "prompt": self.prompt,
-            "tools": [tool.to_dict() for tool in self.tools],
+            "tools": self.compiled_tools().payload,
             "expected_tool_calls": self.expected_tool_calls,
             "tags": self.tags
         }
+    
+    def compiled_tools(self) -> CompiledTools:
+        """The scenario's tools in request format, compiled on first use"""
+        if self._compiled_tools is None:
+            self._compiled_tools = compile_tools(self.tools)
+        return self._compiled_tools
+    
+    def content_hash(self) -> str:
+        """Stable hash of the scenario's content, used to match results across runs"""
+        if self._content_hash is None:
+            import hashlib
+            payload = json.dumps(self.to_dict(), sort_keys=True, default=str)
+            self._content_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return self._content_hash
 
 
 @dataclass
@@ -82,10 +139,23 @@ class ValidationResult:
     model_response: Optional[str] = None
     tokens_used: Optional[Dict[str, int]] = None
     metadata: Optional[Dict[str, Any]] = None
+    queue_wait_ms: Optional[float] = None  # Time spent waiting for a worker, excluded from latency_ms
+    trial: Optional[int] = None  # 1-based trial number when scenarios are repeated
+    warmup: bool = False  # Warmup trials are excluded from latency statistics
+    scenario_hash: Optional[str] = None  # TestScenario.content_hash() of the scenario that produced this
+    throttle_wait_ms: Optional[float] = None  # Time held back by the rate limiter (incl. 429 backoff), excluded from latency_ms
+    retries: int = 0  # Attempts retried after a 429/503
+    scheduled: bool = False  # Sent on an open-loop schedule; queue_wait_ms then counts from the scheduled send
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ValidationResult":
+        """Rebuild a result from to_dict() output, ignoring unknown keys"""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
 
 
 # Common tool definitions that can be reused across test suites
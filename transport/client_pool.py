@@ -0,0 +1,60 @@
+"""
+Process-wide pooled HTTP clients
+"""
+
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+
+# Connection pool settings; the defaults match the OpenAI SDK's own client
+_settings: Dict[str, Any] = {
+    "max_connections": 1000,
+    "max_keepalive_connections": 100,
+    "keepalive_expiry": 5.0
+}
+_clients: Dict[Tuple[bool, Optional[str]], Any] = {}
+_lock = threading.Lock()
+
+
+def configure_pool(max_connections: Optional[int] = None,
+                   max_keepalive_connections: Optional[int] = None,
+                   keepalive_expiry: Optional[float] = None) -> None:
+    """
+    Set the pool size and keep-alive used by the shared clients (and by each named pool)
+    
+    Call before creating strategies; clients that already exist keep their
+    settings and are no longer handed out.
+    
+    Args:
+        max_connections: Connections open at once, across all strategies in the process
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept before closing
+    """
+    with _lock:
+        for key, value in (("max_connections", max_connections),
+                           ("max_keepalive_connections", max_keepalive_connections),
+                           ("keepalive_expiry", keepalive_expiry)):
+            if value is not None:
+                _settings[key] = value
+        _clients.clear()
+
+
+def get_http_client(asynchronous: bool = False, pool: Optional[str] = None):
+    """
+    The shared (sync or async) httpx client, created on first use
+    
+    Every OpenAI client in the process sends through it, so connections opened
+    by one strategy, or by a warmup, are reused by the next request. A named
+    pool (e.g. one per endpoint) gets its own client and connection limits.
+    """
+    key = (asynchronous, pool)
+    with _lock:
+        if key not in _clients:
+            from .timed_transport import create_http_client
+            _clients[key] = create_http_client(asynchronous, **_settings)
+        return _clients[key]
+
+
+def pool_config() -> Dict[str, Any]:
+    """Current pool settings, recorded alongside results"""
+    return dict(_settings)
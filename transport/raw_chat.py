@@ -0,0 +1,129 @@
+"""
+Chat completions over the pooled HTTP client, without the OpenAI SDK
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+from tool_params.tool_definitions import CompiledTools
+from .client_pool import get_http_client
+
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+# Request arguments that configure the SDK call rather than go in the body
+_CLIENT_ONLY_ARGUMENTS = ("timeout", "extra_body")
+
+
+class RawHTTPError(Exception):
+    """Non-2xx response; carries status_code and response like the SDK's APIStatusError"""
+    
+    def __init__(self, status_code: int, response):
+        super().__init__(f"Error code: {status_code} - {response.text}")
+        self.status_code = status_code
+        self.response = response
+
+
+class RawCompletion:
+    """The parts of a chat completion the harness uses, taken straight from the JSON"""
+    
+    def __init__(self, data: Dict[str, Any]):
+        choice = data["choices"][0]
+        message = choice.get("message") or {}
+        self.tool_calls: List[Tuple[str, str]] = [
+            (tc["function"]["name"], tc["function"].get("arguments"))
+            for tc in message.get("tool_calls") or []
+        ]
+        self.content: Optional[str] = message.get("content")
+        self.finish_reason: Optional[str] = choice.get("finish_reason")
+        self.tokens_used = tokens_from_usage(data.get("usage"))
+
+
+def tokens_from_usage(usage: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """tokens_used from a JSON usage object, in the same shape as for SDK responses"""
+    if not usage:
+        return None
+    
+    tokens_used = {
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "total_tokens": usage.get("total_tokens")
+    }
+    cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    if cached is not None:
+        tokens_used["cached_tokens"] = cached
+    reasoning = (usage.get("completion_tokens_details") or {}).get("reasoning_tokens")
+    if reasoning is not None:
+        tokens_used["reasoning_tokens"] = reasoning
+    return tokens_used
+
+
+class RawChatClient:
+    """
+    Minimal chat completions client for non-streamed tool-call requests
+    
+    Request bodies are encoded once, with the scenario's pre-serialized tools
+    spliced in, and responses are read with json.loads alone, skipping the SDK's
+    pydantic request transform and response models. Sends through the shared
+    pooled client (or the named pool), so phase timing and connection reuse are
+    recorded as for SDK requests. Unlike the SDK it never retries; use the rate
+    limiter for 429s.
+    """
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None, timeout: float = 30,
+                 pool: Optional[str] = None):
+        self.base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.pool = pool
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+    
+    @staticmethod
+    def encode_request(request: Dict[str, Any], tools: Optional[CompiledTools] = None) -> bytes:
+        """
+        JSON body for chat completion request arguments
+        
+        None values and SDK-only arguments are dropped, and the compiled tools'
+        bytes are spliced in rather than serialized again.
+        """
+        body = {key: value for key, value in request.items()
+                if value is not None and key not in _CLIENT_ONLY_ARGUMENTS}
+        encoded = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        if tools is None or not tools.payload:
+            return encoded
+        return encoded[:-1] + b',"tools":' + tools.json_bytes + b"}"
+    
+    def complete(self, body: bytes) -> RawCompletion:
+        """Send an encoded request and parse the completion"""
+        response = get_http_client(pool=self.pool).post(f"{self.base_url}/chat/completions", content=body,
+                                          headers=self.headers, timeout=self.timeout)
+        return self._parse(response)
+    
+    async def complete_async(self, body: bytes) -> RawCompletion:
+        """Event-loop version of complete()"""
+        response = await get_http_client(asynchronous=True, pool=self.pool).post(
+            f"{self.base_url}/chat/completions", content=body, headers=self.headers, timeout=self.timeout)
+        return self._parse(response)
+    
+    def list_models(self) -> None:
+        """GET /models, used to open connections before timing starts"""
+        self._check(get_http_client(pool=self.pool).get(f"{self.base_url}/models", headers=self.headers,
+                                                        timeout=self.timeout))
+    
+    async def list_models_async(self) -> None:
+        """Event-loop version of list_models()"""
+        self._check(await get_http_client(asynchronous=True, pool=self.pool).get(
+            f"{self.base_url}/models", headers=self.headers, timeout=self.timeout))
+    
+    def _parse(self, response) -> RawCompletion:
+        self._check(response)
+        return RawCompletion(json.loads(response.content))
+    
+    @staticmethod
+    def _check(response) -> None:
+        if response.status_code >= 400:
+            raise RawHTTPError(response.status_code, response)
@@ -0,0 +1,183 @@
+"""
+httpx transports that mark wire-level phases on the active PhaseTimer
+"""
+
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+
+from .timing import PhaseTimer, current_timer
+
+
+DEFAULT_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# Response headers with the provider's request ID and its own processing time in ms
+REQUEST_ID_HEADER = "x-request-id"
+PROCESSING_TIME_HEADER = "openai-processing-ms"
+
+# Status answered for a request aborted by the client (as in nginx); the SDK doesn't retry it
+ABORTED_STATUS = 499
+
+
+class _TimedByteStream(httpx.SyncByteStream):
+    """Response body stream that marks last_byte once fully read"""
+    
+    def __init__(self, stream: httpx.SyncByteStream, timer: PhaseTimer):
+        self._stream = stream
+        self._timer = timer
+    
+    def __iter__(self):
+        for chunk in self._stream:
+            yield chunk
+        self._timer.mark("last_byte")
+    
+    def close(self) -> None:
+        self._stream.close()
+
+
+class _AsyncTimedByteStream(httpx.AsyncByteStream):
+    """Async response body stream that marks last_byte once fully read"""
+    
+    def __init__(self, stream: httpx.AsyncByteStream, timer: PhaseTimer):
+        self._stream = stream
+        self._timer = timer
+    
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+        self._timer.mark("last_byte")
+    
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class _ConnectionTracker:
+    """Remembers which connections have carried a response, to tell new ones from reused ones"""
+    
+    def __init__(self):
+        self._seen = weakref.WeakSet()
+        self._lock = threading.Lock()
+    
+    def connection_reused(self, response: httpx.Response) -> Optional[bool]:
+        """Whether the response came over a connection seen before (None if unknown)"""
+        # httpcore keeps one network stream object per connection for its lifetime
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return None
+        
+        with self._lock:
+            reused = stream in self._seen
+            try:
+                self._seen.add(stream)
+            except TypeError:
+                return None
+        return reused
+
+
+def _aborted_response(request: httpx.Request) -> httpx.Response:
+    """Stand-in response for a request given up with PhaseTimer.abort()"""
+    return httpx.Response(ABORTED_STATUS, json={"error": {"message": "Request aborted by the client"}},
+                          request=request)
+
+
+def _record_response_headers(timer: PhaseTimer, response: httpx.Response) -> None:
+    """Copy the request ID and server processing time (when sent) onto the timer"""
+    timer.request_id = response.headers.get(REQUEST_ID_HEADER)
+    processing_ms = response.headers.get(PROCESSING_TIME_HEADER)
+    try:
+        timer.server_processing_ms = float(processing_ms) if processing_ms is not None else None
+    except ValueError:
+        timer.server_processing_ms = None
+
+
+class TimedTransport(httpx.BaseTransport):
+    """
+    Wraps a transport to mark send (request handed over), first_byte (headers
+    received) and last_byte (body read) on the caller's PhaseTimer, and to
+    record whether the request used a new or a reused connection along with
+    the server's request ID and processing time
+    """
+    
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+        self._connections = _ConnectionTracker()
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        timer = current_timer()
+        if timer is not None:
+            if timer.aborted:
+                return _aborted_response(request)
+            timer.mark("send")
+        
+        response = self._transport.handle_request(request)
+        
+        # Untimed requests (e.g. connection warmup) still register their connection
+        reused = self._connections.connection_reused(response)
+        if timer is None:
+            return response
+        
+        # Published before checking the flag, so a concurrent abort() either sees the stream or is seen here
+        timer.network_stream = response.extensions.get("network_stream")
+        if timer.aborted:
+            response.close()
+            return _aborted_response(request)
+        
+        timer.mark("first_byte")
+        timer.connection_reused = reused
+        _record_response_headers(timer, response)
+        response.stream = _TimedByteStream(response.stream, timer)
+        return response
+    
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncTimedTransport(httpx.AsyncBaseTransport):
+    """Async version of TimedTransport"""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        self._connections = _ConnectionTracker()
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        timer = current_timer()
+        if timer is not None:
+            timer.mark("send")
+        
+        response = await self._transport.handle_async_request(request)
+        
+        reused = self._connections.connection_reused(response)
+        if timer is None:
+            return response
+        
+        timer.mark("first_byte")
+        timer.connection_reused = reused
+        _record_response_headers(timer, response)
+        response.stream = _AsyncTimedByteStream(response.stream, timer)
+        return response
+    
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client(asynchronous: bool = False,
+                       max_connections: int = 1000,
+                       max_keepalive_connections: int = 100,
+                       keepalive_expiry: Optional[float] = 5.0):
+    """
+    httpx client for the OpenAI SDK with phase-marking transports
+    
+    The limits default to the SDK's own; a custom transport would otherwise
+    replace them with httpx's much smaller defaults.
+    """
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_keepalive_connections,
+                          keepalive_expiry=keepalive_expiry)
+    if asynchronous:
+        transport = AsyncTimedTransport(httpx.AsyncHTTPTransport(limits=limits))
+        return httpx.AsyncClient(transport=transport, timeout=DEFAULT_TIMEOUT, follow_redirects=True)
+    
+    transport = TimedTransport(httpx.HTTPTransport(limits=limits))
+    return httpx.Client(transport=transport, timeout=DEFAULT_TIMEOUT, follow_redirects=True)
@@ -0,0 +1,127 @@
+"""
+Per-phase request timing with perf_counter_ns
+"""
+
+import time
+import socket
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+
+# Phases in the order they happen; each is timed from the previous recorded mark:
+#   build       scenario -> request arguments (tool.to_dict(), messages)
+#   send        SDK request building/serialization until the bytes reach the transport
+#   first_byte  network + server time until the response headers arrive
+#   last_byte   reading the response body
+#   parse       SDK response parsing + tool argument json.loads
+#   validate    checking the tool calls against the expected ones
+PHASES = ("build", "send", "first_byte", "last_byte", "parse", "validate")
+
+# Phases spent in the harness rather than on the wire / in the model
+OVERHEAD_PHASES = ("build", "send", "parse", "validate")
+
+_current_timer: ContextVar[Optional["PhaseTimer"]] = ContextVar("phase_timer", default=None)
+
+
+class PhaseTimer:
+    """
+    Named perf_counter_ns timestamps for one request
+    
+    While activate()d, the timer is visible to the HTTP transport through a
+    context variable, so the send/first_byte/last_byte marks can be taken below
+    the SDK. Context variables follow threads and asyncio tasks, so concurrent
+    requests each see their own timer. Marks are overwritten, so when the SDK
+    retries a request the last attempt's wire timings are kept. The transport
+    also records whether the request went out on a new or a reused connection,
+    and the server's request ID and processing time from the response headers.
+    
+    abort() gives up on the timer's request from another thread, e.g. when a
+    hedged request's twin has already answered.
+    """
+    
+    def __init__(self):
+        self.start_ns = time.perf_counter_ns()
+        self.marks: Dict[str, int] = {}
+        self.connection_reused: Optional[bool] = None
+        self.request_id: Optional[str] = None
+        self.server_processing_ms: Optional[float] = None
+        self.network_stream = None  # Set by the transport once response headers arrive
+        self.aborted = False
+    
+    def abort(self) -> None:
+        """
+        Stop this timer's request without waiting for its response
+        
+        Once headers have arrived, the response's connection is shut down, which
+        ends a blocked body read at once. Before that, the transport drops the
+        response as soon as its headers arrive, without reading the body.
+        """
+        self.aborted = True
+        stream = self.network_stream
+        sock = stream.get_extra_info("socket") if stream is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def mark(self, phase: str) -> None:
+        self.marks[phase] = time.perf_counter_ns()
+    
+    def merge(self, other: "PhaseTimer", *phases: str) -> None:
+        """Copy the given marks (if recorded) and the response details from another timer, e.g. a hedge winner's"""
+        for phase in phases:
+            if phase in other.marks:
+                self.marks[phase] = other.marks[phase]
+        for attribute in ("connection_reused", "request_id", "server_processing_ms"):
+            if getattr(other, attribute) is not None:
+                setattr(self, attribute, getattr(other, attribute))
+    
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the timer was created"""
+        return (time.perf_counter_ns() - self.start_ns) / 1e6
+    
+    @contextmanager
+    def activate(self):
+        """Make this the timer the transport marks for requests sent in this context"""
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+    
+    def to_dict(self) -> Dict[str, int]:
+        """Marks as ns offsets from the start, plus the absolute start for later marks"""
+        return {"start_ns": self.start_ns, **{phase: t - self.start_ns for phase, t in self.marks.items()}}
+
+
+def current_timer() -> Optional[PhaseTimer]:
+    """The timer activated in this thread / task, if any"""
+    return _current_timer.get()
+
+
+def mark_result(metadata: Optional[Dict[str, Any]], phase: str) -> None:
+    """Add a mark to the timing recorded in a result's metadata by PhaseTimer.to_dict()"""
+    timing = (metadata or {}).get("timing_ns")
+    if timing and "start_ns" in timing:
+        timing[phase] = time.perf_counter_ns() - timing["start_ns"]
+
+
+def phase_durations_ms(timing: Optional[Dict[str, int]]) -> Dict[str, float]:
+    """
+    Duration of each recorded phase in ms
+    
+    Each phase runs from the previous recorded mark (or the start) to its own
+    mark; phases without a mark are left out and their time goes to the next one.
+    """
+    if not timing:
+        return {}
+    
+    durations = {}
+    previous = 0
+    for phase in PHASES:
+        if phase in timing:
+            durations[phase] = (timing[phase] - previous) / 1e6
+            previous = timing[phase]
+    return durations